@@ -0,0 +1,117 @@
+"""
+Expectimax search for the built-in player.
+Moves are maximised over and tile spawns averaged over, using the game's
+own spawn rules, down to a fixed depth.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from core import metrics
+from core.constants import (
+    INITIAL_TILE_VALUE,
+    METRICS_TIME_BUCKETS,
+    SEARCH_DEPTH,
+    SEARCH_MAX_CHANCE_CELLS,
+    SPECIAL_TILE_VALUE,
+)
+from game.game import DIRECTIONS, special_tile_chance
+
+from .heuristics import evaluate
+
+_NODES = metrics.registry.counter(
+    "search_nodes_total", "Positions expanded by the expectimax search"
+)
+_SEARCH_SECONDS = metrics.registry.histogram(
+    "search_seconds", "Time per expectimax search", METRICS_TIME_BUCKETS
+)
+
+
+@dataclass
+class SearchResult:
+    """Outcome of searching one position."""
+
+    direction: str | None  # None if no move is legal
+    value: float  # Expected heuristic value of the best move
+    legal_mask: int  # Bit i set if DIRECTIONS[i] moves the board
+
+
+def legal_mask(board: Any) -> int:
+    """Bit mask of the directions that move the board, in DIRECTIONS order."""
+    mask = 0
+    for bit, direction in enumerate(DIRECTIONS):
+        if board.copy().slide(direction)[0]:
+            mask |= 1 << bit
+    return mask
+
+
+def search(board: Any, score: int = 0, depth: int = SEARCH_DEPTH) -> SearchResult:
+    """
+    Find the move with the highest expected value.
+
+    Args:
+        board: Board or SparseBoard; left unchanged
+        score: Current score, which sets the chance of spawning a 4
+        depth: Moves to look ahead; 1 just compares the afterstates
+    """
+    start = time.perf_counter()
+    best_direction = None
+    best_value = 0.0
+    mask = 0
+    for bit, direction in enumerate(DIRECTIONS):
+        child = board.copy()
+        moved, gained = child.slide(direction)
+        if not moved:
+            continue
+        mask |= 1 << bit
+        value = _chance_value(child, score + gained, depth - 1)
+        if best_direction is None or value > best_value:
+            best_direction, best_value = direction, value
+    if metrics.enabled:
+        _NODES.inc()
+        _SEARCH_SECONDS.observe(time.perf_counter() - start)
+    return SearchResult(best_direction, best_value, mask)
+
+
+def _spread(cells: list[tuple[int, int]], limit: int) -> list[tuple[int, int]]:
+    """Pick at most limit cells, evenly spaced, so the choice is deterministic."""
+    if len(cells) <= limit:
+        return cells
+    step = len(cells) / limit
+    return [cells[int(i * step)] for i in range(limit)]
+
+
+def _chance_value(board: Any, score: int, depth: int) -> float:
+    """Expected value over the next spawn, or the evaluation at the horizon."""
+    if depth <= 0:
+        return evaluate(board)
+    cells = _spread(board.get_empty_cells(), SEARCH_MAX_CHANCE_CELLS)
+    if not cells:
+        return evaluate(board)
+
+    chance_of_4 = special_tile_chance(score)
+    outcomes = [(INITIAL_TILE_VALUE, 1.0 - chance_of_4)]
+    if chance_of_4:
+        outcomes.append((SPECIAL_TILE_VALUE, chance_of_4))
+
+    total = 0.0
+    for cell in cells:
+        for value, probability in outcomes:
+            child = board.copy()
+            child.put_tile(cell, value)
+            total += probability * _max_value(child, score, depth)
+    return total / len(cells)
+
+
+def _max_value(board: Any, score: int, depth: int) -> float:
+    """Value of the best move, or 0 if the game is over."""
+    if metrics.enabled:
+        _NODES.inc()
+    best = 0.0
+    for direction in DIRECTIONS:
+        child = board.copy()
+        moved, gained = child.slide(direction)
+        if moved:
+            best = max(best, _chance_value(child, score + gained, depth - 1))
+    return best
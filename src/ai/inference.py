@@ -0,0 +1,303 @@
+"""
+Batched position evaluation for 2048-CLI.
+InferenceService takes evaluation requests from any number of callers and
+threads, and a worker thread answers them in batches: it collects requests
+until it has max_batch of them or the oldest has waited max_wait seconds,
+makes one evaluator call for the whole batch and resolves each caller's
+future.
+
+An evaluator is any function from a list of (grid, score) positions to one
+SearchResult each. evaluate_afterstates() scores every move of every board
+with the heuristic in a few array operations; search_evaluator() runs the
+expectimax search, and per_position() adapts any other single-position
+evaluator.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from functools import cache
+from typing import Any, NamedTuple
+
+from core.constants import (
+    INFERENCE_BATCH_BUCKETS,
+    INFERENCE_LATENCY_BUCKETS,
+    INFERENCE_MAX_BATCH,
+    INFERENCE_MAX_WAIT,
+    INFERENCE_MIN_TABLE_BATCH,
+    SEARCH_DEPTH,
+    SPARSE_BOARD_MIN_SIZE,
+)
+from core.metrics import Histogram
+from game import vector_engine
+from game.board import Board
+from game.game import DIRECTIONS
+from game.sparse_board import SparseBoard
+
+from .expectimax import SearchResult, search
+from .heuristics import line_score
+
+try:
+    import numpy as np
+except ImportError:  # Optional; evaluate_afterstates() falls back to search()
+    np = None  # type: ignore[assignment]
+
+Position = tuple[list[list[int]], int]  # Grid of tile values, and the score
+BatchEvaluator = Callable[[list[Position]], list[SearchResult]]
+
+# Ranks below this fit the afterstate tables; larger tiles use search()
+_TABLE_RANKS = 16
+
+
+def board_from_grid(grid: list[list[int]]) -> Board | SparseBoard:
+    """A Board holding grid, sparse for huge boards."""
+    size = len(grid)
+    board = SparseBoard(size) if size >= SPARSE_BOARD_MIN_SIZE else Board(size)
+    board.set_grid(grid)
+    return board
+
+
+def per_position(
+    evaluate: Callable[[list[list[int]], int], SearchResult],
+) -> BatchEvaluator:
+    """A batch evaluator calling evaluate(grid, score) on each position."""
+
+    def evaluate_batch(positions: list[Position]) -> list[SearchResult]:
+        return [evaluate(grid, score) for grid, score in positions]
+
+    return evaluate_batch
+
+
+def search_evaluator(depth: int = SEARCH_DEPTH) -> BatchEvaluator:
+    """Expectimax search to depth; depth 1 is evaluate_afterstates()."""
+    if depth <= 1:
+        return evaluate_afterstates
+
+    def evaluate(grid: list[list[int]], score: int) -> SearchResult:
+        return search(board_from_grid(grid), score, depth)
+
+    return per_position(evaluate)
+
+
+@cache
+def _line_score_table(size: int) -> Any:
+    """line_score() of every line of ranks below _TABLE_RANKS, 4 bits per rank."""
+    score = line_score.__wrapped__  # Skip the cache; every line is seen once
+    return np.array(
+        [
+            score(tuple(packed >> (4 * i) & 0xF for i in range(size)))
+            for packed in range(_TABLE_RANKS**size)
+        ]
+    )
+
+
+def evaluate_afterstates(positions: list[Position]) -> list[SearchResult]:
+    """
+    Pick the move whose afterstate scores best, like search() at depth 1.
+
+    Boards the vector engine can play are grouped by size and evaluated
+    together: all four moves of every board are made with its line tables
+    and every afterstate is scored with a table of line_score(). Others,
+    and groups too small to gain from it, are searched one by one.
+    """
+    results: dict[int, SearchResult] = {}  # By position index
+    groups: dict[int, list[int]] = {}
+    for i, (grid, _) in enumerate(positions):
+        if vector_engine.is_available(len(grid)):
+            groups.setdefault(len(grid), []).append(i)
+    for size, indices in list(groups.items()):
+        if len(indices) < INFERENCE_MIN_TABLE_BATCH:
+            del groups[size]
+    for i, (grid, score) in enumerate(positions):
+        if len(grid) not in groups:
+            results[i] = search(board_from_grid(grid), score, 1)
+
+    for size, indices in groups.items():
+        ranks = np.array(
+            [
+                [
+                    value.bit_length() - 1 if value else 0
+                    for row in positions[i][0]
+                    for value in row
+                ]
+                for i in indices
+            ],
+            dtype=np.uint8,
+        ).reshape(len(indices), size, size)
+        # A merge of two of the largest tiles would leave the table
+        fits = ranks.max(axis=(1, 2)) < _TABLE_RANKS - 1
+        for i in np.nonzero(~fits)[0].tolist():
+            grid, score = positions[indices[i]]
+            results[indices[i]] = search(board_from_grid(grid), score, 1)
+        boards = ranks[fits]
+        if not len(boards):
+            continue
+
+        table = _line_score_table(size)
+        shifts = np.arange(size, dtype=np.uint32) * 4
+        values = np.empty((len(boards), len(DIRECTIONS)))
+        moved = np.empty((len(boards), len(DIRECTIONS)), dtype=bool)
+        for direction in range(len(DIRECTIONS)):
+            after, _ = vector_engine.slide_boards(boards, direction)
+            moved[:, direction] = (after != boards).any(axis=(1, 2))
+            wide = after.astype(np.uint32)
+            rows = table[(wide << shifts).sum(axis=2)].sum(axis=1)
+            columns = table[(wide << shifts[:, None]).sum(axis=1)].sum(axis=1)
+            values[:, direction] = rows + columns
+        values[~moved] = -np.inf
+        best = values.argmax(axis=1)
+        masks = (moved << np.arange(len(DIRECTIONS))).sum(axis=1)
+
+        for i, direction, value, mask in zip(
+            np.array(indices)[fits].tolist(),
+            best.tolist(),
+            values[np.arange(len(boards)), best].tolist(),
+            masks.tolist(),
+            strict=True,
+        ):
+            if mask:
+                results[i] = SearchResult(DIRECTIONS[direction], value, mask)
+            else:
+                results[i] = SearchResult(None, 0.0, 0)
+    return [results[i] for i in range(len(positions))]
+
+
+class _Request(NamedTuple):
+    position: Position
+    future: Any  # concurrent.futures.Future, or an asyncio future of loop
+    submitted: float
+    loop: asyncio.AbstractEventLoop | None = None
+
+
+def _settle(answers: list[tuple[Any, Any, BaseException | None]]) -> None:
+    """Resolve (future, result, error) triples."""
+    for future, result, error in answers:
+        if future.done():
+            continue  # Cancelled while waiting
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+class InferenceService:
+    """
+    Evaluates positions for many callers, a batch at a time, on its own thread.
+
+    batch_sizes and latencies are histograms of the batches made and of the
+    time from submit() to the result, in seconds.
+    """
+
+    def __init__(
+        self,
+        evaluator: BatchEvaluator = evaluate_afterstates,
+        max_batch: int = INFERENCE_MAX_BATCH,
+        max_wait: float = INFERENCE_MAX_WAIT,
+    ) -> None:
+        self.evaluator = evaluator
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batch_sizes = Histogram(INFERENCE_BATCH_BUCKETS)
+        self.latencies = Histogram(INFERENCE_LATENCY_BUCKETS)
+        self._queue: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="inference", daemon=True)
+        self._thread.start()
+
+    def submit(self, grid: list[list[int]], score: int = 0) -> Future:
+        """Queue a position; the future resolves to its SearchResult."""
+        if self._closed:
+            raise RuntimeError("the inference service is closed")
+        future: Future = Future()
+        self._queue.put(_Request((grid, score), future, time.perf_counter()))
+        return future
+
+    async def evaluate(self, grid: list[list[int]], score: int = 0) -> SearchResult:
+        """
+        submit() for coroutines. The futures of a batch are resolved with one
+        call into each event loop, rather than one per future.
+        """
+        if self._closed:
+            raise RuntimeError("the inference service is closed")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_Request((grid, score), future, time.perf_counter(), loop))
+        return await future
+
+    def close(self) -> None:
+        """Answer what is queued, then stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self) -> "InferenceService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def report(self) -> str:
+        """Both histograms as text."""
+        return (
+            f"batch size (mean {self.batch_sizes.mean():.1f})\n"
+            f"{self.batch_sizes.format()}\n"
+            f"latency (mean {self.latencies.mean() * 1e3:.3f} ms, "
+            f"p99 <= {self.latencies.quantile(0.99) * 1e3:g} ms)\n"
+            f"{self.latencies.format(scale=1e3, unit=' ms')}"
+        )
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = first.submitted + self.max_wait
+            while len(batch) < self.max_batch:
+                try:
+                    request = self._queue.get(
+                        timeout=max(0.0, deadline - time.perf_counter())
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+            self._answer(batch)
+
+    def _answer(self, batch: list[_Request]) -> None:
+        error: BaseException | None = None
+        results: list[SearchResult | None]
+        try:
+            results = list(self.evaluator([request.position for request in batch]))
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"evaluator returned {len(results)} results for "
+                    f"{len(batch)} positions"
+                )
+        except Exception as e:
+            results, error = [None] * len(batch), e
+
+        by_loop: dict[Any, list[tuple[Any, Any, BaseException | None]]] = {}
+        for request, result in zip(batch, results, strict=True):
+            by_loop.setdefault(request.loop, []).append((request.future, result, error))
+        for loop, answers in by_loop.items():
+            if loop is None:
+                _settle(answers)
+                continue
+            try:
+                loop.call_soon_threadsafe(_settle, answers)
+            except RuntimeError:
+                pass  # The loop has closed; nobody is waiting
+
+        if error is None:
+            now = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for request in batch:
+                self.latencies.observe(now - request.submitted)
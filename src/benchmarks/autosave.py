@@ -0,0 +1,102 @@
+"""
+Benchmark for autosaving on a slow disk.
+
+Plays random moves and autosaves every --every moves into a temporary save
+directory whose writes are delayed by --delay milliseconds, like a network
+home directory. Autosaves are written first directly on the playing thread,
+as save_game() would, and then through a PersistenceWorker, and it reports
+the time per move and the longest move, which is what the player feels as
+a freeze.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.autosave --delay 200
+    PYTHONPATH=src python -m benchmarks.autosave --every 1 --backend sqlite
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from core.persistence import Autosaver, PersistenceWorker
+from core.save_load import load_game, snapshot_game, write_save
+from game.game import DIRECTIONS, Game
+
+
+def play(moves: int, seed: int, every: int, save: Callable[[Game], Any]) -> list[float]:
+    """Seconds per move, including any autosave it triggers."""
+    rng = random.Random(seed)
+    game = Game(4, rng=random.Random(seed))
+    game.start()
+    times = []
+    since_save = 0
+    for _ in range(moves):
+        start = time.perf_counter()
+        if game.game_over:
+            game = Game(4, rng=random.Random(rng.random()))
+            game.start()
+        if game.step(rng.choice(DIRECTIONS)):
+            since_save += 1
+            if since_save >= every:
+                save(game)
+                since_save = 0
+        times.append(time.perf_counter() - start)
+        time.sleep(0.001)  # Between key presses
+    return times
+
+
+def report(label: str, times: list[float]) -> None:
+    print(
+        f"{label:10} median {statistics.median(times) * 1e3:8.3f} ms/move, "
+        f"max {max(times) * 1e3:8.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--moves", type=int, default=500)
+    parser.add_argument("--every", type=int, default=25, help="moves per autosave")
+    parser.add_argument("--delay", type=float, default=200, help="ms per write")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--seed", type=int, default=2048)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config = {"save_path": directory, "save_backend": args.backend}
+
+        def slow_write(slot: int, data: dict[str, Any], config: Any) -> bool:
+            time.sleep(args.delay / 1e3)
+            return write_save(slot, data, config)
+
+        times = play(
+            args.moves,
+            args.seed,
+            args.every,
+            lambda game: slow_write(0, snapshot_game(game, "Autosave"), config),
+        )
+        report("direct", times)
+
+        worker = PersistenceWorker(slow_write)
+        autosaver = Autosaver(worker, config, "Autosave", every_moves=1, interval=0)
+        last_saved: list[list[int]] = []
+
+        def background_save(game: Game) -> None:
+            autosaver.moved(game)
+            last_saved[:] = [list(row) for row in game.board.grid]
+
+        times = play(args.moves, args.seed, args.every, background_save)
+        report("background", times)
+        worker.close(timeout=60)
+        check = Game(4)
+        same = load_game(check, 0, config) and check.board.grid == last_saved
+        print(
+            f"{worker.written} writes, {worker.merged} merged; "
+            f"autosave {'matches' if same else 'DIFFERS FROM'} the last board"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark for batched position evaluation.
+
+Runs --callers concurrent tasks that each ask for the best move of one
+recorded position after another, first calling the evaluator directly for
+every request and then through an InferenceService that batches them, and
+prints the throughput of both and the service's histograms.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.inference --callers 64 --requests 200
+    PYTHONPATH=src python -m benchmarks.inference --depth 2 --max-batch 32
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from ai.inference import InferenceService, Position, search_evaluator
+from core.constants import INFERENCE_MAX_BATCH, INFERENCE_MAX_WAIT
+from game.game import DIRECTIONS, Game
+
+
+def record_positions(count: int, size: int, seed: int) -> list[Position]:
+    """Positions from random games, at random points of play."""
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        game = Game(size, rng=random.Random(rng.random()))
+        game.start()
+        for _ in range(rng.randrange(400)):
+            if game.game_over:
+                break
+            game.step(rng.choice(DIRECTIONS))
+        positions.append((game.board.grid, game.score))
+    return positions
+
+
+async def run_direct(
+    positions: list[Position], callers: int, requests: int, depth: int
+) -> float:
+    evaluator = search_evaluator(depth)
+
+    async def caller(offset: int) -> None:
+        for i in range(requests):
+            evaluator([positions[(offset + i) % len(positions)]])
+            await asyncio.sleep(0)  # Let the other callers in, as a server would
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(offset) for offset in range(callers)))
+    return time.perf_counter() - start
+
+
+async def run_service(
+    service: InferenceService, positions: list[Position], callers: int, requests: int
+) -> float:
+    async def caller(offset: int) -> None:
+        for i in range(requests):
+            grid, score = positions[(offset + i) % len(positions)]
+            await service.evaluate(grid, score)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(offset) for offset in range(callers)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--callers", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=200, help="per caller")
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--max-batch", type=int, default=INFERENCE_MAX_BATCH)
+    parser.add_argument(
+        "--max-wait", type=float, default=INFERENCE_MAX_WAIT * 1e3, help="in ms"
+    )
+    parser.add_argument("--seed", type=int, default=2048)
+    args = parser.parse_args()
+
+    positions = record_positions(1000, args.size, args.seed)
+    total = args.callers * args.requests
+    evaluator = search_evaluator(args.depth)
+    evaluator(positions[:16])  # Build the lookup tables outside the timing
+
+    direct = asyncio.run(run_direct(positions, args.callers, args.requests, args.depth))
+    with InferenceService(evaluator, args.max_batch, args.max_wait / 1e3) as service:
+        batched = asyncio.run(
+            run_service(service, positions, args.callers, args.requests)
+        )
+        print(f"{args.callers} callers, {total} requests, depth {args.depth}")
+        print(f"  direct   {total / direct:10.0f} evaluations/s")
+        print(f"  service  {total / batched:10.0f} evaluations/s")
+        print(service.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Load test for the game server.
+
+Starts a server on a temporary Unix socket in a subprocess, or uses a
+local one given with --connect, and plays --sessions seeded games on it at
+once for --duration seconds, from --connections client connections split
+across --processes load generator processes. Each session sends up to
+--pipeline moves at a time, then waits a random think time (exponentially
+distributed, with mean --think) before its next ones; finished games are
+replaced by new ones.
+
+Every request's latency goes into a histogram with HDR-style buckets (two
+significant figures from 1 us to 100 s). Once per --interval seconds, and
+for the whole run at the end, it prints the request rate, p50/p99/p999
+latency, errors and the server's resident memory.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.load_test --sessions 10000 --think 1000
+    PYTHONPATH=src python -m benchmarks.load_test --sessions 1000 --think 0 \\
+        --pipeline 8 --processes 4
+    PYTHONPATH=src python -m benchmarks.load_test --connect /tmp/2048.sock
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import random
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from benchmarks.server_throughput import DIRECTION_NAMES, wait_for_socket
+from core.metrics import Histogram, hdr_bounds
+from headless.client import GameClient, ServerError
+
+LATENCY_BOUNDS = hdr_bounds(1e-6, 100.0)
+
+
+class _Stats:
+    """What one load generator has seen since its last report."""
+
+    def __init__(self) -> None:
+        self.latencies = Histogram(LATENCY_BOUNDS)
+        self.errors = 0
+        self.active = 0  # Sessions currently playing; not reset by reports
+
+    def take(self) -> tuple[dict[str, Any], int, int]:
+        report = (self.latencies.to_dict(), self.errors, self.active)
+        self.latencies = Histogram(LATENCY_BOUNDS)
+        self.errors = 0
+        return report
+
+
+async def _timed(stats: _Stats, request: Any) -> Any:
+    start = time.perf_counter()
+    try:
+        return await request
+    except ServerError:
+        stats.errors += 1
+        return None
+    finally:
+        stats.latencies.observe(time.perf_counter() - start)
+
+
+async def _play(
+    client: GameClient,
+    seed: int,
+    start_delay: float,
+    deadline: float,
+    pipeline: int,
+    think: float,
+    stats: _Stats,
+) -> None:
+    """Play seeded games until the deadline, starting after start_delay."""
+    rng = random.Random(seed)
+    await asyncio.sleep(start_delay)
+    stats.active += 1
+    try:
+        created = await _timed(stats, client.create(seed=rng.randrange(1 << 30)))
+        while created is not None and time.monotonic() < deadline:
+            session = created[0]
+            states = await asyncio.gather(
+                *(
+                    _timed(stats, client.move(session, rng.choice(DIRECTION_NAMES)))
+                    for _ in range(pipeline)
+                )
+            )
+            if any(state is None or state["game_over"] for state in states):
+                await _timed(stats, client.close_session(session))
+                created = await _timed(
+                    stats, client.create(seed=rng.randrange(1 << 30))
+                )
+            if think > 0:
+                pause = rng.expovariate(1 / think)
+                await asyncio.sleep(min(pause, deadline - time.monotonic()))
+        if created is not None:
+            await _timed(stats, client.close_session(created[0]))
+    except ConnectionError:
+        stats.errors += 1
+    finally:
+        stats.active -= 1
+
+
+async def _generate(
+    path: str,
+    seeds: range,
+    connections: int,
+    options: dict[str, Any],
+    reports: Any,
+) -> None:
+    stats = _Stats()
+    clients = [await GameClient.connect(unix_path=path) for _ in range(connections)]
+    deadline = options["start"] + options["ramp_up"] + options["duration"]
+    ramp_step = options["ramp_up"] / max(1, len(seeds))
+
+    async def report() -> None:
+        interval = 0
+        while True:
+            interval += 1
+            wake = options["start"] + interval * options["interval"]
+            await asyncio.sleep(max(0.0, wake - time.monotonic()))
+            reports.put((interval, *stats.take()))
+
+    reporter = asyncio.create_task(report())
+    delay = options["start"] - time.monotonic()
+    await asyncio.gather(
+        *(
+            _play(
+                clients[i % connections],
+                seed,
+                delay + i * ramp_step,
+                deadline,
+                options["pipeline"],
+                options["think"],
+                stats,
+            )
+            for i, seed in enumerate(seeds)
+        )
+    )
+    reporter.cancel()
+    reports.put((None, *stats.take()))  # Whatever the last interval missed
+    for client in clients:
+        await client.close()
+
+
+def _run_generator(
+    path: str, seeds: range, connections: int, options: dict[str, Any], reports: Any
+) -> None:
+    asyncio.run(_generate(path, seeds, connections, options, reports))
+
+
+def server_pid(path: str) -> int | None:
+    """Process ID of the server on a Unix socket, where the OS tells it."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        credentials = sock.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+    return struct.unpack("3i", credentials)[0]
+
+
+def resident_memory(pid: int | None) -> int | None:
+    """Resident set size of a process in bytes, on Linux."""
+    try:
+        with open(f"/proc/{pid}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def format_row(
+    label: str, seconds: float, latencies: Histogram, errors: int, rss: int | None
+) -> str:
+    rate = latencies.count / seconds if seconds > 0 else 0.0
+    quantiles = "".join(
+        f" {latencies.quantile(q) * 1e3:9.3f}" for q in (0.5, 0.99, 0.999)
+    )
+    memory = f"{rss / 2**20:9.1f}" if rss is not None else "      n/a"
+    return f"{label:>8} {rate:10.0f}{quantiles} {errors:7} {memory}"
+
+
+def load_test(path: str, pid: int | None, args: argparse.Namespace) -> None:
+    options = {
+        "start": time.monotonic() + 1.0,  # Time for the generators to connect
+        "ramp_up": args.ramp_up,
+        "duration": args.duration,
+        "pipeline": args.pipeline,
+        "think": args.think,
+        "interval": args.interval,
+    }
+    reports: Any = multiprocessing.Queue()
+    generators = []
+    for index in range(args.processes):
+        seeds = range(args.seed + index, args.seed + args.sessions, args.processes)
+        connections = max(1, args.connections // args.processes)
+        generator = multiprocessing.Process(
+            target=_run_generator,
+            args=(path, seeds, connections, options, reports),
+            daemon=True,
+        )
+        generator.start()
+        generators.append(generator)
+
+    print(
+        f"{args.sessions} sessions, {args.connections} connections, "
+        f"{args.processes} load generator processes, pipeline {args.pipeline}, "
+        f"think {args.think * 1e3:g} ms"
+    )
+    print("    time  requests/s   p50 (ms)   p99 (ms)  p999 (ms)  errors  RSS (MiB)")
+    total = Histogram(LATENCY_BOUNDS)
+    total_errors = 0
+    peak_rss = None
+    pending: dict[int, list[Any]] = {}  # Reports of an interval so far
+    finished = 0
+    while finished < len(generators):
+        try:
+            interval, latencies, errors, active = reports.get(timeout=1.0)
+        except queue.Empty:
+            if not any(generator.is_alive() for generator in generators):
+                break  # A generator died without reporting
+            continue
+        latencies = Histogram.from_dict(latencies)
+        total.merge(latencies)
+        total_errors += errors
+        if interval is None:
+            finished += 1
+            continue
+        merged = pending.setdefault(interval, [Histogram(LATENCY_BOUNDS), 0, 0, 0])
+        merged[0].merge(latencies)
+        merged[1] += errors
+        merged[2] += active
+        merged[3] += 1
+        if merged[3] == len(generators):
+            del pending[interval]
+            rss = resident_memory(pid)
+            if rss is not None:
+                peak_rss = max(peak_rss or 0, rss)
+            label = f"{interval * args.interval:g}s"
+            print(format_row(label, args.interval, merged[0], merged[1], rss), end="")
+            print(f"  ({merged[2]} playing)")
+    for generator in generators:
+        generator.join()
+
+    elapsed = time.monotonic() - options["start"]
+    print(format_row("total", elapsed, total, total_errors, peak_rss), end="")
+    print("  (peak RSS)" if peak_rss is not None else "")
+    print(f"  max latency <= {total.quantile(1.0) * 1e3:g} ms, {total.count} requests")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=30.0, help="in seconds")
+    parser.add_argument(
+        "--ramp-up", type=float, default=5.0, help="seconds over which sessions start"
+    )
+    parser.add_argument(
+        "--think",
+        type=float,
+        default=1000.0,
+        help="mean think time between a session's moves, in ms (0: none)",
+    )
+    parser.add_argument("--pipeline", type=int, default=1, help="moves sent at once")
+    parser.add_argument("--interval", type=float, default=1.0, help="in seconds")
+    parser.add_argument("--seed", type=int, default=2048)
+    parser.add_argument(
+        "--connect",
+        metavar="PATH",
+        help="load a server already listening on this Unix socket",
+    )
+    parser.add_argument(
+        "--no-vector-engine",
+        action="store_true",
+        help="make the started server step every game through Game",
+    )
+    args = parser.parse_args()
+    if min(args.sessions, args.connections, args.processes, args.pipeline) < 1:
+        parser.error("sessions, connections, processes and pipeline must be >= 1")
+    args.think /= 1e3
+
+    if args.connect:
+        load_test(args.connect, server_pid(args.connect), args)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "server.sock")
+        command = [sys.executable, "-m", "headless.server", "--unix", path]
+        if args.no_vector_engine:
+            command.append("--no-vector-engine")
+        server = subprocess.Popen(command)
+        try:
+            asyncio.run(wait_for_socket(path))
+            load_test(path, server.pid, args)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
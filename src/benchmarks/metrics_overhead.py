@@ -0,0 +1,59 @@
+"""
+Benchmark for the cost of metrics on the move path.
+
+Plays the same seeded random games through Game.step() with metrics
+disabled and enabled, alternating for --rounds rounds, and reports the
+fastest round of each and the difference between them. Metrics are enabled
+the way --metrics-file does it, by a MetricsExporter, here with nothing to
+export to.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.metrics_overhead
+    PYTHONPATH=src python -m benchmarks.metrics_overhead --moves 200000 --size 8
+"""
+
+import argparse
+import random
+import time
+
+from core import metrics
+from game.game import DIRECTIONS, Game
+
+
+def play(moves: int, size: int, seed: int) -> float:
+    """Seconds to play the given number of random moves."""
+    rng = random.Random(seed)
+    directions = [rng.choice(DIRECTIONS) for _ in range(moves)]
+    game = Game(size, rng=random.Random(seed))
+    game.start()
+    start = time.perf_counter()
+    for direction in directions:
+        if game.game_over:
+            game = Game(size, rng=random.Random(seed))
+            game.start()
+        game.step(direction)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--moves", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=2048)
+    args = parser.parse_args()
+
+    play(args.moves // 10, args.size, args.seed)  # Warm up
+    disabled = enabled = float("inf")
+    for _ in range(args.rounds):
+        disabled = min(disabled, play(args.moves, args.size, args.seed))
+        with metrics.MetricsExporter():
+            enabled = min(enabled, play(args.moves, args.size, args.seed))
+
+    for label, seconds in (("disabled", disabled), ("enabled", enabled)):
+        print(f"metrics {label:8}  {seconds / args.moves * 1e9:8.0f} ns/move")
+    print(f"overhead {(enabled / disabled - 1) * 100:+.2f}%")
+
+
+if __name__ == "__main__":
+    main()
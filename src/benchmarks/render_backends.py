@@ -0,0 +1,126 @@
+"""
+Benchmark comparing the curses and raw ANSI render backends.
+
+Each backend draws the same seeded sequence of game frames inside a
+pseudo-terminal. Bytes per frame are measured from what reaches the
+terminal, with curses setup and teardown output subtracted.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.render_backends --frames 500
+"""
+
+import argparse
+import copy
+import curses
+import json
+import os
+import pty
+import random
+import selectors
+import statistics
+import time
+from typing import Any
+
+BENCH_LINES = 30
+BENCH_COLUMNS = 100
+
+
+def _bench_frames(
+    stdscr: curses.window, backend: str, frames: int, seed: int
+) -> list[float]:
+    from core.config import DEFAULT_CONFIG
+    from game.game import Game
+    from ui.modern_display import draw_modern_game, init_display
+
+    curses.curs_set(0)
+    init_display()
+
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["animations"]["enabled"] = False
+    config["ui"]["render_backend"] = backend
+
+    rng = random.Random(seed)
+    game = Game(rng=random.Random(seed))
+    game.start()
+
+    frame_times = []
+    for _ in range(frames):
+        if game.is_game_over():
+            game = Game(rng=random.Random(rng.random()))
+            game.start()
+        if game.move(rng.choice(("up", "down", "left", "right"))):
+            game.spawn_tile()
+
+        start = time.perf_counter()
+        draw_modern_game(stdscr, game, config)
+        frame_times.append(time.perf_counter() - start)
+    return frame_times
+
+
+def run_backend(backend: str, frames: int, seed: int) -> dict[str, Any]:
+    """Draw frames with one backend in a pseudo-terminal and measure them."""
+    result_read, result_write = os.pipe()
+    pid, master_fd = pty.fork()
+    if pid == 0:  # Child: render into the pseudo-terminal
+        os.close(result_read)
+        # The theme needs 256 colors; the pty is ours, so pick its terminal
+        os.environ["TERM"] = "xterm-256color"
+        os.environ["LINES"] = str(BENCH_LINES)
+        os.environ["COLUMNS"] = str(BENCH_COLUMNS)
+        try:
+            result: Any = curses.wrapper(_bench_frames, backend, frames, seed)
+        except Exception as e:
+            result = {"error": repr(e)}
+        os.write(result_write, json.dumps(result).encode())
+        os._exit(0)
+
+    os.close(result_write)
+    terminal_bytes = 0
+    payload = b""
+
+    # Drain both the terminal and the result pipe so the child never blocks
+    selector = selectors.DefaultSelector()
+    selector.register(master_fd, selectors.EVENT_READ)
+    selector.register(result_read, selectors.EVENT_READ)
+    while selector.get_map():
+        for key, _ in selector.select():
+            try:
+                chunk = os.read(key.fd, 65536)
+            except OSError:  # Child closed the terminal
+                chunk = b""
+            if not chunk:
+                selector.unregister(key.fd)
+            elif key.fd == master_fd:
+                terminal_bytes += len(chunk)
+            else:
+                payload += chunk
+    selector.close()
+    os.waitpid(pid, 0)
+    os.close(master_fd)
+    os.close(result_read)
+
+    result = json.loads(payload or b"[]")
+    if isinstance(result, dict):
+        raise RuntimeError(f"{backend} benchmark failed: {result['error']}")
+    return {"bytes": terminal_bytes, "frame_times": result}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=2048)
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'bytes/frame':>12} {'mean ms':>9} {'p95 ms':>9}")
+    for backend in ("curses", "ansi"):
+        overhead = run_backend(backend, 0, args.seed)["bytes"]
+        result = run_backend(backend, args.frames, args.seed)
+        times = sorted(result["frame_times"])
+        bytes_per_frame = (result["bytes"] - overhead) / max(1, args.frames)
+        mean_ms = statistics.fmean(times) * 1000 if times else 0.0
+        p95_ms = times[int(len(times) * 0.95)] * 1000 if times else 0.0
+        print(f"{backend:<8} {bytes_per_frame:>12.1f} {mean_ms:>9.3f} {p95_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark for listing save slots.
+
+Fills a temporary save directory with --slots saves of random games, once
+per save backend, and times get_all_save_slots_info(), the call behind the
+load menu: a directory listing and a JSON file parsed per slot for "json",
+one query for "sqlite". Opening the SQLite store for the first time also
+imports the JSON slots, which is timed separately.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.save_listing --slots 5000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from core.save_load import get_all_save_slots_info, get_save_store, save_game
+from game.game import DIRECTIONS, Game
+
+
+def fill(config: dict[str, Any], slots: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for slot in range(1, slots + 1):
+        game = Game(4, rng=random.Random(rng.random()))
+        game.start()
+        for _ in range(rng.randrange(200)):
+            game.step(rng.choice(DIRECTIONS))
+        save_game(game, slot, f"Game {slot}", config)
+
+
+def time_listing(config: dict[str, Any], repeat: int) -> tuple[float, int]:
+    """Median seconds per listing, and the number of slots listed."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        listing = get_all_save_slots_info(config)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(listing)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--slots", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=2048)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_config = {"save_path": directory, "save_backend": "json"}
+        fill(json_config, args.slots, args.seed)
+        seconds, listed = time_listing(json_config, args.repeat)
+        print(f"json    {seconds * 1e3:9.2f} ms per listing ({listed} slots)")
+
+        sqlite_config = {"save_path": directory, "save_backend": "sqlite"}
+        start = time.perf_counter()
+        get_save_store(sqlite_config)  # Imports the JSON slots
+        print(f"import  {(time.perf_counter() - start) * 1e3:9.2f} ms")
+        seconds, listed = time_listing(sqlite_config, args.repeat)
+        print(f"sqlite  {seconds * 1e3:9.2f} ms per listing ({listed} slots)")
+
+
+if __name__ == "__main__":
+    main()
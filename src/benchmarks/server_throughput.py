@@ -0,0 +1,202 @@
+"""
+Latency and throughput benchmark for the game server.
+
+Starts a server on a temporary Unix socket in a subprocess, then plays
+random moves on many sessions from several client connections. Each
+session keeps up to --pipeline requests in flight; with --pipeline 1 every
+move waits for the previous reply, which measures round-trip latency.
+
+With --batch, each client instead steps all of its sessions together in
+binary batch requests, and latency is per batch.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.server_throughput --clients 8 --sessions 64
+    PYTHONPATH=src python -m benchmarks.server_throughput --sessions 1024 --batch
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from headless.client import GameClient
+
+DIRECTION_NAMES = ("up", "down", "left", "right")
+
+
+async def wait_for_socket(path: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise TimeoutError("server did not start")
+        await asyncio.sleep(0.05)
+
+
+async def _play_session(
+    client: GameClient,
+    moves: int,
+    pipeline: int,
+    rng: random.Random,
+    latencies: list[float],
+) -> None:
+    async def timed_move(session: int) -> bool:
+        start = time.perf_counter()
+        state = await client.move(session, rng.choice(DIRECTION_NAMES))
+        latencies.append(time.perf_counter() - start)
+        return state["game_over"]
+
+    session, _ = await client.create(seed=rng.randrange(1 << 30))
+    remaining = moves
+    while remaining > 0:
+        window = min(pipeline, remaining)
+        game_over = await asyncio.gather(*(timed_move(session) for _ in range(window)))
+        remaining -= window
+        if any(game_over):  # Carry on with a fresh game
+            await client.close_session(session)
+            session, _ = await client.create(seed=rng.randrange(1 << 30))
+    await client.close_session(session)
+
+
+# Maps random bytes to direction indices
+_DIRECTION_BYTES = bytes(i % 4 for i in range(256))
+
+
+async def _play_batches(
+    client: GameClient,
+    session_ids: list[int],
+    moves: int,
+    pipeline: int,
+    rng: random.Random,
+    latencies: list[float],
+) -> int:
+    """Step all sessions of one client together; returns the moves played."""
+
+    async def timed_batch() -> None:
+        directions = rng.randbytes(len(session_ids)).translate(_DIRECTION_BYTES)
+        start = time.perf_counter()
+        await client.step_batch(session_ids, directions)
+        latencies.append(time.perf_counter() - start)
+
+    rounds = 0
+    while rounds < moves:
+        await asyncio.gather(*(timed_batch() for _ in range(pipeline)))
+        rounds += pipeline
+    return len(session_ids) * rounds
+
+
+async def _run_clients(
+    path: str,
+    clients: int,
+    sessions: int,
+    moves: int,
+    pipeline: int,
+    seed: int,
+    batch: bool,
+) -> tuple[float, int, list[float]]:
+    connections = [await GameClient.connect(unix_path=path) for _ in range(clients)]
+    latencies: list[float] = []
+    rng = random.Random(seed)
+    if batch:
+        session_ids = [
+            [
+                (await connection.create(seed=rng.randrange(1 << 30)))[0]
+                for _ in range(sessions // clients)
+            ]
+            for connection in connections
+        ]
+        start = time.perf_counter()
+        played = await asyncio.gather(
+            *(
+                _play_batches(
+                    connection,
+                    ids,
+                    moves,
+                    pipeline,
+                    random.Random(rng.random()),
+                    latencies,
+                )
+                for connection, ids in zip(connections, session_ids, strict=True)
+            )
+        )
+        total = sum(played)
+    else:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _play_session(
+                    connections[i % clients],
+                    moves,
+                    pipeline,
+                    random.Random(rng.random()),
+                    latencies,
+                )
+                for i in range(sessions)
+            )
+        )
+        total = len(latencies)
+    elapsed = time.perf_counter() - start
+    for connection in connections:
+        await connection.close()
+    return elapsed, total, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--moves", type=int, default=200, help="moves per session")
+    parser.add_argument("--pipeline", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=2048)
+    parser.add_argument(
+        "--batch", action="store_true", help="use binary batch step requests"
+    )
+    parser.add_argument(
+        "--no-vector-engine",
+        action="store_true",
+        help="make the server step every game through Game",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "server.sock")
+        command = [sys.executable, "-m", "headless.server", "--unix", path]
+        if args.no_vector_engine:
+            command.append("--no-vector-engine")
+        server = subprocess.Popen(command)
+        try:
+            asyncio.run(wait_for_socket(path))
+            elapsed, total, latencies = asyncio.run(
+                _run_clients(
+                    path,
+                    args.clients,
+                    args.sessions,
+                    args.moves,
+                    args.pipeline,
+                    args.seed,
+                    args.batch,
+                )
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    mode = "batch" if args.batch else "single"
+    print(
+        f"{args.clients} clients, {args.sessions} sessions, {mode} moves, "
+        f"pipeline {args.pipeline}: {total} moves in {elapsed:.2f}s"
+    )
+    print(f"  throughput  {total / elapsed:10.0f} moves/s")
+    count = len(latencies)
+    print(f"  latency p50 {latencies[count // 2] * 1e3:10.3f} ms")
+    print(f"  latency p99 {latencies[int(count * 0.99)] * 1e3:10.3f} ms")
+    print(f"  latency avg {statistics.fmean(latencies) * 1e3:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
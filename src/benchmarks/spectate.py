@@ -0,0 +1,138 @@
+"""
+Benchmark for spectator streaming.
+
+Plays random moves at --rate moves a second, like a game loop, while
+broadcasting them through a SpectatorHub, with no spectators and then with
+--spectators of them connected from another process, and reports the time
+each move and its publishing take the player. The spectators decode every
+frame and check that their copy of the board ends up the same as the
+player's.
+
+With --rate 0 the moves are played flat out; on a machine with fewer cores
+than processes, the spectators' decoding then competes with the player.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.spectate --spectators 100
+    PYTHONPATH=src python -m benchmarks.spectate --rate 0 --size 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import selectors
+import socket
+import statistics
+import tempfile
+import time
+from typing import Any
+
+from game.game import DIRECTIONS, Game
+from headless.spectate import SpectatorHub, apply_frame, decode_frame, split_frames
+
+
+def watch(path: str, count: int, ready: Any, conn: Any) -> None:
+    """Run count spectators until the hub closes; send back each final board."""
+    selector = selectors.DefaultSelector()
+    for _ in range(count):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        sock.sendall(b"0\n")
+        sock.setblocking(False)
+        spectator = (sock, bytearray(), Game(sparse=False))
+        selector.register(sock, selectors.EVENT_READ, spectator)
+    ready.set()
+    boards = []
+    while selector.get_map():
+        for key, _ in selector.select():
+            sock, inbox, game = key.data
+            data = sock.recv(1 << 20)
+            if not data:
+                selector.unregister(sock)
+                boards.append((game.board.grid, game.score))
+                continue
+            inbox += data
+            for payload in split_frames(inbox):
+                apply_frame(game, decode_frame(payload))
+    conn.send(boards)
+
+
+def play(
+    hub: SpectatorHub, moves: int, size: int, rate: float, seed: int
+) -> tuple[list[float], tuple[list[list[int]], int]]:
+    """Random play through the hub; seconds per move, and the final board."""
+    interval = 1 / rate if rate > 0 else 0.0
+    next_move = time.perf_counter()
+    rng = random.Random(seed)
+    times = []
+    game = Game(size, rng=random.Random(seed))
+    game.start()
+    hub.publish_keyframe(0, game)
+    for _ in range(moves):
+        next_move += interval
+        start = time.perf_counter()
+        if game.game_over:
+            game = Game(size, rng=random.Random(rng.random()))
+            game.start()
+            hub.publish_keyframe(0, game)
+        elif game.step(rng.choice(DIRECTIONS)):
+            hub.publish_move(0, game)
+        end = time.perf_counter()
+        times.append(end - start)
+        if next_move > end:
+            time.sleep(next_move - end)
+    return times, (game.board.grid, game.score)
+
+
+def run(
+    spectators: int, moves: int, size: int, rate: float, seed: int
+) -> tuple[list[float], bool]:
+    path = os.path.join(tempfile.mkdtemp(), "spectate.sock")
+    hub = SpectatorHub(path)
+    ready = multiprocessing.Event()
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    watcher = None
+    if spectators:
+        watcher = multiprocessing.Process(
+            target=watch, args=(path, spectators, ready, sender)
+        )
+        watcher.start()
+        ready.wait()
+        while hub.spectators < spectators:
+            time.sleep(0.01)
+    times, final = play(hub, moves, size, rate, seed)
+    hub.close(timeout=60)  # Spectators may be far behind with --rate 0
+    same = True
+    if watcher is not None:
+        boards = receiver.recv()
+        watcher.join()
+        same = len(boards) == spectators and all(b == final for b in boards)
+    os.rmdir(os.path.dirname(path))
+    return times, same
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--spectators", type=int, default=100)
+    parser.add_argument("--moves", type=int, default=5000)
+    parser.add_argument(
+        "--rate", type=float, default=500, help="moves per second (0: no limit)"
+    )
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=2048)
+    args = parser.parse_args()
+
+    run(0, args.moves // 10, args.size, args.rate, args.seed)  # Warm up
+    for spectators in (0, args.spectators):
+        times, same = run(spectators, args.moves, args.size, args.rate, args.seed)
+        check = "boards match" if same else "BOARDS DIFFER"
+        median = statistics.median(times) * 1e6
+        p99 = statistics.quantiles(times, n=100)[-1] * 1e6
+        print(
+            f"{spectators:4} spectators  median {median:6.1f} us/move, "
+            f"p99 {p99:6.1f} us  ({check})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for the reinforcement learning environments.
+
+Plays random actions in one VectorEnv of --envs games, in a
+SubprocVectorEnv for each --workers count and, for comparison, in a loop
+over GameEnv, and reports environment steps per second. Memory allocated
+while stepping is measured with tracemalloc in a separate pass.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m benchmarks.vector_env --envs 4096 --steps 500
+    PYTHONPATH=src python -m benchmarks.vector_env --envs 65536 --workers 1 2 4
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from rl.env import ACTION_COUNT, GameEnv, VectorEnv
+from rl.subproc_env import SubprocVectorEnv
+
+
+def bench_vector(envs: int, steps: int, size: int, masks: bool, seed: int) -> float:
+    env = VectorEnv(envs, size, action_masks=masks)
+    env.reset(seed=seed)
+    actions = np.random.default_rng(seed).integers(0, ACTION_COUNT, (steps, envs))
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    return envs * steps / (time.perf_counter() - start)
+
+
+def bench_subproc(envs: int, steps: int, size: int, workers: int, seed: int) -> float:
+    with SubprocVectorEnv(envs, workers, size) as env:
+        env.reset(seed=seed)
+        actions = np.random.default_rng(seed).integers(0, ACTION_COUNT, (steps, envs))
+        start = time.perf_counter()
+        for step_actions in actions:
+            env.step(step_actions)
+        return envs * steps / (time.perf_counter() - start)
+
+
+def bench_single(steps: int, size: int, seed: int) -> float:
+    env = GameEnv(size)
+    env.reset(seed=seed)
+    actions = np.random.default_rng(seed).integers(0, ACTION_COUNT, steps).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        if env.step(action)[2]:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def step_allocations(envs: int, steps: int, size: int, masks: bool) -> tuple[int, int]:
+    """Bytes still held after stepping, and the largest transient peak."""
+    env = VectorEnv(envs, size, action_masks=masks)
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(0, ACTION_COUNT, (steps, envs))
+    env.step(actions[0])
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for step_actions in actions:
+        env.step(step_actions)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current - before, peak - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=2048)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="*",
+        default=[],
+        help="worker counts to run SubprocVectorEnv with",
+    )
+    args = parser.parse_args()
+
+    single = bench_single(args.steps * 20, args.size, args.seed)
+    print(f"GameEnv                  {single:12.0f} steps/s")
+    for masks in (False, True):
+        rate = bench_vector(args.envs, args.steps, args.size, masks, args.seed)
+        retained, peak = step_allocations(args.envs, 50, args.size, masks)
+        label = "VectorEnv + masks" if masks else "VectorEnv"
+        print(
+            f"{label:<24} {rate:12.0f} steps/s  ({rate / single:.0f}x), "
+            f"{retained} bytes kept, {peak} bytes peak over 50 steps"
+        )
+    for workers in args.workers:
+        rate = bench_subproc(args.envs, args.steps, args.size, workers, args.seed)
+        label = f"SubprocVectorEnv x{workers}"
+        print(f"{label:<24} {rate:12.0f} steps/s  ({rate / single:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,12 @@ import json
 import os
 from typing import Any
 
-from .constants import CONFIG_FILENAME
+from .constants import AUTOSAVE_EVERY_MOVES, AUTOSAVE_INTERVAL, CONFIG_FILENAME
 
 CONFIG_FILE = CONFIG_FILENAME
 
 # Default key mappings
-DEFAULT_CONFIG = {
+DEFAULT_CONFIG: dict[str, Any] = {
     "keys": {
         "movement": {
             "up": ["KEY_UP", "w"],
@@ -27,8 +27,23 @@ DEFAULT_CONFIG = {
     "theme": "modern",
     "language": "en",  # Default language
     "save_path": None,  # None means use default path
+    "save_backend": "sqlite",  # "sqlite" or "json" (a file per slot)
+    "autosave": {
+        "enabled": True,
+        "every_moves": AUTOSAVE_EVERY_MOVES,
+        "interval": AUTOSAVE_INTERVAL,  # seconds
+    },
+    "animations": {
+        "enabled": True,
+        "speed": 1.0,
+        "fps": 60,
+    },
     "ui": {
         "emoji_enabled": False,
+        "render_backend": "curses",  # "curses" or "ansi"
+    },
+    "debug": {
+        "overlay": False,
     },
 }
 
@@ -90,6 +105,17 @@ def set_save_path(config: dict[str, Any], save_path: str | None) -> bool:
     return save_config(config)
 
 
+def get_save_backend(config: dict[str, Any] | None) -> str:
+    """Get where save slots are kept ("sqlite" or "json")."""
+    backend = (config or {}).get("save_backend", "sqlite")
+    return backend if backend in ("sqlite", "json") else "sqlite"
+
+
+def get_autosave_config(config: dict[str, Any]) -> dict[str, Any]:
+    """Get autosave settings, with defaults for any that are missing."""
+    return {**DEFAULT_CONFIG["autosave"], **config.get("autosave", {})}
+
+
 def get_key_codes(
     config: dict[str, Any],
 ) -> tuple[dict[int, str], dict[str, list[int]]]:
@@ -133,6 +159,12 @@ def is_emoji_enabled(config: dict[str, Any]) -> bool:
     return ui.get("emoji_enabled", False)
 
 
+def get_render_backend(config: dict[str, Any]) -> str:
+    """Get the game screen render backend ("curses" or "ansi")."""
+    backend = get_ui_config(config).get("render_backend", "curses")
+    return backend if backend in ("curses", "ansi") else "curses"
+
+
 def set_emoji_enabled(config: dict[str, Any], enabled: bool) -> bool:
     """Enable or disable emoji display and save config. Returns True if successful."""
     if "ui" not in config:
@@ -148,6 +180,45 @@ def set_emoji_enabled(config: dict[str, Any], enabled: bool) -> bool:
     return save_config(config)
 
 
+def get_animation_config(config: dict[str, Any]) -> dict[str, Any]:
+    """Get animation configuration settings."""
+    return config.get("animations", DEFAULT_CONFIG["animations"])
+
+
+def is_animations_enabled(config: dict[str, Any]) -> bool:
+    """Check if tile animations are enabled."""
+    return get_animation_config(config).get("enabled", True)
+
+
+def set_animations_enabled(config: dict[str, Any], enabled: bool) -> bool:
+    """Enable or disable animations and save config. Returns True if successful."""
+    config.setdefault("animations", dict(DEFAULT_CONFIG["animations"]))
+    config["animations"]["enabled"] = enabled
+    return save_config(config)
+
+
+def get_animation_speed(config: dict[str, Any]) -> float:
+    """Get the animation speed multiplier."""
+    return get_animation_config(config).get("speed", 1.0)
+
+
+def set_animation_speed(config: dict[str, Any], speed: float) -> bool:
+    """Set the animation speed multiplier and save. Returns True if successful."""
+    config.setdefault("animations", dict(DEFAULT_CONFIG["animations"]))
+    config["animations"]["speed"] = speed
+    return save_config(config)
+
+
+def get_animation_fps(config: dict[str, Any]) -> int:
+    """Get the target animation frame rate."""
+    return get_animation_config(config).get("fps", 60)
+
+
+def is_debug_overlay_enabled(config: dict[str, Any]) -> bool:
+    """Check if the debug overlay (frame pacing stats) is enabled."""
+    return config.get("debug", {}).get("overlay", False)
+
+
 def get_language(config: dict[str, Any]) -> str:
     """Get the current language from config."""
     return config.get("language", "en")
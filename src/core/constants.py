@@ -5,6 +5,7 @@ Contains all magic numbers used throughout the application.
 
 # Game mechanics constants
 DEFAULT_BOARD_SIZE = 4
+SPARSE_BOARD_MIN_SIZE = 32  # Boards this large store only occupied cells
 INITIAL_TILE_VALUE = 2
 SPECIAL_TILE_VALUE = 4
 WIN_TILE_VALUE = 2048
@@ -24,6 +25,8 @@ CHANCE_SCORE_INTERVAL = 2000
 TILE_WIDTH = 6
 TILE_HEIGHT = 3
 TILE_SPACING = 2
+COMPACT_TILE_STEP_X = 2  # Compact mode: one cell per tile plus a gap
+VIEWPORT_PAN_STEP = 2  # Tiles moved per panning key press
 BOARD_PADDING = 2
 MIN_TERMINAL_WIDTH = 80
 MIN_TERMINAL_HEIGHT = 24
@@ -31,12 +34,100 @@ MIN_TERMINAL_HEIGHT = 24
 # Display timing constants
 SCORE_FADE_RECENT_THRESHOLD = 2.0  # seconds
 SCORE_FADE_MEDIUM_THRESHOLD = 5.0  # seconds
+TIMER_WHEEL_TICK = 0.05  # seconds per timer wheel slot
+TIMER_WHEEL_SLOTS = 256  # One revolution covers SCORE_CHANGE_DISPLAY_DURATION
+
+# Built-in player constants
+SEARCH_DEPTH = 1  # Moves looked ahead; 1 picks the best afterstate
+SEARCH_MAX_CHANCE_CELLS = 6  # Empty cells considered per spawn in the search
+HEURISTIC_LOST_PENALTY = 200000.0  # Base value of every line
+HEURISTIC_MONOTONICITY_POWER = 4.0
+HEURISTIC_MONOTONICITY_WEIGHT = 47.0
+HEURISTIC_SUM_POWER = 3.5
+HEURISTIC_SUM_WEIGHT = 11.0
+HEURISTIC_MERGES_WEIGHT = 700.0
+HEURISTIC_EMPTY_WEIGHT = 270.0
+
+# Autoplay constants
+AUTOPLAY_MOVE_INTERVAL = 0.15  # seconds between moves in demo speed
+AUTOPLAY_GAME_OVER_PAUSE = 1.5  # seconds a finished game stays up in demo speed
+AUTOPLAY_MAX_FPS = 30  # Display rate cap in turbo mode
+AUTOPLAY_STATS_WINDOW = 1.0  # seconds of history behind the rate readouts
+AUTOPLAY_INPUT_CHECK_INTERVAL = 0.05  # seconds between key polls in turbo mode
+
+# Headless mode constants
+PIPE_READ_SIZE = 65536  # Bytes read from stdin at a time
+PIPE_OUTPUT_BLOCK_SIZE = 65536  # Output is written in blocks of about this size
+ANALYZE_BATCH_SIZE = 256  # Positions sent to a worker at a time
+ANALYZE_BATCHES_PER_WORKER = 4  # Batches in flight per worker; bounds memory
+SERVER_DEFAULT_HOST = "127.0.0.1"
+SERVER_DEFAULT_PORT = 2048
+SERVER_IDLE_TIMEOUT = 600.0  # seconds before an unused session is dropped
+SERVER_EVICT_INTERVAL = 10.0  # seconds between idle session sweeps
+SERVER_MAX_SESSIONS = 100000
+SERVER_MAX_BOARD_SIZE = 256
+SERVER_MAX_BATCH_PAIRS = 1 << 20  # Moves in one batch step request
+SERVER_WRITE_BUFFER_LIMIT = 65536  # Unsent reply bytes before waiting on the socket
+SPECTATE_FLUSH_INTERVAL = 1 / 60  # seconds between sends to spectators, at least
+SPECTATE_CLIENT_BUFFER_LIMIT = 1 << 20  # Unsent bytes before a spectator skips ahead
+SPECTATE_CLOSE_TIMEOUT = 1.0  # seconds to finish sending to spectators on close
+VECTOR_ENGINE_MAX_SIZE = 4  # Largest board the NumPy engine's line tables cover
+INFERENCE_MAX_BATCH = 256  # Evaluation requests answered by one evaluator call
+INFERENCE_MAX_WAIT = 0.002  # seconds a request waits for others to batch with
+INFERENCE_MIN_TABLE_BATCH = 3  # Fewer boards of a size are cheaper to search singly
+INFERENCE_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+INFERENCE_LATENCY_BUCKETS = (  # seconds
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+)
+
+# Metrics constants
+METRICS_WRITE_INTERVAL = 10.0  # seconds between rewrites of the metrics file
+METRICS_TIME_BUCKETS = (  # seconds
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+# Animation constants
+EASING_TABLE_SIZE = 1024  # Samples per easing curve lookup table
+
+# Frame pacing constants
+FRAME_PACING_MIN_FPS = 10  # Floor for the degraded frame rate
+FRAME_PACING_SMOOTHING = 0.25  # Weight of the newest sample in the moving average
+FRAME_PACING_DEGRADE_FRAMES = 3  # Consecutive slow frames before degrading
+FRAME_PACING_RECOVER_FRAMES = 20  # Consecutive fast frames before recovering
+FRAME_PACING_RECOVER_RATIO = 0.5  # Cost must fit in this share of the better budget
 
 # File and directory constants
 CONFIG_FILENAME = "config.json"
 SAVE_SLOT_PREFIX = "slot_"
 SAVE_FILE_EXTENSION = ".json"
-DEFAULT_SAVE_SLOTS = 5
+SAVE_DATABASE_FILENAME = "saves.sqlite3"  # In the save directory, for "sqlite"
+SAVE_INDEX_FILENAME = "saves_index.json"  # Slot listing manifest, for "json"
+AUTO_SAVE_SLOT = 0  # Slot the game autosaves to
+AUTOSAVE_EVERY_MOVES = 25  # Moves between autosaves
+AUTOSAVE_INTERVAL = 30.0  # seconds between autosaves while moves are made
+PERSISTENCE_CLOSE_TIMEOUT = 5.0  # seconds to finish pending saves on exit
+SAVE_MENU_FLUSH_TIMEOUT = 0.2  # seconds a save menu waits for pending saves
 
 # Color pair ID ranges (to avoid conflicts with system colors)
 COLOR_PAIR_START_TILE = 100
@@ -55,3 +146,4 @@ ASCII_PRINTABLE_END = 126
 # Input validation constants
 MAX_INPUT_LENGTH = 30
 MAX_PATH_LENGTH = 255
+MAX_COALESCED_KEYS = 64  # Upper bound on keys drained per input batch
@@ -86,12 +86,13 @@ class I18nManager:
 
         return current
 
-    def t(self, key: str, use_emoji: bool | None = None, **kwargs) -> str:
+    def t(self, key: str, *args, use_emoji: bool | None = None, **kwargs) -> str:
         """
         Translate a key to the current language.
 
         Args:
             key: Translation key (supports dot notation, e.g., 'menu.new_game')
+            *args: Positional format arguments for '{}' placeholders
             use_emoji: Override emoji setting for this translation
             **kwargs: Format arguments for string formatting
 
@@ -107,16 +108,16 @@ class I18nManager:
             emoji_translation = self._get_translation(emoji_key)
             if emoji_translation:
                 try:
-                    return emoji_translation.format(**kwargs)
-                except (KeyError, ValueError):
+                    return emoji_translation.format(*args, **kwargs)
+                except (IndexError, KeyError, ValueError):
                     pass
 
         # Get regular translation
         translation = self._get_translation(key)
         if translation:
             try:
-                return translation.format(**kwargs)
-            except (KeyError, ValueError):
+                return translation.format(*args, **kwargs)
+            except (IndexError, KeyError, ValueError):
                 return translation
 
         # Fallback to key if no translation found
@@ -216,19 +217,20 @@ def get_i18n_manager() -> I18nManager:
     return _i18n_manager
 
 
-def t(key: str, use_emoji: bool | None = None, **kwargs) -> str:
+def t(key: str, *args, use_emoji: bool | None = None, **kwargs) -> str:
     """
     Convenience function for translation.
 
     Args:
         key: Translation key
+        *args: Positional format arguments for '{}' placeholders
         use_emoji: Override emoji setting for this translation
         **kwargs: Format arguments for string formatting
 
     Returns:
         Translated string
     """
-    return _i18n_manager.t(key, use_emoji=use_emoji, **kwargs)
+    return _i18n_manager.t(key, *args, use_emoji=use_emoji, **kwargs)
 
 
 def set_language(language_code: str) -> bool:
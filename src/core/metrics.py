@@ -0,0 +1,342 @@
+"""
+Runtime statistics for 2048-CLI.
+Histograms over fixed bucket bounds, cheap enough to update on every
+request and small enough to print or send as they are. hdr_bounds() gives
+bounds of a fixed relative precision over a wide range, as HDR histograms
+use for latencies.
+
+The process-wide registry holds named counters, gauges and histograms that
+the game, search, renderer and save code update, and exports them in the
+Prometheus text format to a file or over local HTTP (see MetricsExporter).
+Instrumented code checks the module's enabled flag first, so metrics cost
+one attribute lookup on hot paths until an exporter is started.
+"""
+
+import bisect
+import math
+import os
+import tempfile
+import threading
+from collections.abc import Callable, Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from core.constants import METRICS_WRITE_INTERVAL
+
+# Set by MetricsExporter; instrumented code skips its updates while False
+enabled = False
+
+
+def hdr_bounds(
+    lowest: float, highest: float, significant_figures: int = 2
+) -> tuple[float, ...]:
+    """
+    Bounds from lowest to at least highest, each decade split linearly so
+    that every bucket is within one unit of the last significant figure,
+    e.g. 1.0, 1.1, ... 9.9, 10, 11, ... for 2 figures.
+    """
+    steps = 10 ** (significant_figures - 1)
+    exponent = math.floor(math.log10(lowest)) - significant_figures + 1
+    bounds: list[float] = []
+    while not bounds or bounds[-1] < highest:
+        # Parsed from decimal, so 1.1 isn't 1.1000000000000001
+        decade = range(steps, steps * 10)
+        bounds.extend(
+            bound
+            for bound in (float(f"{mantissa}e{exponent}") for mantissa in decade)
+            if bound >= lowest
+        )
+        exponent += 1
+    return tuple(bounds)
+
+
+class Histogram:
+    """Counts of observed values per bucket, each bucket up to an upper bound."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(sorted(bounds))
+        # One more bucket for values above every bound
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float, times: int = 1) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += times
+        self.count += times
+        self.total += value * times
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the counts of a histogram with the same bounds."""
+        if other.bounds != self.bounds:
+            raise ValueError("histograms have different bounds")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts, strict=True)]
+        self.count += other.count
+        self.total += other.total
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile; inf past the last."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.total,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Histogram":
+        """Inverse of to_dict()."""
+        histogram = cls(data["bounds"])
+        histogram.counts = list(data["counts"])
+        histogram.count = data["count"]
+        histogram.total = data["sum"]
+        return histogram
+
+    def format(self, scale: float = 1.0, unit: str = "", width: int = 40) -> str:
+        """Bucket counts as text bars, with bounds multiplied by scale."""
+        peak = max(self.counts) or 1
+        labels = [f"<= {bound * scale:g}{unit}" for bound in self.bounds]
+        labels.append(f" > {self.bounds[-1] * scale:g}{unit}" if self.bounds else "all")
+        label_width = max(map(len, labels))
+        return "\n".join(
+            f"{label:>{label_width}} {count:>9} {'#' * round(width * count / peak)}"
+            for label, count in zip(labels, self.counts, strict=True)
+        )
+
+
+class Counter:
+    """A count that only goes up."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """A value that can go up and down."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: float = 0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class Registry:
+    """
+    Metrics by name, in registration order.
+
+    Registering a name twice returns the metric already there, so modules
+    can declare theirs at import time. A counter or gauge can instead be
+    read from a function when exported (counter_function(),
+    gauge_function()), which costs nothing in between; registering one
+    replaces any metric of that name.
+    """
+
+    def __init__(self) -> None:
+        # name -> (type, help, Counter | Gauge | Histogram | function)
+        self._metrics: dict[str, tuple[str, str, Any]] = {}
+
+    def _register(self, kind: str, name: str, help_text: str, metric: Any) -> Any:
+        existing = self._metrics.get(name)
+        if existing is not None and not callable(metric):
+            if existing[0] != kind:
+                raise ValueError(f"{name} is already a {existing[0]}")
+            return existing[2]
+        self._metrics[name] = (kind, help_text, metric)
+        return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register("counter", name, help_text, Counter())
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._register("gauge", name, help_text, Gauge())
+
+    def counter_function(
+        self, name: str, help_text: str, function: Callable[[], float]
+    ) -> None:
+        """A counter whose value is read from function when exported."""
+        self._register("counter", name, help_text, function)
+
+    def gauge_function(
+        self, name: str, help_text: str, function: Callable[[], float]
+    ) -> None:
+        """A gauge whose value is read from function when exported."""
+        self._register("gauge", name, help_text, function)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        bounds: Sequence[float] = (),
+        histogram: Histogram | None = None,
+    ) -> Histogram:
+        """A new histogram over bounds, or an existing one to export as is."""
+        if histogram is not None:
+            self._metrics[name] = ("histogram", help_text, histogram)
+            return histogram
+        return self._register("histogram", name, help_text, Histogram(bounds))
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        for name, (kind, help_text, metric) in list(self._metrics.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind != "histogram":
+                value = metric() if callable(metric) else metric.value
+                lines.append(f"{name} {_format_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(
+                (*metric.bounds, math.inf), list(metric.counts), strict=True
+            ):
+                cumulative += count
+                le = _format_number(bound)
+                lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum {_format_number(metric.total)}")
+            lines.append(f"{name}_count {metric.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write render() to a file, replacing it in one step for readers."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+registry = Registry()
+
+
+class MetricsExporter:
+    """
+    Turns metrics on and exports the registry until closed: rewritten to a
+    file every METRICS_WRITE_INTERVAL seconds (and on close), and served at
+    http://127.0.0.1:<port>/metrics.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        port: int | None = None,
+        interval: float = METRICS_WRITE_INTERVAL,
+        metrics: Registry | None = None,
+    ) -> None:
+        global enabled
+        self.path = path
+        self.registry = metrics if metrics is not None else registry
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._server: ThreadingHTTPServer | None = None
+        enabled = True
+
+        if port is not None:
+            self._server = ThreadingHTTPServer(
+                ("127.0.0.1", port), _handler(self.registry)
+            )
+            self._threads.append(
+                threading.Thread(
+                    target=self._server.serve_forever, name="metrics-http", daemon=True
+                )
+            )
+        if path is not None:
+            self._threads.append(
+                threading.Thread(
+                    target=self._write_every,
+                    args=(path, interval),
+                    name="metrics-file",
+                    daemon=True,
+                )
+            )
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def port(self) -> int | None:
+        """The HTTP port, e.g. the one chosen for port 0."""
+        return self._server.server_address[1] if self._server else None
+
+    def _write_every(self, path: str, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.registry.write(path)
+            except OSError:
+                pass  # Try again next time, e.g. once the disk has room
+
+    def close(self) -> None:
+        global enabled
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        if self.path is not None:
+            try:
+                self.registry.write(self.path)
+            except OSError:
+                pass
+        enabled = False
+
+    def __enter__(self) -> "MetricsExporter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _handler(metrics: Registry) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # Scrapes would flood the terminal
+
+    return MetricsHandler
@@ -114,3 +114,19 @@ def get_ui_color_pairs() -> dict[str, int]:
         "score_accent": COLOR_PAIRS["ui_score_accent"],
         "controls": COLOR_PAIRS["ui_controls"],
     }
+
+
+def get_color_pair_colors(pair_id: int) -> tuple[int, int] | None:
+    """Get the (fg, bg) colors of a color pair, or None for unknown pairs."""
+    theme = MODERN_THEME
+    for name, pid in COLOR_PAIRS.items():
+        if pid != pair_id:
+            continue
+        if name == "tile_empty":
+            colors = theme["tile_colors"][0]
+            return colors["fg"], colors["bg"]
+        if name.startswith("tile_"):
+            colors = theme["tile_colors"][int(name[len("tile_") :])]
+            return colors["fg"], colors["bg"]
+        return theme["ui_colors"][name[len("ui_") :]], -1
+    return None
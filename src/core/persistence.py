@@ -0,0 +1,170 @@
+"""
+Background saving for 2048-CLI.
+A PersistenceWorker writes save snapshots on its own thread, so the game
+loop only copies the board and hands it over; a slow or network save
+directory never holds up input. Snapshots for a slot that is still waiting
+to be written replace the waiting one, so a burst of autosaves costs one
+write of the latest board.
+
+An Autosaver decides when the game is autosaved: every AUTOSAVE_EVERY_MOVES
+moves or AUTOSAVE_INTERVAL seconds, whichever comes first, and when the
+game is left.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .constants import (
+    AUTO_SAVE_SLOT,
+    AUTOSAVE_EVERY_MOVES,
+    AUTOSAVE_INTERVAL,
+    PERSISTENCE_CLOSE_TIMEOUT,
+)
+from .save_load import snapshot_game, write_save
+
+
+class PersistenceWorker:
+    """Writes save snapshots in the order given, on a thread of its own."""
+
+    def __init__(self, write: Callable[..., bool] = write_save) -> None:
+        """
+        Args:
+            write: Called as write(slot, snapshot, config) and returns
+                whether it worked; save_load.write_save() writes atomically
+        """
+        self._write = write
+        # Latest snapshot and config per slot not yet written, oldest first
+        self._pending: dict[int, tuple[dict[str, Any], dict[str, Any] | None]] = {}
+        self._writing: int | None = None  # Slot being written
+        self._closed = False
+        self._condition = threading.Condition()
+        self.written = 0
+        self.merged = 0  # Snapshots replaced before they were written
+        self.failed = 0
+        self._thread = threading.Thread(
+            target=self._run, name="persistence", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self, slot: int, data: dict[str, Any], config: dict[str, Any] | None = None
+    ) -> None:
+        """Queue a snapshot_game() for a slot; returns without touching the disk."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("persistence worker is closed")
+            if slot in self._pending:
+                self.merged += 1
+            self._pending[slot] = (data, config)
+            self._condition.notify_all()
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending) + (self._writing is not None)
+
+    def pending_slots(self) -> set[int]:
+        """Slots with a snapshot queued or being written."""
+        with self._condition:
+            slots = set(self._pending)
+            if self._writing is not None:
+                slots.add(self._writing)
+            return slots
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued snapshot is written; False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and self._writing is None, timeout
+            )
+
+    def close(self, timeout: float = PERSISTENCE_CLOSE_TIMEOUT) -> bool:
+        """
+        Write what is queued, waiting at most timeout seconds, and stop.
+        Returns False if snapshots were left unwritten.
+        """
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if flushed:
+            self._thread.join()
+        return flushed
+
+    def __enter__(self) -> "PersistenceWorker":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return  # Closed with nothing left to write
+                slot = next(iter(self._pending))
+                data, config = self._pending.pop(slot)
+                self._writing = slot
+            try:
+                ok = self._write(slot, data, config)
+            except Exception:
+                ok = False
+            with self._condition:
+                self._writing = None
+                if ok:
+                    self.written += 1
+                else:
+                    self.failed += 1
+                self._condition.notify_all()
+
+
+class Autosaver:
+    """Autosaves one game through a PersistenceWorker as it is played."""
+
+    def __init__(
+        self,
+        worker: PersistenceWorker,
+        config: dict[str, Any] | None = None,
+        name: str | None = None,
+        slot: int = AUTO_SAVE_SLOT,
+        every_moves: int = AUTOSAVE_EVERY_MOVES,
+        interval: float = AUTOSAVE_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            name: Name of the autosave slot
+            every_moves: Moves between autosaves, 0 for no limit
+            interval: Seconds between autosaves while moves are made, 0 for
+                no limit
+        """
+        self.worker = worker
+        self.config = config
+        self.name = name
+        self.slot = slot
+        self.every_moves = every_moves
+        self.interval = interval
+        self._unsaved_moves = 0
+        self._last_save = time.monotonic()
+
+    def reset(self) -> None:
+        """Start counting afresh, e.g. for a new or loaded game."""
+        self._unsaved_moves = 0
+        self._last_save = time.monotonic()
+
+    def moved(self, game: Any) -> None:
+        """Count a move, and autosave if enough moves or time have gone by."""
+        self._unsaved_moves += 1
+        if (self.every_moves and self._unsaved_moves >= self.every_moves) or (
+            self.interval and time.monotonic() - self._last_save >= self.interval
+        ):
+            self.save(game)
+
+    def save(self, game: Any) -> None:
+        """Autosave now if there are moves since the last autosave."""
+        if not self._unsaved_moves:
+            return
+        self.worker.submit(self.slot, snapshot_game(game, self.name), self.config)
+        self.reset()
@@ -0,0 +1,145 @@
+"""
+Save slot index for the "json" save backend.
+Keeps the listing of every slot_*.json file (name, score, largest tile,
+game state) in one manifest in the save directory, so the save browser
+reads one small file instead of every slot. Each entry remembers its
+file's modification time and size; on opening, the directory is scanned
+and only files that changed since are parsed again, and the manifest is
+rewritten if anything did.
+
+Pages are then filtered, sorted and cut from memory, the same way
+SaveStore.page() does it in SQL for the "sqlite" backend.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any
+
+from .constants import SAVE_FILE_EXTENSION, SAVE_INDEX_FILENAME, SAVE_SLOT_PREFIX
+
+# Orders a save listing can be sorted in: by slot, best score or newest first
+SORT_KEYS = ("slot", "score", "date")
+
+_INDEX_VERSION = 1
+
+
+def _slot_entry(path: str, slot: int, stat: os.stat_result) -> dict[str, Any]:
+    with open(path) as f:
+        data = json.load(f)
+    grid = data["grid"]
+    return {
+        "name": data.get("name") or f"Save {slot}",
+        "score": data.get("score", 0),
+        "max_tile": max((max(row) for row in grid if row), default=0),
+        "game_over": bool(data.get("game_over", False)),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+class JsonSaveIndex:
+    """The slots of a save directory, from its manifest, checked against the files."""
+
+    def __init__(self, save_dir: str) -> None:
+        self.path = os.path.join(save_dir, SAVE_INDEX_FILENAME)
+        self.entries: dict[int, dict[str, Any]] = {}
+        # (query, sort, slots) of the last listing, reused while paging
+        self._listing: tuple[str, str, list[int]] | None = None
+        cached = self._read_manifest()
+        changed = False
+        with os.scandir(save_dir) as files:
+            for file in files:
+                name = file.name
+                if not name.startswith(SAVE_SLOT_PREFIX) or not name.endswith(
+                    SAVE_FILE_EXTENSION
+                ):
+                    continue
+                try:
+                    slot = int(name[len(SAVE_SLOT_PREFIX) : -len(SAVE_FILE_EXTENSION)])
+                    stat = file.stat()
+                    entry = cached.pop(slot, None)
+                    if (
+                        entry is None
+                        or entry["mtime_ns"] != stat.st_mtime_ns
+                        or entry["size"] != stat.st_size
+                    ):
+                        entry = _slot_entry(file.path, slot, stat)
+                        changed = True
+                except (OSError, ValueError, TypeError, KeyError, AttributeError):
+                    continue  # Not a slot file, or unreadable; left out of the listing
+                self.entries[slot] = entry
+        if changed or cached:  # Cached entries left over are deleted slots
+            self._write_manifest()
+
+    def _read_manifest(self) -> dict[int, dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") != _INDEX_VERSION:
+                return {}
+            return {int(slot): entry for slot, entry in manifest["slots"].items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return {}  # Missing or damaged; rebuilt from the files
+
+    def _write_manifest(self) -> None:
+        manifest = {"version": _INDEX_VERSION, "slots": self.entries}
+        directory = os.path.dirname(self.path)
+        try:
+            fd, temporary = tempfile.mkstemp(dir=directory, prefix=".index-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(manifest, f, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except OSError:
+            pass  # Only a cache; the next opening parses the files again
+
+    def page(
+        self, query: str = "", sort: str = "slot", offset: int = 0, limit: int = 20
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """
+        Slots whose name contains query (ignoring case), in a sort order.
+
+        Returns:
+            (total, page): how many slots match, and the limit of them
+            starting at offset
+        """
+        if self._listing is not None and self._listing[:2] == (query, sort):
+            slots = self._listing[2]
+        else:
+            slots = self._matching(query)
+            if sort == "score":
+                slots.sort(key=lambda slot: (-self.entries[slot]["score"], slot))
+            elif sort == "date":
+                slots.sort(key=lambda slot: (-self.entries[slot]["mtime_ns"], slot))
+            else:
+                slots.sort()
+            self._listing = (query, sort, slots)
+        return len(slots), [self._info(slot) for slot in slots[offset : offset + limit]]
+
+    def next_slot(self) -> int:
+        """The slot after the highest one in use."""
+        return max(self.entries, default=0) + 1
+
+    def _matching(self, query: str) -> list[int]:
+        if not query:
+            return list(self.entries)
+        query = query.casefold()
+        return [
+            slot
+            for slot, entry in self.entries.items()
+            if query in entry["name"].casefold()
+        ]
+
+    def _info(self, slot: int) -> dict[str, Any]:
+        """An entry in the shape of save_load.get_save_slot_info()."""
+        entry = self.entries[slot]
+        mtime = entry["mtime_ns"] / 1e9
+        return {
+            "score": entry["score"],
+            "game_over": entry["game_over"],
+            "date": time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)),
+            "slot": slot,
+            "name": entry["name"],
+            "max_tile": entry["max_tile"],
+        }
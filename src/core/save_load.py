@@ -1,13 +1,25 @@
+import contextlib
 import json
 import os
 import platform
+import sqlite3
+import tempfile
 import time
 from pathlib import Path
 from typing import Any
 
-from .constants import DEFAULT_SAVE_SLOTS, SAVE_FILE_EXTENSION, SAVE_SLOT_PREFIX
+from . import metrics
+from .config import get_save_backend
+from .constants import METRICS_TIME_BUCKETS, SAVE_FILE_EXTENSION, SAVE_SLOT_PREFIX
+from .save_index import JsonSaveIndex
+from .save_store import SaveStore, get_store
 
-MANUAL_SAVE_SLOTS = DEFAULT_SAVE_SLOTS
+_SAVE_SECONDS = metrics.registry.histogram(
+    "save_game_seconds", "Time to write a save slot", METRICS_TIME_BUCKETS
+)
+_LOAD_SECONDS = metrics.registry.histogram(
+    "load_game_seconds", "Time per load_game call", METRICS_TIME_BUCKETS
+)
 
 
 def get_default_save_path() -> str:
@@ -64,11 +76,65 @@ def ensure_save_dir_exists(save_dir: str) -> bool:
         return False
 
 
+def get_save_store(config: dict[str, Any] | None = None) -> SaveStore | None:
+    """The SQLite store for the save directory, or None with the "json" backend."""
+    if get_save_backend(config) != "sqlite":
+        return None
+    save_dir = get_save_dir(config)
+    if not ensure_save_dir_exists(save_dir):
+        raise OSError(f"cannot create save directory {save_dir}")
+    return get_store(save_dir)
+
+
+def get_save_index(config: dict[str, Any] | None = None) -> SaveStore | JsonSaveIndex:
+    """
+    Something to list save slots a page at a time from, with page() and
+    next_slot(): the SQLite store itself, or the manifest of the JSON files.
+    Raises OSError or sqlite3.Error if the save directory can't be read.
+    """
+    store = get_save_store(config)
+    if store is not None:
+        return store
+    save_dir = get_save_dir(config)
+    if not ensure_save_dir_exists(save_dir):
+        raise OSError(f"cannot create save directory {save_dir}")
+    return JsonSaveIndex(save_dir)
+
+
 def save_game(
     game: Any, slot: int, name: str | None = None, config: dict[str, Any] | None = None
 ) -> bool:
     """Save game to specified slot. Returns True if successful, False otherwise."""
+    return write_save(slot, snapshot_game(game, name), config)
+
+
+def snapshot_game(game: Any, name: str | None = None) -> dict[str, Any]:
+    """
+    What a save slot holds, copied from the game so it can be written later
+    or on another thread. A name of None keeps the slot's current name.
+    """
+    return {
+        "grid": [list(row) for row in game.board.grid],
+        "score": game.score,
+        "game_over": game.game_over,
+        "endless_mode": getattr(game, "endless_mode", False),
+        "name": name,
+    }
+
+
+def write_save(
+    slot: int, data: dict[str, Any], config: dict[str, Any] | None = None
+) -> bool:
+    """Write a snapshot_game() to a slot. Returns True if successful."""
+    start = time.perf_counter()
+    name = data["name"]
     try:
+        store = get_save_store(config)
+        if store is not None:
+            existing_name = store.name(slot) if name is None else None
+            store.save(slot, {**data, "name": name or existing_name or f"Save {slot}"})
+            return True
+
         save_dir = get_save_dir(config)
         if not ensure_save_dir_exists(save_dir):
             return False
@@ -87,41 +153,67 @@ def save_game(
                 # If we can't read the existing file, just continue without the name
                 pass
 
-        data = {
-            "grid": game.board.grid,
-            "score": game.score,
-            "game_over": game.game_over,
-            "endless_mode": getattr(game, "endless_mode", False),
-            "name": name or existing_name or f"Save {slot}",
-        }
+        data = {**data, "name": name or existing_name or f"Save {slot}"}
 
-        # Write the save file with error handling
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=2)
+        # A crash mid-write leaves the old save, never a truncated one
+        _write_atomic(file_path, data)
 
         return True
 
-    except (OSError, PermissionError, json.JSONDecodeError):
+    except (OSError, PermissionError, json.JSONDecodeError, sqlite3.Error):
         # Log the error or handle it appropriately
         # For now, we silently fail but return False to indicate failure
         return False
     except Exception:
         # Catch any other unexpected errors
         return False
+    finally:
+        if metrics.enabled:
+            _SAVE_SECONDS.observe(time.perf_counter() - start)
+
+
+def _write_atomic(path: str, data: dict[str, Any]) -> None:
+    """Write JSON to a temporary file, sync it to disk, then rename it over path."""
+    directory = os.path.dirname(path)
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".save-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temporary)
+        raise
+    # Make the rename itself durable; directories can't be opened on Windows
+    with contextlib.suppress(OSError):
+        directory_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(directory_fd)
+        finally:
+            os.close(directory_fd)
 
 
 def load_game(game: Any, slot: int, config: dict[str, Any] | None = None) -> bool:
     """Load game from specified slot. Returns True if successful, False otherwise."""
+    start = time.perf_counter()
     try:
-        save_dir = get_save_dir(config)
-        file_path = os.path.join(
-            save_dir, f"{SAVE_SLOT_PREFIX}{slot}{SAVE_FILE_EXTENSION}"
-        )
-        if not os.path.exists(file_path):
-            return False
+        store = get_save_store(config)
+        if store is not None:
+            data = store.load(slot)
+            if data is None:
+                return False
+        else:
+            save_dir = get_save_dir(config)
+            file_path = os.path.join(
+                save_dir, f"{SAVE_SLOT_PREFIX}{slot}{SAVE_FILE_EXTENSION}"
+            )
+            if not os.path.exists(file_path):
+                return False
 
-        with open(file_path) as f:
-            data = json.load(f)
+            with open(file_path) as f:
+                data = json.load(f)
 
         # Validate that required keys exist in the loaded data
         required_keys = ["grid", "score", "game_over"]
@@ -141,7 +233,7 @@ def load_game(game: Any, slot: int, config: dict[str, Any] | None = None) -> boo
                     return False
 
         # Apply the loaded data
-        game.board.grid = data["grid"]
+        game.board.set_grid(data["grid"])
         game.score = data["score"]
         game.game_over = data["game_over"]
         game.endless_mode = data.get("endless_mode", False)
@@ -156,6 +248,7 @@ def load_game(game: Any, slot: int, config: dict[str, Any] | None = None) -> boo
         OSError,
         PermissionError,
         json.JSONDecodeError,
+        sqlite3.Error,
         KeyError,
         TypeError,
         ValueError,
@@ -165,6 +258,20 @@ def load_game(game: Any, slot: int, config: dict[str, Any] | None = None) -> boo
     except Exception:
         # Any other unexpected errors
         return False
+    finally:
+        if metrics.enabled:
+            _LOAD_SECONDS.observe(time.perf_counter() - start)
+
+
+def has_saves(config: dict[str, Any] | None = None) -> bool:
+    """Whether any slot has a save, without reading them."""
+    try:
+        store = get_save_store(config)
+        if store is not None:
+            return store.has_slots()
+    except (OSError, sqlite3.Error):
+        return False
+    return bool(get_save_slots(config))
 
 
 def get_save_slots(config: dict[str, Any] | None = None) -> list[str]:
@@ -192,6 +299,10 @@ def get_save_slot_info(
 ) -> dict[str, Any] | None:
     """Get save slot information including score and game status."""
     try:
+        store = get_save_store(config)
+        if store is not None:
+            return store.info(slot)
+
         save_dir = get_save_dir(config)
         file_path = os.path.join(
             save_dir, f"{SAVE_SLOT_PREFIX}{slot}{SAVE_FILE_EXTENSION}"
@@ -213,7 +324,14 @@ def get_save_slot_info(
             "slot": slot,
             "name": data.get("name", f"Save {slot}"),
         }
-    except (json.JSONDecodeError, KeyError, OSError, PermissionError, ValueError):
+    except (
+        json.JSONDecodeError,
+        sqlite3.Error,
+        KeyError,
+        OSError,
+        PermissionError,
+        ValueError,
+    ):
         # File access, parsing, or time formatting errors
         return None
     except Exception:
@@ -226,6 +344,10 @@ def get_all_save_slots_info(
 ) -> list[dict[str, Any]]:
     """Get information for all save slots. Returns empty list if unable to access files."""
     try:
+        store = get_save_store(config)
+        if store is not None:
+            return store.list_slots()  # One query, however many slots there are
+
         slots_info = []
         files = get_save_slots(config)
 
@@ -0,0 +1,281 @@
+"""
+SQLite save store for 2048-CLI.
+Keeps every save slot as a row of one database in the save directory, with
+the name, score, largest tile and save time in indexed columns, so the load
+menu lists any number of slots with a single query instead of opening and
+parsing a JSON file per slot.
+
+The database runs in WAL mode, so listing slots never waits for a save in
+progress. Its schema version is kept in PRAGMA user_version; opening an
+older database migrates it step by step, and the first step imports the
+slot_*.json files already in the directory. Those files are left as they
+are, so switching "save_backend" back to "json" finds them again.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .constants import SAVE_DATABASE_FILENAME, SAVE_FILE_EXTENSION, SAVE_SLOT_PREFIX
+
+_COLUMNS = "slot, name, score, max_tile, game_over, endless_mode, saved_at, grid"
+# What a listing shows of each slot, with the date formatted by SQLite
+_LISTING = (
+    "SELECT slot, name, score, max_tile, game_over, "
+    "strftime('%Y-%m-%d %H:%M', saved_at, 'unixepoch', 'localtime') AS date "
+    "FROM slots"
+)
+# ORDER BY for each of save_index.SORT_KEYS; each is served by an index
+_ORDERS = {
+    "slot": "slot",
+    "score": "score DESC, slot",
+    "date": "saved_at DESC, slot",
+}
+
+
+def _create_schema(connection: sqlite3.Connection, save_dir: str) -> None:
+    # Statement by statement: executescript() would commit the migration
+    connection.execute(
+        """
+        CREATE TABLE slots (
+            slot INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            max_tile INTEGER NOT NULL,
+            game_over INTEGER NOT NULL,
+            endless_mode INTEGER NOT NULL,
+            saved_at REAL NOT NULL,
+            grid TEXT NOT NULL
+        )
+        """
+    )
+    for column in ("name", "score", "max_tile", "saved_at"):
+        connection.execute(f"CREATE INDEX slots_{column} ON slots ({column})")
+    connection.executemany(
+        f"INSERT INTO slots ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        _json_rows(save_dir),
+    )
+
+
+# Schema version i + 1 is reached by running _MIGRATIONS[i]
+_MIGRATIONS = (_create_schema,)
+
+
+def _json_rows(save_dir: str) -> list[tuple[Any, ...]]:
+    """Rows for the readable slot_*.json files, saved at their modification time."""
+    rows = []
+    for file in os.listdir(save_dir):
+        if not file.startswith(SAVE_SLOT_PREFIX) or not file.endswith(
+            SAVE_FILE_EXTENSION
+        ):
+            continue
+        path = os.path.join(save_dir, file)
+        try:
+            slot = int(file[len(SAVE_SLOT_PREFIX) : -len(SAVE_FILE_EXTENSION)])
+            with open(path) as f:
+                data = json.load(f)
+            rows.append(_row(slot, data, os.path.getmtime(path)))
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            continue  # Not a slot file, or unreadable; skipped like the menu does
+    return rows
+
+
+def _row(slot: int, data: dict[str, Any], saved_at: float) -> tuple[Any, ...]:
+    grid = data["grid"]
+    return (
+        slot,
+        data.get("name") or f"Save {slot}",
+        data.get("score", 0),
+        max((max(row) for row in grid if row), default=0),
+        bool(data.get("game_over", False)),
+        bool(data.get("endless_mode", False)),
+        saved_at,
+        json.dumps(grid, separators=(",", ":")),
+    )
+
+
+def _info(row: sqlite3.Row) -> dict[str, Any]:
+    """A listing row in the shape of save_load.get_save_slot_info()."""
+    return {
+        "score": row["score"],
+        "game_over": bool(row["game_over"]),
+        "date": row["date"],
+        "slot": row["slot"],
+        "name": row["name"],
+        "max_tile": row["max_tile"],
+    }
+
+
+class SaveStore:
+    """
+    Save slots in SQLite. One instance may be shared by threads, e.g. the
+    game server's save requests; calls are serialized on its connection.
+    """
+
+    def __init__(self, save_dir: str) -> None:
+        self.path = os.path.join(save_dir, SAVE_DATABASE_FILENAME)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent without a sync per commit
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._migrate(save_dir)
+
+    def _migrate(self, save_dir: str) -> None:
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")  # One migrating process at a time
+            try:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                for migration in _MIGRATIONS[version:]:
+                    migration(connection, save_dir)
+                    version += 1
+                connection.execute(f"PRAGMA user_version = {version:d}")
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    @property
+    def schema_version(self) -> int:
+        with self._lock:
+            return self._connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def save(self, slot: int, data: dict[str, Any]) -> None:
+        """Write a slot from the same dict save_game() writes to a JSON file."""
+        row = _row(slot, data, time.time())
+        with self._lock:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO slots ({_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+
+    def load(self, slot: int) -> dict[str, Any] | None:
+        """A slot as the dict save() was given, or None if it is empty."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM slots WHERE slot = ?", (slot,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "grid": json.loads(row["grid"]),
+            "score": row["score"],
+            "game_over": bool(row["game_over"]),
+            "endless_mode": bool(row["endless_mode"]),
+            "name": row["name"],
+        }
+
+    def name(self, slot: int) -> str | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT name FROM slots WHERE slot = ?", (slot,)
+            ).fetchone()
+        return row["name"] if row is not None else None
+
+    def info(self, slot: int) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"{_LISTING} WHERE slot = ?", (slot,)
+            ).fetchone()
+        return _info(row) if row is not None else None
+
+    def list_slots(self) -> list[dict[str, Any]]:
+        """Every slot's listing, by slot number, from one query."""
+        with self._lock:
+            rows = self._connection.execute(f"{_LISTING} ORDER BY slot").fetchall()
+        return [_info(row) for row in rows]
+
+    def page(
+        self, query: str = "", sort: str = "slot", offset: int = 0, limit: int = 20
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """
+        Slots whose name contains query (ignoring ASCII case), in a sort order.
+
+        Returns:
+            (total, page): how many slots match, and the limit of them
+            starting at offset
+        """
+        where = ""
+        parameters: tuple[str, ...] = ()
+        if query:
+            escaped = query.replace("\\", "\\\\")
+            escaped = escaped.replace("%", "\\%").replace("_", "\\_")
+            where, parameters = " WHERE name LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+        order = _ORDERS.get(sort, "slot")
+        with self._lock:
+            total = self._connection.execute(
+                f"SELECT COUNT(*) FROM slots{where}", parameters
+            ).fetchone()[0]
+            rows = self._connection.execute(
+                f"{_LISTING}{where} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*parameters, limit, offset),
+            ).fetchall()
+        return total, [_info(row) for row in rows]
+
+    def next_slot(self) -> int:
+        """The slot after the highest one in use."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COALESCE(MAX(slot), 0) + 1 FROM slots"
+            ).fetchone()[0]
+
+    def has_slots(self) -> bool:
+        with self._lock:
+            return (
+                self._connection.execute("SELECT 1 FROM slots LIMIT 1").fetchone()
+                is not None
+            )
+
+    def delete(self, slot: int) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM slots WHERE slot = ?", (slot,))
+
+    def import_json_slots(self, save_dir: str, replace: bool = False) -> int:
+        """
+        Copy slot_*.json files from a directory into the store, keeping each
+        file's modification time as its save time. Slots already in the
+        store are kept unless replace is set. Returns the slots written.
+        """
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        rows = _json_rows(save_dir)
+        with self._lock:
+            connection = self._connection
+            before = connection.total_changes
+            # All the slots or none, so a failed import can simply be run again
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    f"{verb} INTO slots ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return connection.total_changes - before
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_stores: dict[str, SaveStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(save_dir: str) -> SaveStore:
+    """The shared store for a save directory, opened (and migrated) once."""
+    key = os.path.abspath(save_dir)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = SaveStore(save_dir)
+        return store
@@ -1,12 +1,59 @@
+import itertools
 import random
+from functools import cache
 
 from core.constants import DEFAULT_BOARD_SIZE
 
+from .events import MoveEvent, MoveEventKind
+
+# Source of board versions, unique across all boards
+_versions = itertools.count(1)
+
+
+@cache
+def line_coords(size: int, direction: str) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """Cells of every line in a board, ordered from the wall tiles slide towards."""
+    indices = range(size)
+    if direction == "left":
+        return tuple(tuple((r, c) for c in indices) for r in indices)
+    if direction == "right":
+        return tuple(tuple((r, c) for c in reversed(indices)) for r in indices)
+    if direction == "up":
+        return tuple(tuple((r, c) for r in indices) for c in indices)
+    return tuple(tuple((r, c) for r in reversed(indices)) for c in indices)
+
 
 class Board:
     def __init__(self, size: int = DEFAULT_BOARD_SIZE) -> None:
         self.size: int = size
         self.grid: list[list[int]] = [[0] * size for _ in range(size)]
+        # Stable tile IDs parallel to grid (0 for empty cells)
+        self.ids: list[list[int]] = [[0] * size for _ in range(size)]
+        self._next_tile_id: int = 1
+        # Changes whenever the grid does, so renderers can skip unchanged boards
+        self.version: int = next(_versions)
+
+    def new_tile_id(self) -> int:
+        tile_id = self._next_tile_id
+        self._next_tile_id += 1
+        return tile_id
+
+    def set_grid(self, grid: list[list[int]]) -> None:
+        """Replace the grid, giving every tile a fresh ID."""
+        self.size = len(grid)
+        self.grid = grid
+        self.version = next(_versions)
+        self.ids = [
+            [self.new_tile_id() if value else 0 for value in row] for row in grid
+        ]
+
+    def copy(self) -> "Board":
+        board = Board(self.size)
+        board.grid = [row[:] for row in self.grid]
+        board.ids = [row[:] for row in self.ids]
+        board._next_tile_id = self._next_tile_id
+        board.version = self.version
+        return board
 
     def get_empty_cells(self) -> list[tuple[int, int]]:
         return [
@@ -16,11 +63,156 @@ class Board:
             if self.grid[r][c] == 0
         ]
 
-    def place_new_tile(self, value: int) -> None:
+    def has_empty_cells(self) -> bool:
+        return any(0 in row for row in self.grid)
+
+    def has_merge(self) -> bool:
+        """Whether any two neighbouring tiles have the same value."""
+        for r in range(self.size):
+            for c in range(self.size):
+                value = self.grid[r][c]
+                if not value:
+                    continue
+                # Check right neighbor
+                if c + 1 < self.size and self.grid[r][c + 1] == value:
+                    return True
+                # Check down neighbor
+                if r + 1 < self.size and self.grid[r + 1][c] == value:
+                    return True
+        return False
+
+    def max_value(self) -> int:
+        return max(max(row) for row in self.grid)
+
+    def put_tile(self, cell: tuple[int, int], value: int) -> None:
+        """Place a tile with a fresh ID on a given cell."""
+        r, c = cell
+        self.grid[r][c] = value
+        self.ids[r][c] = self.new_tile_id()
+        self.version = next(_versions)
+
+    def place_new_tile(
+        self,
+        value: int,
+        rng: random.Random | None = None,
+        events: list[MoveEvent] | None = None,
+    ) -> tuple[int, int] | None:
         empty_cells = self.get_empty_cells()
         if empty_cells:
-            r, c = random.choice(empty_cells)
+            r, c = (rng or random).choice(empty_cells)
             self.grid[r][c] = value
+            tile_id = self.new_tile_id()
+            self.ids[r][c] = tile_id
+            self.version = next(_versions)
+            if events is not None:
+                events.append(
+                    MoveEvent(MoveEventKind.SPAWN, tile_id, (r, c), (r, c), value)
+                )
+            return r, c
+        return None
+
+    def slide(
+        self, direction: str, events: list[MoveEvent] | None = None
+    ) -> tuple[bool, int]:
+        """
+        Slide and merge all tiles in one direction.
+
+        Tile events are appended to events in the same pass.
+
+        Returns:
+            Whether any tile moved, and the points scored by merges
+        """
+        size = self.size
+        grid, ids = self.grid, self.ids
+        new_grid = [[0] * size for _ in range(size)]
+        new_ids = [[0] * size for _ in range(size)]
+        gained = 0
+
+        for line in line_coords(size, direction):
+            slot = 0  # Next free cell in this line, counted from the wall
+            pending: tuple[int, int, tuple[int, int]] | None = None
+
+            for cell in line:
+                value = grid[cell[0]][cell[1]]
+                if not value:
+                    continue
+                tile_id = ids[cell[0]][cell[1]]
+
+                if pending is not None and pending[0] == value:
+                    # Merge into the waiting tile; the tile nearer the wall survives
+                    dst = line[slot]
+                    merged_value = value * 2
+                    if events is not None:
+                        if pending[2] != dst:
+                            events.append(
+                                MoveEvent(
+                                    MoveEventKind.SLIDE,
+                                    pending[1],
+                                    pending[2],
+                                    dst,
+                                    value,
+                                )
+                            )
+                        events.append(
+                            MoveEvent(
+                                MoveEventKind.MERGE,
+                                pending[1],
+                                cell,
+                                dst,
+                                merged_value,
+                                tile_id,
+                            )
+                        )
+                    new_grid[dst[0]][dst[1]] = merged_value
+                    new_ids[dst[0]][dst[1]] = pending[1]
+                    gained += merged_value
+                    slot += 1
+                    pending = None
+                    continue
+
+                if pending is not None:
+                    self._settle(pending, line[slot], new_grid, new_ids, events)
+                    slot += 1
+                pending = (value, tile_id, cell)
+
+            if pending is not None:
+                self._settle(pending, line[slot], new_grid, new_ids, events)
+
+        moved = new_grid != grid
+        if moved:
+            self.grid, self.ids = new_grid, new_ids
+            self.version = next(_versions)
+        return moved, gained
+
+    @staticmethod
+    def _settle(
+        tile: tuple[int, int, tuple[int, int]],
+        dst: tuple[int, int],
+        new_grid: list[list[int]],
+        new_ids: list[list[int]],
+        events: list[MoveEvent] | None,
+    ) -> None:
+        value, tile_id, src = tile
+        new_grid[dst[0]][dst[1]] = value
+        new_ids[dst[0]][dst[1]] = tile_id
+        if events is not None and src != dst:
+            events.append(MoveEvent(MoveEventKind.SLIDE, tile_id, src, dst, value))
+
+    def apply_events(self, events: list[MoveEvent]) -> None:
+        """Replay the tile events of a move made on another copy of this board."""
+        grid, ids = self.grid, self.ids
+        # Vacate every source first, as a tile may land where another just left
+        for event in events:
+            if event.kind != MoveEventKind.SPAWN:
+                grid[event.src[0]][event.src[1]] = 0
+                ids[event.src[0]][event.src[1]] = 0
+        for event in events:
+            grid[event.dst[0]][event.dst[1]] = event.value
+            ids[event.dst[0]][event.dst[1]] = event.tile_id
+        self._next_tile_id = max(
+            self._next_tile_id, max((event.tile_id for event in events), default=0) + 1
+        )
+        self.version = next(_versions)
 
     def __str__(self) -> str:
         return "\n".join([" ".join(map(str, row)) for row in self.grid])
@@ -28,3 +220,5 @@ class Board:
     def rotate(self, times: int = 1) -> None:
         for _ in range(times):
             self.grid = [list(row) for row in zip(*self.grid[::-1], strict=False)]
+            self.ids = [list(row) for row in zip(*self.ids[::-1], strict=False)]
+        self.version = next(_versions)
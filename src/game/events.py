@@ -0,0 +1,27 @@
+"""
+Tile movement events emitted by the move engine.
+Each event follows one tile by its stable ID, so animation, replay and
+analytics can use them without diffing grids.
+"""
+
+from enum import Enum
+from typing import NamedTuple
+
+
+class MoveEventKind(Enum):
+    """Kinds of tile events."""
+
+    SLIDE = "slide"  # Tile moved from src to dst
+    MERGE = "merge"  # Tile from src merged into tile_id at dst
+    SPAWN = "spawn"  # New tile appeared at dst
+
+
+class MoveEvent(NamedTuple):
+    """A single tile event. Cells are (row, col) tuples."""
+
+    kind: MoveEventKind
+    tile_id: int  # Surviving tile for merges
+    src: tuple[int, int]
+    dst: tuple[int, int]
+    value: int  # Tile value after the event
+    merged_id: int = 0  # For merges, the ID of the tile that was absorbed
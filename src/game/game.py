@@ -1,50 +1,112 @@
+import random
 import time
-from typing import Any
+from collections import deque
+from dataclasses import dataclass, field
+from typing import NamedTuple
 
+from core import metrics
 from core.constants import (
+    BASE_CHANCE_OF_4,
+    CHANCE_INCREASE_RATE,
+    CHANCE_SCORE_INTERVAL,
     DEFAULT_BOARD_SIZE,
     INITIAL_TILE_VALUE,
     MAX_SCORE_HISTORY_ENTRIES,
+    SCORE_THRESHOLD_FOR_SPECIAL_TILES,
+    SPARSE_BOARD_MIN_SIZE,
+    SPECIAL_TILE_VALUE,
     WIN_TILE_VALUE,
 )
 
 from .board import Board
+from .events import MoveEvent
+from .sparse_board import SparseBoard
+
+DIRECTIONS = ("up", "down", "left", "right")
+
+_MOVES = metrics.registry.counter("game_moves_total", "Moves applied to Game boards")
+
+
+class ScoreChange(NamedTuple):
+    """Points added by one move, shown in the score history."""
+
+    points: int
+    time: float
+
+
+@dataclass
+class Afterstate:
+    """Result of a move computed without touching the live game."""
+
+    direction: str
+    board: Board | SparseBoard
+    score_delta: int
+    moved: bool
+    spawn: tuple[int, int, int] | None  # (row, col, value) of the new tile
+    events: list[MoveEvent] = field(default_factory=list)
+
+
+def special_tile_chance(score: int) -> float:
+    """Probability that the next spawned tile is a 4; grows with the score."""
+    if score < SCORE_THRESHOLD_FOR_SPECIAL_TILES:
+        return 0.0
+    return min(
+        BASE_CHANCE_OF_4,
+        (score - SCORE_THRESHOLD_FOR_SPECIAL_TILES)
+        // CHANCE_SCORE_INTERVAL
+        * CHANCE_INCREASE_RATE,
+    )
+
+
+def spawn_value_for_score(score: int, rng: random.Random | None = None) -> int:
+    """Pick the value of the next spawned tile; 4s get likelier as score grows."""
+    chance_of_4 = special_tile_chance(score)
+    if chance_of_4 and (rng or random).random() < chance_of_4:
+        return SPECIAL_TILE_VALUE
+    return INITIAL_TILE_VALUE
 
 
 class Game:
-    def __init__(self, size: int = DEFAULT_BOARD_SIZE) -> None:
-        self.board: Board = Board(size)
+    def __init__(
+        self,
+        size: int = DEFAULT_BOARD_SIZE,
+        rng: random.Random | None = None,
+        sparse: bool | None = None,
+    ) -> None:
+        """
+        Args:
+            sparse: Store only occupied cells; by default, boards of
+                SPARSE_BOARD_MIN_SIZE and up are sparse
+        """
+        if sparse is None:
+            sparse = size >= SPARSE_BOARD_MIN_SIZE
+        self.board: Board | SparseBoard = SparseBoard(size) if sparse else Board(size)
         self.score: int = 0
         self.game_over: bool = False
         self.endless_mode: bool = False
+        self.rng: random.Random = rng or random.Random()
+        # Tile events of the last move, including its spawn
+        self.last_events: list[MoveEvent] = []
         self._last_score_change: int = 0  # Track score changes for display
         self._score_change_time: float = 0  # Track when score changed
-        self._score_history: list[
-            dict[str, Any]
-        ] = []  # Track recent score additions for display
+        # Recent score additions for display, oldest first; a fixed-size ring
+        self._score_history: deque[ScoreChange] = deque(
+            maxlen=MAX_SCORE_HISTORY_ENTRIES
+        )
 
     def start(self) -> None:
-        self.board.place_new_tile(INITIAL_TILE_VALUE)
-        self.board.place_new_tile(INITIAL_TILE_VALUE)
+        self.last_events = []
+        self.board.place_new_tile(INITIAL_TILE_VALUE, self.rng, self.last_events)
+        self.board.place_new_tile(INITIAL_TILE_VALUE, self.rng, self.last_events)
 
     def is_game_over(self) -> bool:
         # In endless mode, never game over
         if self.endless_mode:
             return False
 
-        if self.board.get_empty_cells():
+        if self.board.has_empty_cells():
             return False
-
-        for r in range(self.board.size):
-            for c in range(self.board.size):
-                value = self.board.grid[r][c]
-                # Check right neighbor
-                if c + 1 < self.board.size and self.board.grid[r][c + 1] == value:
-                    return False
-                # Check down neighbor
-                if r + 1 < self.board.size and self.board.grid[r + 1][c] == value:
-                    return False
-        return True
+        return not self.board.has_merge()
 
     def enable_endless_mode(self) -> None:
         """Enable endless mode - game continues even after reaching win condition."""
@@ -53,76 +115,71 @@ class Game:
 
     def has_won(self) -> bool:
         """Check if player has reached the win condition."""
-        for r in range(self.board.size):
-            for c in range(self.board.size):
-                if self.board.grid[r][c] >= WIN_TILE_VALUE:
-                    return True
-        return False
+        return self.board.max_value() >= WIN_TILE_VALUE
 
     def move(self, direction: str) -> bool:
-        if direction == "left":
-            return self._move_left()
-        elif direction == "right":
-            self.board.rotate(2)
-            moved = self._move_left()
-            self.board.rotate(2)
-            return moved
-        elif direction == "up":
-            self.board.rotate(3)
-            moved = self._move_left()
-            self.board.rotate(1)
-            return moved
-        elif direction == "down":
-            self.board.rotate(1)
-            moved = self._move_left()
-            self.board.rotate(3)
-            return moved
-        return False
-
-    def _move_left(self) -> bool:
-        moved = False
-        old_score = self.score
-
-        for r in range(self.board.size):
-            new_row = [i for i in self.board.grid[r] if i != 0]
-
-            # Merge tiles and track merges
-            i = 0
-            col_offset = 0  # Track position in compressed row
-            while i < len(new_row) - 1:
-                if new_row[i] == new_row[i + 1]:
-                    merged_value = new_row[i] * 2
-                    new_row[i] = merged_value
-                    self.score += merged_value
-
-
-                    new_row.pop(i + 1)
-                    i += 1  # Skip next tile to prevent double merging
-                else:
-                    i += 1
-                col_offset += 1
-
-            # Pad with zeros
-            while len(new_row) < self.board.size:
-                new_row.append(0)
-
-            if new_row != self.board.grid[r]:
-                moved = True
-            self.board.grid[r] = new_row
+        self.last_events = []
+        if direction not in DIRECTIONS:
+            return False
+
+        moved, gained = self.board.slide(direction, self.last_events)
+        if moved:
+            self._add_score(gained)
+            if metrics.enabled:
+                _MOVES.inc()
+        return moved
+
+    def step(self, direction: str) -> bool:
+        """Play one turn: move, spawn the next tile and update game over state."""
+        moved = self.move(direction)
+        if moved:
+            self.spawn_tile()
+        if self.is_game_over():
+            self.game_over = True
+        return moved
+
+    def spawn_tile(self) -> tuple[int, int] | None:
+        """Place the next random tile using the score-based spawn rules."""
+        value = spawn_value_for_score(self.score, self.rng)
+        return self.board.place_new_tile(value, self.rng, self.last_events)
+
+    def compute_afterstate(self, direction: str) -> Afterstate:
+        """Compute the move and the following spawn without changing the game."""
+        board = self.board.copy()
+        events: list[MoveEvent] = []
+        moved, gained = False, 0
+        if direction in DIRECTIONS:
+            moved, gained = board.slide(direction, events)
+
+        spawn = None
+        if moved:
+            value = spawn_value_for_score(self.score + gained, self.rng)
+            cell = board.place_new_tile(value, self.rng, events)
+            if cell is not None:
+                spawn = (cell[0], cell[1], value)
+
+        return Afterstate(direction, board, gained, moved, spawn, events)
+
+    def commit_afterstate(self, afterstate: Afterstate) -> bool:
+        """Apply a precomputed move and spawn. Returns True if the board moved."""
+        self.last_events = []
+        if not afterstate.moved:
+            return False
+        self.board = afterstate.board
+        self.last_events = afterstate.events
+        self._add_score(afterstate.score_delta)
+        if metrics.enabled:
+            _MOVES.inc()
+        return True
+
+    def _add_score(self, score_change: int) -> None:
+        self.score += score_change
 
         # Track score change for display
-        score_change = self.score - old_score
         if score_change > 0:
             self._last_score_change = score_change
             current_time = time.time()
             self._score_change_time = current_time
 
-            # Add to score history (keep last 5 entries)
-            self._score_history.append({"points": score_change, "time": current_time})
-
-            # Keep only the most recent score changes
-            if len(self._score_history) > MAX_SCORE_HISTORY_ENTRIES:
-                self._score_history = self._score_history[-MAX_SCORE_HISTORY_ENTRIES:]
-
-        return moved
-
+            # The ring drops the oldest entry once it is full
+            self._score_history.append(ScoreChange(score_change, current_time))
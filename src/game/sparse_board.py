@@ -0,0 +1,253 @@
+"""
+Sparse board backend for very large boards.
+Only occupied cells are stored, indexed by row and by column, so moves,
+merges and spawns cost time proportional to the number of tiles rather
+than the board area. The dense grid is built on demand for saves and
+rendering.
+"""
+
+import random
+
+from core.constants import DEFAULT_BOARD_SIZE
+
+from .board import _versions
+from .events import MoveEvent, MoveEventKind
+
+# Below this share of occupied cells, spawns sample random cells instead of
+# listing the empty ones
+_SAMPLING_MAX_FILL = 0.5
+
+
+class SparseBoard:
+    """Board with the same interface as Board, storing only non-empty cells."""
+
+    def __init__(self, size: int = DEFAULT_BOARD_SIZE) -> None:
+        self.size: int = size
+        # (row, col) -> (value, tile_id) for every occupied cell
+        self.cells: dict[tuple[int, int], tuple[int, int]] = {}
+        self._rows: list[set[int]] = [set() for _ in range(size)]  # Occupied columns
+        self._cols: list[set[int]] = [set() for _ in range(size)]  # Occupied rows
+        self._next_tile_id: int = 1
+        self.version: int = next(_versions)
+        self._dense: tuple[int, list[list[int]], list[list[int]]] | None = None
+
+    def new_tile_id(self) -> int:
+        tile_id = self._next_tile_id
+        self._next_tile_id += 1
+        return tile_id
+
+    def _put(self, cell: tuple[int, int], value: int, tile_id: int) -> None:
+        self.cells[cell] = (value, tile_id)
+        self._rows[cell[0]].add(cell[1])
+        self._cols[cell[1]].add(cell[0])
+
+    def _replace_cells(self, cells: dict[tuple[int, int], tuple[int, int]]) -> None:
+        self.cells = cells
+        self._rows = [set() for _ in range(self.size)]
+        self._cols = [set() for _ in range(self.size)]
+        for r, c in cells:
+            self._rows[r].add(c)
+            self._cols[c].add(r)
+        self.version = next(_versions)
+
+    def _dense_view(self) -> tuple[list[list[int]], list[list[int]]]:
+        if self._dense is None or self._dense[0] != self.version:
+            grid = [[0] * self.size for _ in range(self.size)]
+            ids = [[0] * self.size for _ in range(self.size)]
+            for (r, c), (value, tile_id) in self.cells.items():
+                grid[r][c] = value
+                ids[r][c] = tile_id
+            self._dense = (self.version, grid, ids)
+        return self._dense[1], self._dense[2]
+
+    @property
+    def grid(self) -> list[list[int]]:
+        """Dense copy of the board, rebuilt after each change. Read-only."""
+        return self._dense_view()[0]
+
+    @property
+    def ids(self) -> list[list[int]]:
+        """Dense tile IDs parallel to grid. Read-only."""
+        return self._dense_view()[1]
+
+    def set_grid(self, grid: list[list[int]]) -> None:
+        """Replace the grid, giving every tile a fresh ID."""
+        self.size = len(grid)
+        self._replace_cells(
+            {
+                (r, c): (value, self.new_tile_id())
+                for r, row in enumerate(grid)
+                for c, value in enumerate(row)
+                if value
+            }
+        )
+
+    def copy(self) -> "SparseBoard":
+        board = SparseBoard.__new__(SparseBoard)
+        board.size = self.size
+        board.cells = dict(self.cells)
+        board._rows = [set(cols) for cols in self._rows]
+        board._cols = [set(rows) for rows in self._cols]
+        board._next_tile_id = self._next_tile_id
+        board.version = self.version
+        board._dense = self._dense
+        return board
+
+    def get_empty_cells(self) -> list[tuple[int, int]]:
+        return [
+            (r, c)
+            for r in range(self.size)
+            for c in range(self.size)
+            if c not in self._rows[r]
+        ]
+
+    def has_empty_cells(self) -> bool:
+        return len(self.cells) < self.size * self.size
+
+    def has_merge(self) -> bool:
+        """Whether any two neighbouring tiles have the same value."""
+        cells = self.cells
+        for (r, c), (value, _) in cells.items():
+            right = cells.get((r, c + 1))
+            if right is not None and right[0] == value:
+                return True
+            below = cells.get((r + 1, c))
+            if below is not None and below[0] == value:
+                return True
+        return False
+
+    def max_value(self) -> int:
+        return max((value for value, _ in self.cells.values()), default=0)
+
+    def put_tile(self, cell: tuple[int, int], value: int) -> None:
+        """Place a tile with a fresh ID on a given cell."""
+        self._put(cell, value, self.new_tile_id())
+        self.version = next(_versions)
+
+    def place_new_tile(
+        self,
+        value: int,
+        rng: random.Random | None = None,
+        events: list[MoveEvent] | None = None,
+    ) -> tuple[int, int] | None:
+        area = self.size * self.size
+        if len(self.cells) >= area:
+            return None
+
+        choose = rng or random
+        if len(self.cells) <= area * _SAMPLING_MAX_FILL:
+            # Mostly empty: a random cell is free at least half the time
+            while True:
+                cell = (choose.randrange(self.size), choose.randrange(self.size))
+                if cell not in self.cells:
+                    break
+        else:
+            cell = choose.choice(self.get_empty_cells())
+
+        tile_id = self.new_tile_id()
+        self._put(cell, value, tile_id)
+        self.version = next(_versions)
+        if events is not None:
+            events.append(MoveEvent(MoveEventKind.SPAWN, tile_id, cell, cell, value))
+        return cell
+
+    def slide(
+        self, direction: str, events: list[MoveEvent] | None = None
+    ) -> tuple[bool, int]:
+        """
+        Slide and merge all tiles in one direction, visiting occupied cells only.
+
+        Tile events are appended to events in the same pass.
+
+        Returns:
+            Whether any tile moved, and the points scored by merges
+        """
+        horizontal = direction in ("left", "right")
+        towards_end = direction in ("right", "down")
+        step = -1 if towards_end else 1
+        first_slot = self.size - 1 if towards_end else 0
+        cells = self.cells
+        new_cells: dict[tuple[int, int], tuple[int, int]] = {}
+        moved = False
+        gained = 0
+
+        def at(line: int, pos: int) -> tuple[int, int]:
+            return (line, pos) if horizontal else (pos, line)
+
+        def settle(
+            tile: tuple[int, int, tuple[int, int]], dst: tuple[int, int]
+        ) -> None:
+            nonlocal moved
+            value, tile_id, src = tile
+            new_cells[dst] = (value, tile_id)
+            if src != dst:
+                moved = True
+                if events is not None:
+                    events.append(
+                        MoveEvent(MoveEventKind.SLIDE, tile_id, src, dst, value)
+                    )
+
+        for line, occupied in enumerate(self._rows if horizontal else self._cols):
+            if not occupied:
+                continue
+            slot = first_slot  # Next free position, counted from the wall
+            pending: tuple[int, int, tuple[int, int]] | None = None
+
+            for pos in sorted(occupied, reverse=towards_end):
+                cell = at(line, pos)
+                value, tile_id = cells[cell]
+
+                if pending is not None and pending[0] == value:
+                    # Merge into the waiting tile; the tile nearer the wall survives
+                    dst = at(line, slot)
+                    merged_value = value * 2
+                    if events is not None:
+                        if pending[2] != dst:
+                            events.append(
+                                MoveEvent(
+                                    MoveEventKind.SLIDE,
+                                    pending[1],
+                                    pending[2],
+                                    dst,
+                                    value,
+                                )
+                            )
+                        events.append(
+                            MoveEvent(
+                                MoveEventKind.MERGE,
+                                pending[1],
+                                cell,
+                                dst,
+                                merged_value,
+                                tile_id,
+                            )
+                        )
+                    new_cells[dst] = (merged_value, pending[1])
+                    gained += merged_value
+                    moved = True
+                    slot += step
+                    pending = None
+                    continue
+
+                if pending is not None:
+                    settle(pending, at(line, slot))
+                    slot += step
+                pending = (value, tile_id, cell)
+
+            if pending is not None:
+                settle(pending, at(line, slot))
+
+        if moved:
+            self._replace_cells(new_cells)
+        return moved, gained
+
+    def __str__(self) -> str:
+        return "\n".join([" ".join(map(str, row)) for row in self.grid])
+
+    def rotate(self, times: int = 1) -> None:
+        """Rotate clockwise, like Board.rotate."""
+        last = self.size - 1
+        cells = self.cells
+        for _ in range(times % 4):
+            cells = {(c, last - r): tile for (r, c), tile in cells.items()}
+        self._replace_cells(cells)
@@ -0,0 +1,601 @@
+"""
+Vectorized game engine for 2048-CLI.
+Plays many small boards at once with NumPy. Boards are arrays of tile ranks
+(log2 of the value, 0 for empty cells), a move is one table lookup per line,
+and each game draws its spawns from its own counter-based random stream, so
+a batch of moves costs a handful of array operations however many games
+take part.
+
+The rules match Game.step(): slide, spawn with the score-based 4-tile
+chance, then check for game over. Spawn positions come from the engine's
+own random streams, so a seeded engine game doesn't replay a seeded Game.
+
+NumPy is optional; is_available() says whether a board size can be used.
+"""
+
+from functools import cache, lru_cache
+from typing import Any
+
+from core import metrics
+from core.constants import (
+    BASE_CHANCE_OF_4,
+    CHANCE_INCREASE_RATE,
+    CHANCE_SCORE_INTERVAL,
+    SCORE_THRESHOLD_FOR_SPECIAL_TILES,
+    VECTOR_ENGINE_MAX_SIZE,
+    WIN_TILE_VALUE,
+)
+
+try:
+    import numpy as np
+except ImportError:  # Optional; callers fall back to Game
+    np = None  # type: ignore[assignment]
+
+from .game import DIRECTIONS, special_tile_chance
+
+# Bits per rank in a packed line; ranks stay below 32 on boards this small
+_RANK_BITS = 5
+_WIN_RANK = WIN_TILE_VALUE.bit_length() - 1
+
+_MOVES = metrics.registry.counter(
+    "vector_engine_moves_total", "Moves applied to vector engine boards"
+)
+
+# SplitMix64 constants
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+_MASK_64 = (1 << 64) - 1
+
+
+def is_available(size: int) -> bool:
+    """Whether the engine can play boards of this size here."""
+    return np is not None and 2 <= size <= VECTOR_ENGINE_MAX_SIZE
+
+
+@cache
+def line_table(size: int) -> tuple[Any, Any]:
+    """
+    Slide every possible line towards index 0.
+
+    Returns:
+        (result, gained): result[packed] is the line after the move and
+        gained[packed] the points scored, where packed holds rank i of the
+        line in bits [5 * i, 5 * i + 5)
+    """
+    packed = np.arange(1 << (_RANK_BITS * size), dtype=np.uint32)
+    lines = np.stack(
+        [(packed >> (_RANK_BITS * i)) & 0x1F for i in range(size)], axis=1
+    ).astype(np.uint8)
+
+    # Compress tiles towards the wall, keeping their order
+    order = np.argsort(lines == 0, axis=1, kind="stable")
+    tiles = np.take_along_axis(lines, order, axis=1)
+
+    result = np.zeros_like(tiles)
+    gained = np.zeros(len(tiles), dtype=np.uint32)
+    rows = np.arange(len(tiles))
+    read = np.zeros(len(tiles), dtype=np.intp)  # Next tile to take
+    for slot in range(size):
+        current = tiles[rows, np.minimum(read, size - 1)]
+        current[read >= size] = 0
+        following = tiles[rows, np.minimum(read + 1, size - 1)]
+        following[read + 1 >= size] = 0
+        merge = (current != 0) & (current == following)
+        result[:, slot] = current + merge
+        gained += np.where(merge, np.left_shift(1, current.astype(np.uint32) + 1), 0)
+        read += 1 + merge
+    return result, gained
+
+
+def slide_boards(boards: Any, direction: int) -> tuple[Any, Any]:
+    """
+    Slide boards of tile ranks, an array (count, size, size), one way.
+
+    Returns:
+        (boards, gained): the boards after the move and the points scored
+    """
+    name = DIRECTIONS[direction]
+    size = boards.shape[-1]
+    result, gained_table = line_table(size)
+    if name in ("up", "down"):
+        boards = boards.transpose(0, 2, 1)
+    if name in ("right", "down"):
+        boards = boards[:, :, ::-1]
+    shifts = np.arange(size, dtype=np.uint32) * _RANK_BITS
+    packed = (boards.astype(np.uint32) << shifts).sum(axis=2, dtype=np.uint32)
+    moved_boards = result[packed]
+    gained = gained_table[packed].sum(axis=1, dtype=np.int64)
+    if name in ("right", "down"):
+        moved_boards = moved_boards[:, :, ::-1]
+    if name in ("up", "down"):
+        moved_boards = moved_boards.transpose(0, 2, 1)
+    return moved_boards, gained
+
+
+@lru_cache(maxsize=1 << 16)
+def _slide_line(line: tuple[int, ...]) -> tuple[list[int], int]:
+    """Slide one line of ranks towards index 0; returns the new line and points."""
+    tiles = [rank for rank in line if rank]
+    result: list[int] = []
+    gained = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            result.append(tiles[i] + 1)
+            gained += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            result.append(tiles[i])
+            i += 1
+    return result + [0] * (len(line) - len(result)), gained
+
+
+def _splitmix(state: Any) -> tuple[Any, Any]:
+    """Advance random streams in place of a copy; returns (new state, output)."""
+    state = state + np.uint64(_GOLDEN_GAMMA)
+    z = state
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX_1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX_2)
+    return state, z ^ (z >> np.uint64(31))
+
+
+class VectorGames:
+    """
+    A set of games of one size, stored as arrays and stepped together.
+
+    Games are addressed by slot; slots can be reset or handed out and
+    returned with allocate() and free(), and the arrays grow as needed.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        capacity: int = 0,
+        ranks: Any = None,
+        scores: Any = None,
+        game_over: Any = None,
+    ) -> None:
+        """
+        Args:
+            ranks, scores, game_over: Arrays to keep the games in instead of
+                new ones, e.g. views of shared memory, all three with room
+                for capacity games; the engine can't grow past them
+        """
+        if not is_available(size):
+            raise ValueError(f"the vector engine can't play {size}x{size} boards")
+        self.size = size
+        self._fixed = ranks is not None
+        if ranks is not None:
+            if ranks.shape != (capacity, size, size) or ranks.dtype != np.uint8:
+                raise ValueError("ranks must be a (capacity, size, size) uint8 array")
+            if (
+                scores is None
+                or game_over is None
+                or len(scores) != capacity
+                or len(game_over) != capacity
+            ):
+                raise ValueError("scores and game_over must hold capacity games")
+        else:
+            ranks = np.zeros((capacity, size, size), dtype=np.uint8)
+            scores = np.zeros(capacity, dtype=np.int64)
+            game_over = np.zeros(capacity, dtype=bool)
+        self.ranks: Any = ranks
+        self.scores: Any = scores
+        self.game_over: Any = game_over
+        self._random = np.zeros(capacity, dtype=np.uint64)
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.scores)
+
+    def _grow(self, capacity: int) -> None:
+        if self._fixed:
+            raise ValueError("no free slots left in the given arrays")
+        old = self.capacity
+        extra = capacity - old
+        size = self.size
+        self.ranks = np.concatenate(
+            [self.ranks, np.zeros((extra, size, size), dtype=np.uint8)]
+        )
+        self.scores = np.concatenate([self.scores, np.zeros(extra, dtype=np.int64)])
+        self.game_over = np.concatenate([self.game_over, np.zeros(extra, dtype=bool)])
+        self._random = np.concatenate([self._random, np.zeros(extra, dtype=np.uint64)])
+        self._free.extend(range(capacity - 1, old - 1, -1))
+
+    def allocate(self, seed: int | None = None) -> int:
+        """Take a free slot and start a new game in it."""
+        return int(self.allocate_many(1, None if seed is None else [seed])[0])
+
+    def allocate_many(self, count: int, seeds: Any = None) -> Any:
+        """Take count free slots and start a new game in each; returns the slots."""
+        if len(self._free) < count:
+            self._grow(
+                max(16, self.capacity * 2, self.capacity + count - len(self._free))
+            )
+        slots = np.array([self._free.pop() for _ in range(count)], dtype=np.intp)
+        try:
+            self.reset(slots, seeds)
+        except BaseException:
+            self._free.extend(slots[::-1].tolist())  # Handed back, in the same order
+            raise
+        return slots
+
+    def free(self, slot: int) -> None:
+        self._free.append(slot)
+
+    def reset(self, slots: Any, seeds: Any = None) -> None:
+        """
+        Start new games: clear the boards and place the first two tiles.
+
+        Args:
+            seeds: One seed per slot for reproducible spawns, any ints of
+                which the low 64 bits are used; fresh entropy if None
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        if seeds is None:
+            state = np.random.default_rng().integers(
+                0, 1 << 63, size=len(slots), dtype=np.uint64
+            )
+        else:
+            state = np.array([int(seed) & _MASK_64 for seed in seeds], dtype=np.uint64)
+        self._random[slots] = state
+        self.ranks[slots] = 0
+        self.scores[slots] = 0
+        self.game_over[slots] = False
+        # Game.start() places two 2s, whatever the score
+        self._spawn(slots, np.zeros(len(slots), dtype=bool))
+        self._spawn(slots, np.zeros(len(slots), dtype=bool))
+
+    def _spawn(self, slots: Any, allow_fours: Any) -> None:
+        """Place a tile on a random empty cell of each board that has one."""
+        ranks = self.ranks[slots].reshape(len(slots), -1)
+        empty = ranks == 0
+        empty_count = empty.sum(axis=1)
+        has_room = empty_count > 0
+
+        state, draw = _splitmix(self._random[slots])
+        self._random[slots] = state
+        # Low half picks the cell (Lemire's multiply-shift), high half the value
+        low = draw & np.uint64(0xFFFFFFFF)
+        pick = ((low * empty_count.astype(np.uint64)) >> np.uint64(32)).astype(np.intp)
+        cell = np.argmax(np.cumsum(empty, axis=1) > pick[:, None], axis=1)
+
+        score = self.scores[slots]
+        chance = np.where(
+            score < SCORE_THRESHOLD_FOR_SPECIAL_TILES,
+            0.0,
+            np.minimum(
+                BASE_CHANCE_OF_4,
+                (score - SCORE_THRESHOLD_FOR_SPECIAL_TILES)
+                // CHANCE_SCORE_INTERVAL
+                * CHANCE_INCREASE_RATE,
+            ),
+        )
+        uniform = (draw >> np.uint64(32)).astype(np.float64) / float(1 << 32)
+        rank = np.where(allow_fours & (uniform < chance), 2, 1).astype(np.uint8)
+
+        rows = np.nonzero(has_room)[0]
+        ranks[rows, cell[rows]] = rank[rows]
+        self.ranks[slots] = ranks.reshape(len(slots), self.size, self.size)
+
+    def _update_game_over(self, slots: Any) -> None:
+        boards = self.ranks[slots]
+        full = (boards != 0).all(axis=(1, 2))
+        merges = (boards[:, :, 1:] == boards[:, :, :-1]).any(axis=(1, 2)) | (
+            boards[:, 1:, :] == boards[:, :-1, :]
+        ).any(axis=(1, 2))
+        self.game_over[slots] = full & ~merges
+
+    def step(self, slots: Any, directions: Any) -> tuple[Any, Any]:
+        """
+        Play one move in each of the given games, like Game.step().
+
+        Slots must be distinct. Finished games are left unchanged.
+
+        Args:
+            directions: Indices into DIRECTIONS
+
+        Returns:
+            (gained, moved): points scored and whether each board changed
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        directions = np.asarray(directions, dtype=np.intp)
+        gained = np.zeros(len(slots), dtype=np.int64)
+        moved = np.zeros(len(slots), dtype=bool)
+        playing = ~self.game_over[slots]
+
+        for direction in range(len(DIRECTIONS)):
+            selected = np.nonzero(playing & (directions == direction))[0]
+            if not len(selected):
+                continue
+            targets = slots[selected]
+            before = self.ranks[targets]
+            after, points = slide_boards(before, direction)
+            changed = (after != before).any(axis=(1, 2))
+            self.ranks[targets] = after
+            gained[selected] = np.where(changed, points, 0)
+            moved[selected] = changed
+
+        moved_slots = slots[moved]
+        if len(moved_slots):
+            if metrics.enabled:
+                _MOVES.inc(len(moved_slots))
+            self.scores[moved_slots] += gained[moved]
+            self._spawn(moved_slots, np.ones(len(moved_slots), dtype=bool))
+        self._update_game_over(slots)
+        return gained, moved
+
+    def step_one(self, slot: int, direction: int) -> tuple[int, bool]:
+        """
+        step() for a single game, in plain Python.
+
+        Array operations cost more than the move itself for one board, so
+        this walks the lines directly; the outcome is the same as step().
+        """
+        if self.game_over[slot]:
+            return 0, False
+        size = self.size
+        board = self.ranks[slot].tolist()
+        name = DIRECTIONS[direction]
+        if name in ("up", "down"):
+            board = [list(column) for column in zip(*board, strict=True)]
+        reverse = name in ("right", "down")
+
+        gained = 0
+        moved_lines = []
+        for line in board:
+            new_line, points = _slide_line(tuple(line[::-1] if reverse else line))
+            moved_lines.append(new_line[::-1] if reverse else new_line)
+            gained += points
+        if moved_lines == board:
+            return 0, False
+        if name in ("up", "down"):
+            moved_lines = [list(row) for row in zip(*moved_lines, strict=True)]
+        flat = [rank for row in moved_lines for rank in row]
+
+        score = int(self.scores[slot]) + gained
+        state = (int(self._random[slot]) + _GOLDEN_GAMMA) & _MASK_64
+        z = ((state ^ (state >> 30)) * _MIX_1) & _MASK_64
+        z = ((z ^ (z >> 27)) * _MIX_2) & _MASK_64
+        draw = z ^ (z >> 31)
+        empty = [i for i, rank in enumerate(flat) if not rank]
+        cell = empty[((draw & 0xFFFFFFFF) * len(empty)) >> 32]
+        four = (draw >> 32) / float(1 << 32) < special_tile_chance(score)
+        flat[cell] = 2 if four else 1
+
+        if metrics.enabled:
+            _MOVES.inc()
+        self.ranks[slot] = np.array(flat, dtype=np.uint8).reshape(size, size)
+        self.scores[slot] = score
+        self._random[slot] = state
+        if 0 not in flat:
+            rows = [flat[i : i + size] for i in range(0, len(flat), size)]
+            self.game_over[slot] = not any(
+                line[i] == line[i + 1]
+                for line in rows + [list(column) for column in zip(*rows, strict=True)]
+                for i in range(size - 1)
+            )
+        return gained, True
+
+    def legal_moves(self, slots: Any) -> Any:
+        """Bit mask per game of the directions that change the board."""
+        slots = np.asarray(slots, dtype=np.intp)
+        boards = self.ranks[slots]
+        mask = np.zeros(len(slots), dtype=np.uint8)
+        for direction in range(len(DIRECTIONS)):
+            after, _ = slide_boards(boards, direction)
+            mask |= (after != boards).any(axis=(1, 2)).astype(np.uint8) << direction
+        return mask
+
+    def has_won(self, slots: Any) -> Any:
+        boards = self.ranks[np.asarray(slots, dtype=np.intp)]
+        return boards.max(axis=(1, 2)) >= _WIN_RANK
+
+    def random_state(self, slot: int) -> int:
+        """The spawn random state of one game, e.g. to seed a Game that takes over."""
+        return int(self._random[slot])
+
+    def grid(self, slot: int) -> list[list[int]]:
+        """Tile values of one board, like Board.grid."""
+        return [
+            [1 << rank if rank else 0 for rank in row]
+            for row in self.ranks[slot].tolist()
+        ]
+
+
+class BatchStepper:
+    """
+    Steps every game of a VectorGames together without allocating.
+
+    All the arrays a step needs are made up front for the engine's current
+    capacity, and each step writes into them with out= operations, so the
+    engine must not grow while a stepper uses it. After step(), points and
+    moved hold the outcome for every slot.
+    """
+
+    def __init__(self, games: VectorGames) -> None:
+        self.games = games
+        count, size = games.capacity, games.size
+        cells = size * size
+        self._line_result, self._line_gained = line_table(size)
+        shifts = np.arange(size, dtype=np.uint32) * _RANK_BITS
+        packed = np.arange(len(self._line_result), dtype=np.uint32)
+        lines = (packed[:, None] >> shifts) & 0x1F
+        # Whether a move towards index 0 changes each packed line
+        self._line_movable = (self._line_result != lines).any(axis=1)
+        self._cell_shifts = np.tile(shifts, size)  # Of each cell in its line
+
+        # Cells in the order a move in each direction reads them: line by
+        # line, each from the wall the tiles move towards
+        grid = np.arange(cells, dtype=np.intp).reshape(size, size)
+        orders = {
+            "up": grid.T,
+            "down": grid.T[:, ::-1],
+            "left": grid,
+            "right": grid[:, ::-1],
+        }
+        self._orders = np.stack([orders[name].ravel() for name in DIRECTIONS])
+        self._board_starts = np.arange(count, dtype=np.intp) * cells
+        self._cells = games.ranks.reshape(-1)
+
+        self.points = np.zeros(count, dtype=np.int64)
+        self.moved = np.zeros(count, dtype=bool)
+
+        self._directions = np.zeros(count, dtype=np.intp)
+        self._index = np.zeros((count, cells), dtype=np.intp)
+        self._before = np.zeros((count, cells), dtype=np.uint8)
+        self._after = np.zeros((count, size, size), dtype=np.uint8)
+        self._wide = np.zeros((count, cells), dtype=np.uint32)
+        self._packed = np.zeros((count, size), dtype=np.intp)
+        self._line_points = np.zeros((count, size), dtype=np.uint32)
+        self._changed = np.zeros((count, cells), dtype=bool)
+        self._flag = np.zeros(count, dtype=bool)
+        self._pairs_across = np.zeros((count, size, size - 1), dtype=bool)
+        self._pairs_down = np.zeros((count, size - 1, size), dtype=bool)
+        self._draw = np.zeros(count, dtype=np.uint64)
+        self._word = np.zeros(count, dtype=np.uint64)
+        # Counts of empty cells stay below 256, so uint8 avoids casts
+        self._empty_count = np.zeros(count, dtype=np.uint8)
+        self._empty_seen = np.zeros((count, cells), dtype=np.uint8)
+        self._pick = np.zeros(count, dtype=np.uint8)
+        self._past_pick = np.zeros((count, cells), dtype=bool)
+        self._spawn_cell = np.zeros(count, dtype=np.intp)
+        self._spawn_rank = np.zeros(count, dtype=np.uint8)
+        self._spawn_current = np.zeros(count, dtype=np.uint8)
+        self._uniform = np.zeros(count, dtype=np.float64)
+        self._chance = np.zeros(count, dtype=np.float64)
+        # legal_moves_into(), made on first use
+        self._all_index: Any = None
+
+    def step(self, directions: Any) -> None:
+        """
+        Play one move in every game, like VectorGames.step() over all slots.
+
+        Args:
+            directions: One index into DIRECTIONS per slot
+        """
+        np.copyto(self._directions, directions)
+        if len(self._directions) and (
+            self._directions.min() < 0 or self._directions.max() >= len(DIRECTIONS)
+        ):
+            raise ValueError("directions must be indices into DIRECTIONS")
+        games = self.games
+        index, before = self._index, self._before
+        np.take(self._orders, self._directions, axis=0, out=index, mode="wrap")
+        np.add(index, self._board_starts[:, None], out=index)
+        np.take(self._cells, index, out=before, mode="wrap")
+        self._pack_lines(self._wide, before, self._packed)
+
+        # Finished games have no move that changes them, so they stay as is
+        after = self._after.reshape(len(before), -1)
+        np.take(self._line_result, self._packed, axis=0, out=self._after, mode="wrap")
+        np.take(self._line_gained, self._packed, out=self._line_points, mode="wrap")
+        np.add.reduce(self._line_points, axis=1, out=self.points)
+        np.not_equal(after, before, out=self._changed)
+        np.logical_or.reduce(self._changed, axis=1, out=self.moved)
+        np.multiply(self.points, self.moved, out=self.points)
+        np.put(self._cells, index, after, mode="wrap")
+        np.add(games.scores, self.points, out=games.scores)
+
+        self._spawn(self.moved, allow_fours=True)
+        self._update_game_over()
+
+    def restart(self, where: Any) -> None:
+        """
+        Start new games in the selected slots, like Game.start(). Each keeps
+        drawing from its own random stream rather than being reseeded.
+        """
+        games = self.games
+        np.copyto(games.ranks, 0, where=where[:, None, None])
+        np.copyto(games.scores, 0, where=where)
+        np.copyto(games.game_over, False, where=where)
+        self._spawn(where, allow_fours=False)
+        self._spawn(where, allow_fours=False)
+
+    def legal_moves_into(self, out: Any) -> None:
+        """Write whether each direction changes each board to out (count, 4)."""
+        if self._all_index is None:
+            count, cells = self._before.shape
+            self._all_index = self._orders[None] + self._board_starts[:, None, None]
+            self._all_cells = np.zeros((count, len(DIRECTIONS), cells), dtype=np.uint8)
+            self._all_wide = np.zeros((count, len(DIRECTIONS), cells), dtype=np.uint32)
+            self._all_packed = np.zeros(
+                (count, len(DIRECTIONS), self.games.size), dtype=np.intp
+            )
+            self._all_movable = np.zeros(self._all_packed.shape, dtype=bool)
+        np.take(self._cells, self._all_index, out=self._all_cells, mode="wrap")
+        self._pack_lines(self._all_wide, self._all_cells, self._all_packed)
+        np.take(
+            self._line_movable, self._all_packed, out=self._all_movable, mode="wrap"
+        )
+        np.logical_or.reduce(self._all_movable, axis=2, out=out)
+
+    def _pack_lines(self, wide: Any, cells: Any, packed: Any) -> None:
+        """Pack lines of ranks (..., size * size) into line table indices."""
+        size = self.games.size
+        np.copyto(wide, cells)
+        np.left_shift(wide, self._cell_shifts, out=wide)
+        np.add.reduce(wide.reshape(*wide.shape[:-1], size, size), axis=-1, out=packed)
+
+    def _spawn(self, where: Any, allow_fours: bool) -> None:
+        """VectorGames._spawn() for the selected slots, which must have room."""
+        games, draw, word = self.games, self._draw, self._word
+        state = games._random
+        np.add(state, np.uint64(_GOLDEN_GAMMA), out=state, where=where)
+        np.right_shift(state, np.uint64(30), out=draw)
+        np.bitwise_xor(draw, state, out=draw)
+        np.multiply(draw, np.uint64(_MIX_1), out=draw)
+        np.right_shift(draw, np.uint64(27), out=word)
+        np.bitwise_xor(draw, word, out=draw)
+        np.multiply(draw, np.uint64(_MIX_2), out=draw)
+        np.right_shift(draw, np.uint64(31), out=word)
+        np.bitwise_xor(draw, word, out=draw)
+
+        # Low half picks the empty cell, high half the value
+        empty = self._changed
+        np.equal(games.ranks.reshape(len(empty), -1), 0, out=empty)
+        empty = empty.view(np.uint8)
+        np.add.reduce(empty, axis=1, out=self._empty_count)
+        np.bitwise_and(draw, np.uint64(0xFFFFFFFF), out=word)
+        np.multiply(word, self._empty_count, out=word)
+        np.right_shift(word, np.uint64(32), out=word)
+        np.copyto(self._pick, word)
+        np.cumsum(empty, axis=1, out=self._empty_seen)
+        np.greater(self._empty_seen, self._pick[:, None], out=self._past_pick)
+        np.argmax(self._past_pick, axis=1, out=self._spawn_cell)
+        np.add(self._spawn_cell, self._board_starts, out=self._spawn_cell)
+
+        rank = self._spawn_rank
+        rank[:] = 1
+        if allow_fours:
+            # special_tile_chance(), but negative below the threshold
+            chance = self._chance
+            np.copyto(chance, games.scores)
+            np.subtract(chance, SCORE_THRESHOLD_FOR_SPECIAL_TILES, out=chance)
+            np.floor_divide(chance, CHANCE_SCORE_INTERVAL, out=chance)
+            np.multiply(chance, CHANCE_INCREASE_RATE, out=chance)
+            np.minimum(chance, BASE_CHANCE_OF_4, out=chance)
+            np.right_shift(draw, np.uint64(32), out=word)
+            np.copyto(self._uniform, word)
+            np.multiply(self._uniform, 1.0 / (1 << 32), out=self._uniform)
+            np.less(self._uniform, chance, out=self._flag)
+            np.add(rank, self._flag, out=rank)
+
+        # Slots left out write back the value already in the picked cell
+        current = self._spawn_current
+        np.take(self._cells, self._spawn_cell, out=current, mode="wrap")
+        np.copyto(current, rank, where=where)
+        np.put(self._cells, self._spawn_cell, current, mode="wrap")
+
+    def _update_game_over(self) -> None:
+        """A game is over when its board is full and no neighbours match."""
+        boards, over = self.games.ranks, self.games.game_over
+        np.equal(boards[:, :, 1:], boards[:, :, :-1], out=self._pairs_across)
+        np.equal(boards[:, 1:, :], boards[:, :-1, :], out=self._pairs_down)
+        np.logical_or.reduce(self._pairs_across, axis=(1, 2), out=over)
+        np.logical_or.reduce(self._pairs_down, axis=(1, 2), out=self._flag)
+        np.logical_or(over, self._flag, out=over)
+        np.logical_and.reduce(boards, axis=(1, 2), out=self._flag)  # Full
+        np.greater(self._flag, over, out=over)  # Full and nothing to merge
@@ -0,0 +1,202 @@
+"""
+Batch position analysis for 2048-CLI.
+Reads positions from a file or stdin, finds the best move of each with the
+built-in search across a pool of worker processes, and writes the results
+in input order. Only a fixed number of batches is in flight at any time, so
+memory use doesn't grow with the input.
+
+Input is either lines (pipe mode text or JSON states, {"board": ...,
+"score": ...} objects, or bare JSON boards) or pipe mode binary frames.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m headless.analyze positions.jsonl > results.jsonl
+    PYTHONPATH=src python -m headless.analyze --input binary --output binary <log.bin
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import Any, BinaryIO
+
+from ai.expectimax import SearchResult, search
+from core.constants import (
+    ANALYZE_BATCH_SIZE,
+    ANALYZE_BATCHES_PER_WORKER,
+    SEARCH_DEPTH,
+    SPARSE_BOARD_MIN_SIZE,
+)
+from game.board import Board
+from game.game import DIRECTIONS
+from game.sparse_board import SparseBoard
+
+from .protocol import (
+    ANALYSIS_RESULT,
+    INVALID_INDEX,
+    NO_MOVE_INDEX,
+    parse_binary_state,
+    parse_state_line,
+    read_frames,
+)
+
+
+def analyze_position(score: int, grid: list[list[int]], depth: int) -> SearchResult:
+    """Search one position, using the sparse backend for huge boards."""
+    size = len(grid)
+    board = SparseBoard(size) if size >= SPARSE_BOARD_MIN_SIZE else Board(size)
+    board.set_grid(grid)
+    return search(board, score, depth)
+
+
+def format_result(result: SearchResult | None, error: str, output_format: str) -> bytes:
+    """Encode one result; result is None for positions that couldn't be read."""
+    if output_format == "binary":
+        if result is None:
+            return ANALYSIS_RESULT.pack(INVALID_INDEX, math.nan, 0)
+        index = (
+            DIRECTIONS.index(result.direction)
+            if result.direction is not None
+            else NO_MOVE_INDEX
+        )
+        return ANALYSIS_RESULT.pack(index, result.value, result.legal_mask)
+    if output_format == "text":
+        if result is None:
+            return f"! {error}\n".encode()
+        direction = result.direction or "-"
+        return f"{direction} {result.value:.1f} {result.legal_mask}\n".encode()
+    if result is None:
+        return json.dumps({"error": error}).encode() + b"\n"
+    return (
+        json.dumps(
+            {
+                "move": result.direction,
+                "value": result.value,
+                "legal": result.legal_mask,
+            },
+            separators=(",", ":"),
+        ).encode()
+        + b"\n"
+    )
+
+
+def analyze_batch(
+    records: list[bytes], input_format: str, output_format: str, depth: int
+) -> bytes:
+    """Analyze a batch of raw input records; runs in the worker processes."""
+    output = bytearray()
+    for record in records:
+        try:
+            if input_format == "binary":
+                score, _, grid = parse_binary_state(record)
+            else:
+                score, grid = parse_state_line(record)
+            result = analyze_position(score, grid, depth)
+        except (ValueError, TypeError, OverflowError) as e:
+            output += format_result(None, str(e), output_format)
+            continue
+        except Exception as e:
+            # One bad record gets an error in place; the rest still run
+            output += format_result(None, f"{type(e).__name__}: {e}", output_format)
+            continue
+        output += format_result(result, "", output_format)
+    return bytes(output)
+
+
+def read_records(stream: BinaryIO, input_format: str) -> Iterator[bytes]:
+    """Raw records from the input, skipping blank lines."""
+    if input_format == "binary":
+        yield from read_frames(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def batched(records: Iterable[bytes], size: int) -> Iterator[list[bytes]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def run_analysis(
+    stream: BinaryIO,
+    output: BinaryIO,
+    input_format: str = "lines",
+    output_format: str = "json",
+    workers: int = 1,
+    depth: int = SEARCH_DEPTH,
+    batch_size: int = ANALYZE_BATCH_SIZE,
+) -> None:
+    """
+    Analyze every position in stream and write the results to output.
+
+    Batches are handed to the pool as earlier results are written, with at
+    most ANALYZE_BATCHES_PER_WORKER per worker outstanding.
+    """
+    batches = batched(read_records(stream, input_format), batch_size)
+    if workers <= 1:
+        for batch in batches:
+            output.write(analyze_batch(batch, input_format, output_format, depth))
+        output.flush()
+        return
+
+    max_pending = workers * ANALYZE_BATCHES_PER_WORKER
+    with multiprocessing.Pool(workers) as pool:
+        pending: deque[Any] = deque()
+        for batch in batches:
+            if len(pending) >= max_pending:
+                output.write(pending.popleft().get())
+            pending.append(
+                pool.apply_async(
+                    analyze_batch, (batch, input_format, output_format, depth)
+                )
+            )
+        while pending:
+            output.write(pending.popleft().get())
+    output.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "file", nargs="?", help="file of positions to read (default: stdin)"
+    )
+    parser.add_argument("--input", choices=("lines", "binary"), default="lines")
+    parser.add_argument("--output", choices=("json", "text", "binary"), default="json")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: one per CPU)",
+    )
+    parser.add_argument("--depth", type=int, default=SEARCH_DEPTH)
+    parser.add_argument("--batch-size", type=int, default=ANALYZE_BATCH_SIZE)
+    args = parser.parse_args()
+    if args.depth < 1 or args.batch_size < 1:
+        parser.error("--depth and --batch-size must be at least 1")
+
+    stream = open(args.file, "rb") if args.file else sys.stdin.buffer
+    try:
+        run_analysis(
+            stream,
+            sys.stdout.buffer,
+            args.input,
+            args.output,
+            args.workers,
+            args.depth,
+            args.batch_size,
+        )
+    except BrokenPipeError:
+        pass
+    finally:
+        if args.file:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Client for the 2048-CLI game server.
+Requests can be issued concurrently on one connection: each is written
+straight away and its reply resolves the matching future, so awaiting many
+requests together pipelines them.
+
+Example:
+    client = await GameClient.connect(unix_path="/tmp/2048.sock")
+    session, state = await client.create(seed=1)
+    state = await client.move(session, "left")
+    await client.close()
+"""
+
+import asyncio
+import itertools
+import json
+import sys
+from array import array
+from collections import deque
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+from core.constants import SERVER_DEFAULT_HOST, SERVER_DEFAULT_PORT
+from game.game import DIRECTIONS
+
+from .protocol import (
+    BATCH_REPLY_HEADER,
+    BATCH_REQUEST_HEADER,
+    BINARY_MAGIC,
+    OP_STEP_BATCH,
+    STATUS_OK,
+)
+
+
+class ServerError(Exception):
+    """The server rejected a request."""
+
+
+class BatchResult(NamedTuple):
+    """Packed results of a batch step, one entry per (session, direction) pair."""
+
+    size: int  # Board size
+    boards: bytes  # size * size tile ranks per pair, row-major
+    rewards: array  # Points gained per pair ("I" array)
+    flags: bytes  # protocol.FLAG_* bits per pair
+
+
+class GameClient:
+    """One connection to a game server."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        # Replies arrive in request order, so a queue of futures is enough
+        self._waiting: deque[asyncio.Future[dict[str, Any]]] = deque()
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(
+        cls,
+        unix_path: str | None = None,
+        host: str = SERVER_DEFAULT_HOST,
+        port: int = SERVER_DEFAULT_PORT,
+    ) -> "GameClient":
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self) -> None:
+        reader = self._reader
+        magic = BINARY_MAGIC.to_bytes(1, "little")
+        try:
+            while first := await reader.read(1):
+                if first == magic:
+                    reply: Any = await self._read_batch_reply(first)
+                else:
+                    reply = json.loads(first + await reader.readline())
+                future = self._waiting.popleft()
+                if not future.done():
+                    future.set_result(reply)
+        except (ConnectionError, IndexError, ValueError, asyncio.IncompleteReadError):
+            pass  # Disconnected, or the server sent something unreadable
+        finally:
+            # The connection is gone; nothing else will be answered
+            while self._waiting:
+                future = self._waiting.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed"))
+
+    def _expect_reply(self) -> asyncio.Future[Any]:
+        """A future for the reply to the next request written."""
+        if self._receiver.done():
+            # Nothing reads replies any more, so the future would never resolve
+            raise ConnectionError("connection closed")
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append(future)
+        return future
+
+    async def _read_batch_reply(self, first: bytes) -> BatchResult | None:
+        header = first + await self._reader.readexactly(BATCH_REPLY_HEADER.size - 1)
+        _, status, count, size = BATCH_REPLY_HEADER.unpack(header)
+        if status != STATUS_OK:
+            return None
+        payload = await self._reader.readexactly(count * (size * size + 5))
+        boards_end = count * size * size
+        rewards = array("I", payload[boards_end : boards_end + 4 * count])
+        if sys.byteorder == "big":
+            rewards.byteswap()
+        flags = payload[boards_end + 4 * count :]
+        return BatchResult(size, payload[:boards_end], rewards, flags)
+
+    async def step_batch(
+        self, sessions: Sequence[int], directions: bytes | Sequence[int | str]
+    ) -> BatchResult:
+        """
+        Play one move per (session, direction) pair in a single request.
+
+        Directions are indices into DIRECTIONS (a bytes object of them is
+        sent as is) or their names. Pairs are
+        applied in order, so a session may appear more than once. All
+        sessions must have the same board size.
+        """
+        if len(sessions) != len(directions):
+            raise ValueError("sessions and directions differ in length")
+        session_ids = array("I", sessions)
+        if sys.byteorder == "big":
+            session_ids.byteswap()
+        if isinstance(directions, bytes):
+            direction_bytes = directions
+        else:
+            direction_bytes = bytes(
+                DIRECTIONS.index(direction) if isinstance(direction, str) else direction
+                for direction in directions
+            )
+        future = self._expect_reply()
+        self._writer.write(
+            BATCH_REQUEST_HEADER.pack(BINARY_MAGIC, OP_STEP_BATCH, len(sessions))
+            + session_ids.tobytes()
+            + direction_bytes
+        )
+        result = await future
+        if result is None:
+            raise ServerError("batch step failed")
+        return result
+
+    async def request(self, op: str, **fields: Any) -> dict[str, Any]:
+        """Send a request and wait for its reply."""
+        message = {"id": next(self._ids), "op": op, **fields}
+        future = self._expect_reply()
+        self._writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        response = await future
+        if not response.get("ok"):
+            raise ServerError(response.get("error", "request failed"))
+        return response
+
+    async def create(
+        self, seed: int | None = None, size: int | None = None
+    ) -> tuple[int, dict[str, Any]]:
+        """Start a game; returns its session ID and first state."""
+        fields: dict[str, Any] = {}
+        if seed is not None:
+            fields["seed"] = seed
+        if size is not None:
+            fields["size"] = size
+        response = await self.request("create", **fields)
+        return response["session"], response["state"]
+
+    async def move(self, session: int, direction: str) -> dict[str, Any]:
+        return (await self.request("move", session=session, direction=direction))[
+            "state"
+        ]
+
+    async def state(self, session: int) -> dict[str, Any]:
+        return (await self.request("state", session=session))["state"]
+
+    async def save(
+        self, session: int, slot: int | None = None, name: str | None = None
+    ) -> dict[str, Any]:
+        """Save to a slot on the server, or get the save data back if no slot."""
+        if slot is None:
+            return (await self.request("save", session=session))["save"]
+        return await self.request("save", session=session, slot=slot, name=name)
+
+    async def hint(self, session: int) -> dict[str, Any]:
+        """The server's suggested move: {"move": ..., "value": ..., "legal": ...}."""
+        return (await self.request("hint", session=session))["hint"]
+
+    async def close_session(self, session: int) -> None:
+        await self.request("close", session=session)
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._receiver
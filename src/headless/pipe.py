@@ -0,0 +1,126 @@
+"""
+Pipe mode for 2048-CLI.
+Plays the game over stdin and stdout without curses: each command read is
+answered with the resulting board state, in text, JSON lines or binary
+frames. Replies are collected in blocks and written once all input read so
+far has been handled, so scripted play costs one write per read rather than
+one per move.
+"""
+
+import random
+from typing import BinaryIO
+
+from core.constants import (
+    DEFAULT_BOARD_SIZE,
+    PIPE_OUTPUT_BLOCK_SIZE,
+    PIPE_READ_SIZE,
+)
+from game.game import Game
+
+from .protocol import (
+    FLAG_ERROR,
+    FLAG_GAME_OVER,
+    FLAG_MOVED,
+    FLAG_WON,
+    STATE_FORMATTERS,
+    grid_to_ranks,
+    parse_command_line,
+)
+
+
+class PipeSession:
+    """One game played through pipe commands, with its output buffer."""
+
+    def __init__(
+        self,
+        output_format: str = "text",
+        board_size: int = DEFAULT_BOARD_SIZE,
+        seed: int | None = None,
+    ) -> None:
+        self.board_size = board_size
+        self.rng = random.Random(seed)
+        self.format_state = STATE_FORMATTERS[output_format]
+        self.output = bytearray()
+        self.moves = 0
+        self.game = self._new_game()
+
+    def _new_game(self) -> Game:
+        game = Game(self.board_size, rng=self.rng)
+        game.start()
+        return game
+
+    def write_state(self, flags: int = 0) -> None:
+        game = self.game
+        if game.game_over:
+            flags |= FLAG_GAME_OVER
+        if game.has_won():
+            flags |= FLAG_WON
+        self.output += self.format_state(
+            game.score, flags, game.board.size, grid_to_ranks(game.board.grid)
+        )
+
+    def handle_line(self, line: bytes) -> None:
+        """Run the commands on one input line and queue a reply to each."""
+        commands = parse_command_line(line)
+        if commands is None:
+            self.write_state(FLAG_ERROR)
+            return
+        for command in commands:
+            if command == "new":
+                self.game = self._new_game()
+                self.write_state()
+            elif self.game.game_over:
+                self.write_state()
+            else:
+                moved = self.game.step(command)
+                self.moves += moved
+                self.write_state(FLAG_MOVED if moved else 0)
+
+
+def run_pipe(
+    stdin: BinaryIO,
+    stdout: BinaryIO,
+    output_format: str = "text",
+    board_size: int = DEFAULT_BOARD_SIZE,
+    seed: int | None = None,
+) -> int:
+    """
+    Play until stdin ends.
+
+    The initial state is written first, then one state per command.
+
+    Returns:
+        The number of moves that changed the board
+    """
+    session = PipeSession(output_format, board_size, seed)
+    session.write_state()
+    # read1() returns whatever is available instead of waiting for a full block
+    read = getattr(stdin, "read1", stdin.read)
+    pending = b""
+
+    def flush() -> None:
+        stdout.write(session.output)
+        stdout.flush()
+        session.output.clear()
+
+    try:
+        while True:
+            # Reply to everything read so far before blocking on more input,
+            # so a bot waiting for an answer never stalls
+            if session.output:
+                flush()
+            chunk = read(PIPE_READ_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                session.handle_line(line)
+                if len(session.output) >= PIPE_OUTPUT_BLOCK_SIZE:
+                    flush()
+        if pending.strip():
+            session.handle_line(pending)
+        flush()
+    except BrokenPipeError:
+        pass  # The reader went away; nothing left to do
+    return session.moves
@@ -0,0 +1,222 @@
+"""
+Wire formats for driving the game without a terminal.
+Boards travel as tile ranks (log2 of the value, 0 for empty cells), either
+as base-36 text or as one byte per cell in length-prefixed binary frames.
+"""
+
+import json
+import struct
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+# Move letters accepted on input, and their full names
+MOVE_LETTERS = {"L": "left", "R": "right", "U": "up", "D": "down"}
+NEW_GAME_LETTER = "N"
+
+# Rank digits for text boards: 2 -> "1", 2048 -> "b", ...
+RANK_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# State flags
+FLAG_MOVED = 1
+FLAG_GAME_OVER = 2
+FLAG_WON = 4
+FLAG_ERROR = 8  # The command was not understood; the state is unchanged
+
+# Binary frame: payload length, then score, flags and board size, then ranks
+FRAME_LENGTH = struct.Struct("<I")
+STATE_HEADER = struct.Struct("<QBH")
+
+# Binary server messages start with a zero byte, which never begins a JSON
+# line. Batch step request: magic, op, pair count, then count u32 session
+# IDs and count u8 direction indices. Reply: magic, status, count, board
+# size, then count boards of ranks, count u32 rewards and count u8 flags.
+BINARY_MAGIC = 0
+OP_STEP_BATCH = 1
+BATCH_REQUEST_HEADER = struct.Struct("<BBI")
+BATCH_REPLY_HEADER = struct.Struct("<BBIH")
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+# Binary analysis result: move index in DIRECTIONS (-1: no legal move,
+# -2: invalid position), expected value and legal move mask
+ANALYSIS_RESULT = struct.Struct("<bdB")
+NO_MOVE_INDEX = -1
+INVALID_INDEX = -2
+
+
+def grid_to_ranks(grid: list[list[int]]) -> bytes:
+    """Row-major tile ranks, one byte per cell."""
+    return bytes(
+        value.bit_length() - 1 if value else 0 for row in grid for value in row
+    )
+
+
+def ranks_to_grid(ranks: bytes, size: int) -> list[list[int]]:
+    """Inverse of grid_to_ranks."""
+    return [
+        [1 << rank if rank else 0 for rank in ranks[row * size : (row + 1) * size]]
+        for row in range(size)
+    ]
+
+
+def format_text_state(score: int, flags: int, size: int, ranks: bytes) -> bytes:
+    """
+    One line: score, flags and the board as base-36 ranks, rows split by "/".
+
+    e.g. b"1204 1 0012/0100/0000/0002\\n"
+    """
+    rows = "/".join(
+        "".join(RANK_DIGITS[rank] for rank in ranks[row * size : (row + 1) * size])
+        for row in range(size)
+    )
+    return f"{score} {flags} {rows}\n".encode("ascii")
+
+
+def format_json_state(score: int, flags: int, size: int, ranks: bytes) -> bytes:
+    """One JSON object per line, with the board as nested lists of values."""
+    state: dict[str, Any] = {
+        "score": score,
+        "moved": bool(flags & FLAG_MOVED),
+        "game_over": bool(flags & FLAG_GAME_OVER),
+        "won": bool(flags & FLAG_WON),
+        "board": ranks_to_grid(ranks, size),
+    }
+    if flags & FLAG_ERROR:
+        state["error"] = True
+    return json.dumps(state, separators=(",", ":")).encode("ascii") + b"\n"
+
+
+def format_binary_state(score: int, flags: int, size: int, ranks: bytes) -> bytes:
+    """A length-prefixed frame: <u32 length><u64 score><u8 flags><u16 size><ranks>."""
+    payload_length = STATE_HEADER.size + len(ranks)
+    return (
+        FRAME_LENGTH.pack(payload_length)
+        + STATE_HEADER.pack(score, flags, size)
+        + ranks
+    )
+
+
+STATE_FORMATTERS = {
+    "text": format_text_state,
+    "json": format_json_state,
+    "binary": format_binary_state,
+}
+
+
+def parse_binary_state(payload: bytes) -> tuple[int, int, list[list[int]]]:
+    """
+    Decode a frame payload (without its length prefix) to score, flags, grid.
+
+    Raises:
+        ValueError: If the payload is shorter than its header says
+    """
+    if len(payload) < STATE_HEADER.size:
+        raise ValueError("truncated frame")
+    score, flags, size = STATE_HEADER.unpack_from(payload)
+    ranks = payload[STATE_HEADER.size : STATE_HEADER.size + size * size]
+    if len(ranks) < size * size:
+        raise ValueError("truncated frame")
+    return score, flags, ranks_to_grid(ranks, size)
+
+
+def read_frames(stream: BinaryIO) -> Iterator[bytes]:
+    """Yield the payloads of length-prefixed frames until the stream ends."""
+    while True:
+        header = stream.read(FRAME_LENGTH.size)
+        if len(header) < FRAME_LENGTH.size:
+            return
+        (length,) = FRAME_LENGTH.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            return
+        yield payload
+
+
+def _is_tile(value: Any) -> bool:
+    """Whether a decoded JSON cell is empty (0) or a tile value."""
+    return type(value) is int and (
+        value == 0 or (value >= 2 and value & (value - 1) == 0)
+    )
+
+
+def parse_state_line(line: bytes) -> tuple[int, list[list[int]]]:
+    """
+    Decode a position from one line of text.
+
+    Accepts a pipe mode state (text or JSON), a JSON object with "board"
+    and optionally "score", or a bare JSON board.
+
+    Returns:
+        Score and grid
+
+    Raises:
+        ValueError: If the line isn't a valid position
+    """
+    line = line.strip()
+    if line[:1] in (b"{", b"["):
+        message = json.loads(line)
+        if isinstance(message, dict):
+            grid, score = message.get("board"), message.get("score", 0)
+        else:
+            grid, score = message, 0
+        if not (
+            isinstance(grid, list)
+            and grid
+            and all(isinstance(row, list) and len(row) == len(grid) for row in grid)
+            and isinstance(score, int)
+        ):
+            raise ValueError("expected a square board")
+        if not all(_is_tile(value) for row in grid for value in row):
+            raise ValueError("expected tiles of 0 or a power of two from 2")
+        return score, grid
+
+    fields = line.split()
+    if len(fields) != 3:
+        raise ValueError("expected 'score flags board'")
+    rows = fields[2].decode("ascii").split("/")
+    if any(len(row) != len(rows) for row in rows):
+        raise ValueError("expected a square board")
+    grid = [
+        [1 << int(digit, 36) if digit != "0" else 0 for digit in row] for row in rows
+    ]
+    return int(fields[0]), grid
+
+
+def parse_command_line(line: bytes) -> list[str] | None:
+    """
+    Decode one input line into commands: direction names or "new".
+
+    A line is either a JSON object ({"move": "left"}, {"move": "L"} or
+    {"new": true}) or any number of move letters, with N for a new game.
+
+    Returns:
+        The commands in order, or None if the line is malformed
+    """
+    line = line.strip()
+    if not line:
+        return []
+    if line.startswith(b"{"):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(message, dict):
+            return None
+        if message.get("new"):
+            return ["new"]
+        move = message.get("move")
+        if isinstance(move, str):
+            move = MOVE_LETTERS.get(move.upper(), move.lower())
+            if move in MOVE_LETTERS.values():
+                return [move]
+        return None
+
+    commands = []
+    for letter in line.decode("ascii", "replace").upper():
+        if letter in MOVE_LETTERS:
+            commands.append(MOVE_LETTERS[letter])
+        elif letter == NEW_GAME_LETTER:
+            commands.append("new")
+        elif not letter.isspace() and letter != ",":
+            return None
+    return commands
@@ -0,0 +1,676 @@
+"""
+Multi-session game server for 2048-CLI.
+Hosts many games in one process behind a Unix or TCP socket, speaking JSON
+lines. Each request carries an "op" and an optional "id" that is echoed in
+the reply; requests on one connection are answered in order, so clients can
+pipeline as many as they like without waiting.
+
+Operations:
+    {"op": "create", "seed": 1, "size": 4}   -> {"session": 7, "state": ...}
+    {"op": "move", "session": 7, "direction": "left"}   -> {"state": ...}
+    {"op": "state", "session": 7}   -> {"state": ...}
+    {"op": "save", "session": 7}   -> {"save": {...}}
+    {"op": "save", "session": 7, "slot": 1, "name": "bot"}   -> {"saved": true}
+    {"op": "hint", "session": 7}   -> {"hint": {"move": "up", ...}}
+    {"op": "close", "session": 7}   -> {}
+
+Every reply has "ok"; failed requests get "ok": false and an "error".
+
+Many moves can also be sent in one binary batch step request (see
+protocol.BATCH_REQUEST_HEADER), answered with packed boards, rewards and
+flags. Games of sizes the NumPy vector engine supports live in its arrays,
+so a batch costs a few array operations rather than a Game.step() per move.
+Sessions are shared by all connections and are dropped after sitting idle
+for SERVER_IDLE_TIMEOUT seconds. Hints for sessions on different
+connections are evaluated together in batches by an InferenceService.
+With --spectate, any session can be watched (see spectate.SpectatorHub),
+as the stream with its session ID; only watched sessions are published.
+--metrics-file and --metrics-port export the sessions, requests, moves and
+hint batches in the Prometheus text format.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m headless.server --unix /tmp/2048.sock
+    PYTHONPATH=src python -m headless.server --port 2048
+    PYTHONPATH=src python -m headless.server --unix /tmp/2048.sock \
+        --spectate /tmp/2048-spectate.sock
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # Optional; only games in a vector engine need it
+    np = None  # type: ignore[assignment]
+
+from ai.inference import InferenceService, search_evaluator
+from core import metrics
+from core.config import load_config
+from core.constants import (
+    DEFAULT_BOARD_SIZE,
+    SEARCH_DEPTH,
+    SERVER_DEFAULT_HOST,
+    SERVER_DEFAULT_PORT,
+    SERVER_EVICT_INTERVAL,
+    SERVER_IDLE_TIMEOUT,
+    SERVER_MAX_BATCH_PAIRS,
+    SERVER_MAX_BOARD_SIZE,
+    SERVER_MAX_SESSIONS,
+    SERVER_WRITE_BUFFER_LIMIT,
+    WIN_TILE_VALUE,
+)
+from core.save_load import save_game
+from game import vector_engine
+from game.game import DIRECTIONS, Game
+from game.vector_engine import VectorGames
+
+from .protocol import (
+    BATCH_REPLY_HEADER,
+    BATCH_REQUEST_HEADER,
+    BINARY_MAGIC,
+    FLAG_ERROR,
+    FLAG_GAME_OVER,
+    FLAG_MOVED,
+    FLAG_WON,
+    MOVE_LETTERS,
+    OP_STEP_BATCH,
+    STATUS_ERROR,
+    STATUS_OK,
+    grid_to_ranks,
+)
+from .spectate import SpectatorHub
+
+logger = logging.getLogger(__name__)
+
+
+class RequestError(Exception):
+    """A request that can't be carried out; reported back to the client."""
+
+
+@dataclass
+class Session:
+    """One hosted game: a Game object, or a slot in a vector engine."""
+
+    size: int
+    game: Game | None = None
+    engine: VectorGames | None = None
+    slot: int = -1
+    last_used: float = 0.0
+
+    def _engine(self) -> VectorGames:
+        if self.engine is None:
+            raise RequestError("session has no game")
+        return self.engine
+
+    def state(self, moved: bool = False) -> dict[str, Any]:
+        game = self.game
+        if game is not None:
+            return {
+                "score": game.score,
+                "moved": moved,
+                "game_over": game.game_over,
+                "won": game.has_won(),
+                "board": game.board.grid,
+            }
+        engine, slot = self._engine(), self.slot
+        grid = engine.grid(slot)
+        return {
+            "score": int(engine.scores[slot]),
+            "moved": moved,
+            "game_over": bool(engine.game_over[slot]),
+            "won": any(value >= WIN_TILE_VALUE for row in grid for value in row),
+            "board": grid,
+        }
+
+    def move(self, direction: str) -> bool:
+        game = self.game
+        if game is not None:
+            return False if game.game_over else game.step(direction)
+        return self._engine().step_one(self.slot, DIRECTIONS.index(direction))[1]
+
+    def to_game(self) -> Game:
+        """The session as a Game, e.g. for save_game()."""
+        if self.game is not None:
+            return self.game
+        engine = self._engine()
+        game = Game(self.size)
+        game.board.set_grid(engine.grid(self.slot))
+        game.score = int(engine.scores[self.slot])
+        game.game_over = bool(engine.game_over[self.slot])
+        return game
+
+    def leave_engine(self) -> None:
+        """
+        Carry the game on as a Game object and free its engine slot.
+
+        Game objects report tile events, so spectators can be sent deltas;
+        the spawns stay reproducible, seeded from the slot's random state.
+        """
+        engine = self.engine
+        if engine is None:
+            return
+        game = self.to_game()
+        game.rng = random.Random(engine.random_state(self.slot))
+        engine.free(self.slot)
+        self.game, self.engine, self.slot = game, None, -1
+
+
+class SessionStore:
+    """Live games by session ID, least recently used first."""
+
+    def __init__(
+        self,
+        idle_timeout: float = SERVER_IDLE_TIMEOUT,
+        max_sessions: int = SERVER_MAX_SESSIONS,
+        use_vector_engine: bool = True,
+    ) -> None:
+        """
+        Args:
+            use_vector_engine: Keep games the vector engine supports in its
+                arrays instead of Game objects, which makes batch steps fast
+        """
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.use_vector_engine = use_vector_engine
+        # Reordered on every use, so the least recently used come first
+        self._sessions: OrderedDict[int, Session] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._engines: dict[int, VectorGames] = {}  # By board size
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, size: int, seed: int | None) -> tuple[int, Session]:
+        if len(self._sessions) >= self.max_sessions:
+            raise RequestError("too many sessions")
+        if self.use_vector_engine and vector_engine.is_available(size):
+            engine = self._engines.get(size)
+            if engine is None:
+                engine = self._engines[size] = VectorGames(size)
+            session = Session(size, engine=engine, slot=engine.allocate(seed))
+        else:
+            game = Game(size, rng=random.Random(seed))
+            game.start()
+            session = Session(size, game=game)
+        session.last_used = time.monotonic()
+        session_id = next(self._ids)
+        self._sessions[session_id] = session
+        return session_id, session
+
+    def get(self, session_id: Any) -> Session:
+        session = self.find(session_id)
+        if session is None:
+            raise RequestError("unknown session")
+        return session
+
+    def find(self, session_id: Any, now: float | None = None) -> Session | None:
+        """Look up a session and mark it used; None if there is no such session."""
+        session = self._sessions.get(session_id) if type(session_id) is int else None
+        if session is not None:
+            session.last_used = time.monotonic() if now is None else now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def find_many(self, session_ids: Sequence[int]) -> list[Session | None]:
+        """find() for a batch of sessions, sharing one timestamp."""
+        now = time.monotonic()
+        sessions = self._sessions
+        found = [sessions.get(session_id) for session_id in session_ids]
+        for session_id, session in zip(session_ids, found, strict=True):
+            if session is not None:
+                session.last_used = now
+                sessions.move_to_end(session_id)
+        return found
+
+    def _drop(self, session_id: int) -> None:
+        session = self._sessions.pop(session_id)
+        if session.engine is not None:
+            session.engine.free(session.slot)
+
+    def close(self, session_id: Any) -> None:
+        self.get(session_id)
+        self._drop(session_id)
+
+    def evict_idle(self, now: float) -> int:
+        """Drop sessions idle for longer than the timeout; returns how many."""
+        evicted = 0
+        sessions = self._sessions
+        # Oldest first, so stop at the first session still in use
+        while sessions:
+            session_id, session = next(iter(sessions.items()))
+            if now - session.last_used < self.idle_timeout:
+                break
+            self._drop(session_id)
+            evicted += 1
+        return evicted
+
+
+def parse_direction(request: dict[str, Any]) -> str:
+    direction = request.get("direction")
+    if isinstance(direction, str):
+        direction = MOVE_LETTERS.get(direction.upper(), direction.lower())
+        if direction in DIRECTIONS:
+            return direction
+    raise RequestError("invalid direction")
+
+
+def repeat_counts(values: Any) -> Any:
+    """For each element, how many times the same value occurred before it."""
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    positions = np.arange(len(values))
+    group_starts = np.maximum.accumulate(
+        np.where(np.r_[True, ordered[1:] != ordered[:-1]], positions, 0)
+    )
+    counts = np.empty(len(values), dtype=np.intp)
+    counts[order] = positions - group_starts
+    return counts
+
+
+class GameServer:
+    """Serves the JSON-lines protocol over any number of connections."""
+
+    def __init__(
+        self, store: SessionStore | None = None, hint_depth: int = SEARCH_DEPTH
+    ) -> None:
+        self.store = store if store is not None else SessionStore()
+        self.config: dict[str, Any] | None = None  # Loaded on first save to a slot
+        self.requests = 0
+        self.hint_depth = hint_depth
+        self.inference: InferenceService | None = None  # Started on the first hint
+        self.spectators: SpectatorHub | None = None  # Set by serve()
+        metrics.registry.gauge_function(
+            "server_sessions", "Live game sessions", lambda: len(self.store)
+        )
+        metrics.registry.counter_function(
+            "server_requests_total", "Requests answered", lambda: self.requests
+        )
+
+    def hints(self) -> InferenceService:
+        if self.inference is None:
+            self.inference = InferenceService(search_evaluator(self.hint_depth))
+            metrics.registry.histogram(
+                "hint_batch_size",
+                "Positions per hint evaluation batch",
+                histogram=self.inference.batch_sizes,
+            )
+            metrics.registry.histogram(
+                "hint_latency_seconds",
+                "Time from a hint request to its answer",
+                histogram=self.inference.latencies,
+            )
+        return self.inference
+
+    def close(self) -> None:
+        if self.inference is not None:
+            self.inference.close()
+        if self.spectators is not None:
+            self.spectators.close()
+
+    def publish_session(self, session_id: int) -> None:
+        """
+        Send a keyframe of a session to its spectators.
+
+        Engine games are moved to a Game object first, so their moves can
+        be sent as deltas from then on.
+        """
+        session = self.store.find(session_id)
+        if session is not None and self.spectators is not None:
+            session.leave_engine()
+            self.spectators.publish_keyframe(session_id, session.to_game())
+
+    def publish_move(self, session_id: int, session: Session) -> None:
+        """Send a move of a watched session to its spectators."""
+        spectators = self.spectators
+        if spectators is None:
+            return
+        if session.game is not None:
+            spectators.publish_move(session_id, session.game)
+        else:  # Not yet out of the engine, so no tile events; resend the board
+            spectators.publish_keyframe(session_id, session.to_game())
+
+    async def handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        op = request.get("op")
+        store = self.store
+
+        if op == "create":
+            size = request.get("size", DEFAULT_BOARD_SIZE)
+            seed = request.get("seed")
+            if not isinstance(size, int) or not 2 <= size <= SERVER_MAX_BOARD_SIZE:
+                raise RequestError("invalid size")
+            # Seeds are kept to 64 bits, as the vector engine uses them
+            if seed is not None and (
+                isinstance(seed, bool)
+                or not isinstance(seed, int)
+                or not -(1 << 63) <= seed < 1 << 64
+            ):
+                raise RequestError("invalid seed")
+            created, session = store.create(size, seed)
+            return {"session": created, "state": session.state()}
+
+        if op == "move":
+            session_id = request.get("session")
+            if type(session_id) is not int:
+                raise RequestError("unknown session")
+            session = store.get(session_id)
+            moved = session.move(parse_direction(request))
+            spectators = self.spectators
+            if moved and spectators is not None and spectators.watching(session_id):
+                self.publish_move(session_id, session)
+            return {"state": session.state(moved)}
+
+        if op == "state":
+            return {"state": store.get(request.get("session")).state()}
+
+        if op == "save":
+            game = store.get(request.get("session")).to_game()
+            slot = request.get("slot")
+            if slot is None:
+                return {
+                    "save": {
+                        "grid": game.board.grid,
+                        "score": game.score,
+                        "game_over": game.game_over,
+                        "endless_mode": game.endless_mode,
+                    }
+                }
+            if not isinstance(slot, int) or slot < 0:
+                raise RequestError("invalid slot")
+            if self.config is None:
+                self.config = load_config()  # For the save directory
+            # File I/O stays off the event loop
+            saved = await asyncio.to_thread(
+                save_game, game, slot, request.get("name"), self.config
+            )
+            return {"saved": saved}
+
+        if op == "hint":
+            state = store.get(request.get("session")).state()
+            result = await self.hints().evaluate(state["board"], state["score"])
+            return {
+                "hint": {
+                    "move": result.direction,
+                    "value": result.value,
+                    "legal": result.legal_mask,
+                }
+            }
+
+        if op == "close":
+            store.close(request.get("session"))
+            return {}
+
+        raise RequestError("unknown op")
+
+    def step_batch(self, session_ids: Sequence[int], directions: bytes) -> bytes:
+        """
+        Apply (session, direction index) pairs in order; returns the binary reply.
+
+        All sessions must have the same board size. Games in a vector engine
+        are stepped together, in one engine step unless a session repeats
+        in the batch; other games go through Game.step() one by one.
+        """
+        count = len(directions)
+        sessions = self.store.find_many(session_ids)
+        sizes = {session.size for session in sessions if session is not None}
+        if len(sizes) > 1:
+            return BATCH_REPLY_HEADER.pack(BINARY_MAGIC, STATUS_ERROR, 0, 0)
+        size = sizes.pop() if sizes else 0
+        cells = size * size
+        boards = bytearray(count * cells)
+        rewards = bytearray(4 * count)
+        flags = bytearray(count)
+
+        # Only kept while someone is watching, so other batches skip publishing
+        spectators = self.spectators
+        if spectators is not None and not spectators.watched:
+            spectators = None
+        engine: VectorGames | None = None  # One engine per board size
+        engine_rows: list[int] = []  # Batch indices of games in the engine
+        engine_sessions: list[Session] = []
+        direction_count = len(DIRECTIONS)
+        for index, session in enumerate(sessions):
+            direction = directions[index]
+            if session is None or direction >= direction_count:
+                flags[index] = FLAG_ERROR
+            elif session.engine is not None:
+                engine = session.engine
+                engine_rows.append(index)
+                engine_sessions.append(session)
+            elif session.game is not None:
+                game = session.game
+                score = game.score
+                moved = session.move(DIRECTIONS[direction])
+                boards[index * cells : (index + 1) * cells] = grid_to_ranks(
+                    game.board.grid
+                )
+                struct.pack_into("<I", rewards, 4 * index, game.score - score)
+                flags[index] = (
+                    (FLAG_MOVED if moved else 0)
+                    | (FLAG_GAME_OVER if game.game_over else 0)
+                    | (FLAG_WON if game.has_won() else 0)
+                )
+                # Every move, as a session may be stepped more than once
+                if (
+                    moved
+                    and spectators is not None
+                    and spectators.watching(session_ids[index])
+                ):
+                    self.publish_move(session_ids[index], session)
+
+        if engine is not None:
+            rows = np.array(engine_rows, dtype=np.intp)
+            slots = np.array(
+                [session.slot for session in engine_sessions], dtype=np.intp
+            )
+            moves = np.frombuffer(directions, dtype=np.uint8)[rows]
+            # Write the results straight into the reply buffers
+            board_view = np.frombuffer(boards, dtype=np.uint8).reshape(-1, size, size)
+            reward_view = np.frombuffer(rewards, dtype="<u4")
+            flag_view = np.frombuffer(flags, dtype=np.uint8)
+            repeat = repeat_counts(slots)
+            for round_index in range(int(repeat.max()) + 1):
+                # Each round steps a game at most once, keeping repeats in order
+                selected = repeat == round_index
+                round_rows, round_slots = rows[selected], slots[selected]
+                gained, moved = engine.step(round_slots, moves[selected])
+                board_view[round_rows] = engine.ranks[round_slots]
+                reward_view[round_rows] = gained
+                flag_view[round_rows] = (
+                    moved * FLAG_MOVED
+                    | engine.game_over[round_slots] * FLAG_GAME_OVER
+                    | engine.has_won(round_slots) * FLAG_WON
+                )
+
+        if spectators is not None:
+            # Only games watched before publish_session() moved them out of
+            # the engine; they are sent as keyframes, so once each is enough
+            moved_sessions = {
+                session_ids[index]: session
+                for index, session in zip(engine_rows, engine_sessions, strict=True)
+                if flags[index] & FLAG_MOVED
+            }
+            for session_id, session in moved_sessions.items():
+                if spectators.watching(session_id):
+                    self.publish_move(session_id, session)
+
+        header = BATCH_REPLY_HEADER.pack(BINARY_MAGIC, STATUS_OK, count, size)
+        return b"".join((header, boards, rewards, flags))
+
+    async def reply_binary(self, reader: asyncio.StreamReader) -> bytes:
+        """Read the rest of a binary request and answer it."""
+        header = BINARY_MAGIC.to_bytes(1, "little") + await reader.readexactly(
+            BATCH_REQUEST_HEADER.size - 1
+        )
+        _, op, count = BATCH_REQUEST_HEADER.unpack(header)
+        if op != OP_STEP_BATCH or count > SERVER_MAX_BATCH_PAIRS:
+            raise ConnectionError("unsupported binary request")
+        payload = await reader.readexactly(count * 5)
+        self.requests += 1
+        session_ids = array("I", payload[: count * 4])
+        if sys.byteorder == "big":
+            session_ids.byteswap()
+        return self.step_batch(session_ids, payload[count * 4 :])
+
+    async def reply(self, line: bytes) -> bytes:
+        """Answer one request line."""
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("request must be an object")
+            request_id = request.get("id")
+            response = await self.handle_request(request)
+            response["ok"] = True
+        except ValueError:
+            response = {"ok": False, "error": "invalid JSON"}
+        except RequestError as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception:
+            # A bug in one request shouldn't take the connection down with it
+            logger.exception("failed to answer request %r", line[:200])
+            response = {"ok": False, "error": "internal error"}
+        if request_id is not None:
+            response["id"] = request_id
+        return json.dumps(response, separators=(",", ":")).encode() + b"\n"
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        transport = writer.transport
+        magic = BINARY_MAGIC.to_bytes(1, "little")
+        try:
+            while True:
+                # The first byte tells binary requests from JSON lines
+                first = await reader.read(1)
+                if not first:
+                    break
+                if first == magic:
+                    writer.write(await self.reply_binary(reader))
+                    continue
+                line = first + await reader.readline()
+                if not line.strip():
+                    continue
+                writer.write(await self.reply(line))
+                # Replies to pipelined requests pile up in the transport and
+                # go out together; only wait once the buffer gets large
+                if transport.get_write_buffer_size() > SERVER_WRITE_BUFFER_LIMIT:
+                    await writer.drain()
+            await writer.drain()
+        except (
+            ConnectionError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ValueError,
+        ):
+            pass  # Disconnected, sent a line too long to buffer or a bad frame
+        finally:
+            writer.close()
+
+    async def evict_idle_sessions(self) -> None:
+        while True:
+            await asyncio.sleep(SERVER_EVICT_INTERVAL)
+            self.store.evict_idle(time.monotonic())
+
+
+async def serve(
+    unix_path: str | None = None,
+    host: str = SERVER_DEFAULT_HOST,
+    port: int = SERVER_DEFAULT_PORT,
+    server: GameServer | None = None,
+    spectate_path: str | None = None,
+) -> None:
+    """Run a game server until cancelled."""
+    server = server if server is not None else GameServer()
+    if spectate_path:
+        loop = asyncio.get_running_loop()
+        game_server = server
+
+        def request_keyframe(session_id: int) -> None:
+            # Called on the hub's thread; sessions belong to the event loop
+            loop.call_soon_threadsafe(game_server.publish_session, session_id)
+
+        server.spectators = SpectatorHub(spectate_path, request_keyframe)
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.unlink(unix_path)  # Left behind by a server that didn't exit cleanly
+        listener = await asyncio.start_unix_server(server.handle_connection, unix_path)
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port)
+
+    evictor = asyncio.create_task(server.evict_idle_sessions())
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        evictor.cancel()
+        server.close()
+        if unix_path and os.path.exists(unix_path):
+            os.unlink(unix_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+    parser.add_argument("--host", default=SERVER_DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_DEFAULT_PORT)
+    parser.add_argument(
+        "--no-vector-engine",
+        action="store_true",
+        help="keep every game in a Game object, even if NumPy is installed",
+    )
+    parser.add_argument(
+        "--hint-depth",
+        type=int,
+        default=SEARCH_DEPTH,
+        help="moves the hint search looks ahead",
+    )
+    parser.add_argument(
+        "--spectate",
+        metavar="PATH",
+        help="let spectators watch sessions through this Unix socket",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="write metrics in the Prometheus text format to this file",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="serve metrics at http://127.0.0.1:PORT/metrics",
+    )
+    args = parser.parse_args()
+    if args.hint_depth < 1:
+        parser.error("--hint-depth must be at least 1")
+    server = GameServer(
+        SessionStore(use_vector_engine=not args.no_vector_engine), args.hint_depth
+    )
+    exporter = None
+    if args.metrics_file or args.metrics_port is not None:
+        exporter = metrics.MetricsExporter(args.metrics_file, args.metrics_port)
+    try:
+        asyncio.run(serve(args.unix, args.host, args.port, server, args.spectate))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if exporter is not None:
+            exporter.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,510 @@
+"""
+Spectator streaming for 2048-CLI.
+A SpectatorHub broadcasts running games to any number of local spectators
+over a Unix socket. A spectator sends the number of the stream it wants to
+watch as a line of text, gets a keyframe of the whole board and then one
+delta per move, made of the move's tile events (slides, merges and spawns).
+
+Publishing only queues the frame; a background thread keeps a copy of each
+stream, encodes every frame once and sends it to all of the stream's
+spectators, at most once per SPECTATE_FLUSH_INTERVAL. A spectator that
+falls more than SPECTATE_CLIENT_BUFFER_LIMIT bytes behind is sent a new
+keyframe instead of the moves it missed. Spectators are disconnected when
+the hub closes, once they have been sent everything published.
+
+Frames are length-prefixed like protocol.format_binary_state():
+    keyframe: <u8 1><u32 stream><u64 score><u8 flags><u16 size>
+              <size * size ranks><size * size u32 tile IDs>
+    delta:    <u8 2><u32 stream><u64 score><u8 flags><u32 count>
+              <count events: u8 kind, u16 src row, col, u16 dst row, col,
+               u8 rank, u32 tile ID, u32 merged tile ID>
+"""
+
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from core.constants import (
+    SPECTATE_CLIENT_BUFFER_LIMIT,
+    SPECTATE_CLOSE_TIMEOUT,
+    SPECTATE_FLUSH_INTERVAL,
+)
+from game.board import Board
+from game.events import MoveEvent, MoveEventKind
+from game.game import Game
+
+from .protocol import FLAG_GAME_OVER, FRAME_LENGTH, grid_to_ranks, ranks_to_grid
+
+FRAME_KEYFRAME = 1
+FRAME_DELTA = 2
+FRAME_HEADER = struct.Struct("<BIQB")
+KEYFRAME_SIZE = struct.Struct("<H")
+DELTA_COUNT = struct.Struct("<I")
+EVENT = struct.Struct("<BHHHHBII")
+
+_EVENT_KINDS = list(MoveEventKind)
+_EVENT_CODES = {kind: code for code, kind in enumerate(_EVENT_KINDS)}
+
+
+class SpectatorFrame(NamedTuple):
+    """One update of a stream: a keyframe if events is None, else a delta."""
+
+    stream: int
+    score: int
+    game_over: bool
+    size: int
+    grid: list[list[int]] | None = None  # Keyframes only
+    ids: list[list[int]] | None = None
+    events: list[MoveEvent] | None = None  # Deltas only
+
+
+def keyframe(stream: int, game: Any) -> SpectatorFrame:
+    """A keyframe of a game's current board."""
+    board = game.board
+    return SpectatorFrame(
+        stream,
+        game.score,
+        game.game_over,
+        board.size,
+        [row[:] for row in board.grid],
+        [row[:] for row in board.ids],
+    )
+
+
+def delta(stream: int, game: Any) -> SpectatorFrame:
+    """A delta of a game's last move."""
+    return SpectatorFrame(
+        stream, game.score, game.game_over, game.board.size, events=game.last_events
+    )
+
+
+def encode_frame(frame: SpectatorFrame) -> bytes:
+    """A frame as bytes, length prefix included."""
+    header = FRAME_HEADER.pack(
+        FRAME_DELTA if frame.events is not None else FRAME_KEYFRAME,
+        frame.stream,
+        frame.score,
+        FLAG_GAME_OVER if frame.game_over else 0,
+    )
+    if frame.events is None:
+        if frame.grid is None or frame.ids is None:
+            raise ValueError("keyframe without a board")
+        cells = frame.size * frame.size
+        body = b"".join(
+            (
+                KEYFRAME_SIZE.pack(frame.size),
+                grid_to_ranks(frame.grid),
+                struct.pack(f"<{cells}I", *(i for row in frame.ids for i in row)),
+            )
+        )
+    else:
+        pack = EVENT.pack
+        body = DELTA_COUNT.pack(len(frame.events)) + b"".join(
+            pack(
+                _EVENT_CODES[event.kind],
+                *event.src,
+                *event.dst,
+                event.value.bit_length() - 1,
+                event.tile_id,
+                event.merged_id,
+            )
+            for event in frame.events
+        )
+    return FRAME_LENGTH.pack(len(header) + len(body)) + header + body
+
+
+def decode_frame(payload: bytes) -> SpectatorFrame:
+    """
+    Decode a frame payload (without its length prefix). Deltas don't carry
+    the board size, so theirs is 0.
+
+    Raises:
+        ValueError: If the payload is truncated or of an unknown type
+    """
+    try:
+        kind, stream, score, flags = FRAME_HEADER.unpack_from(payload)
+        offset = FRAME_HEADER.size
+        game_over = bool(flags & FLAG_GAME_OVER)
+        if kind == FRAME_KEYFRAME:
+            (size,) = KEYFRAME_SIZE.unpack_from(payload, offset)
+            offset += KEYFRAME_SIZE.size
+            cells = size * size
+            ranks = payload[offset : offset + cells]
+            ids = struct.unpack_from(f"<{cells}I", payload, offset + cells)
+            if len(ranks) < cells:
+                raise ValueError("truncated frame")
+            return SpectatorFrame(
+                stream,
+                score,
+                game_over,
+                size,
+                ranks_to_grid(ranks, size),
+                [list(ids[row * size : (row + 1) * size]) for row in range(size)],
+            )
+        if kind == FRAME_DELTA:
+            (count,) = DELTA_COUNT.unpack_from(payload, offset)
+            offset += DELTA_COUNT.size
+            events = []
+            for _ in range(count):
+                code, src_r, src_c, dst_r, dst_c, rank, tile_id, merged_id = (
+                    EVENT.unpack_from(payload, offset)
+                )
+                offset += EVENT.size
+                events.append(
+                    MoveEvent(
+                        _EVENT_KINDS[code],
+                        tile_id,
+                        (src_r, src_c),
+                        (dst_r, dst_c),
+                        1 << rank,
+                        merged_id,
+                    )
+                )
+            return SpectatorFrame(stream, score, game_over, 0, events=events)
+    except (struct.error, IndexError) as e:
+        raise ValueError("truncated frame") from e
+    raise ValueError("unknown frame type")
+
+
+def split_frames(buffer: bytearray) -> list[bytes]:
+    """Take the payloads of all complete frames off the front of buffer."""
+    payloads = []
+    offset = 0
+    while len(buffer) - offset >= FRAME_LENGTH.size:
+        (length,) = FRAME_LENGTH.unpack_from(buffer, offset)
+        end = offset + FRAME_LENGTH.size + length
+        if end > len(buffer):
+            break
+        payloads.append(bytes(buffer[offset + FRAME_LENGTH.size : end]))
+        offset = end
+    del buffer[:offset]
+    return payloads
+
+
+def apply_frame(game: Game, frame: SpectatorFrame) -> None:
+    """
+    Bring a spectator's copy of a game up to date with a frame.
+
+    Raises:
+        ValueError: If a keyframe has no board, or a delta comes for a game
+            without a dense Board to apply it to
+    """
+    if frame.events is None:
+        if frame.grid is None or frame.ids is None:
+            raise ValueError("keyframe without a board")
+        board = Board(frame.size)
+        board.set_grid(frame.grid)
+        board.ids = frame.ids
+        game.board = board
+        game.score = frame.score
+        game.last_events = []
+    else:
+        if not isinstance(game.board, Board):
+            raise ValueError("deltas can only be applied to a dense board")
+        game.board.apply_events(frame.events)
+        game._add_score(frame.score - game.score)  # Also feeds the score history
+        game.last_events = frame.events
+    game.game_over = frame.game_over
+
+
+class _Spectator:
+    """A connected spectator and the frames still to be sent to it."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.stream: int | None = None
+        self.inbox = bytearray()
+        self.outbox: deque[bytes | memoryview] = deque()
+        self.queued = 0  # Bytes in outbox
+        self.partial = False  # outbox[0] has been partly sent
+
+
+class SpectatorHub:
+    """
+    Broadcasts game streams to spectators connected to a Unix socket.
+
+    publish() and its helpers may be called from any thread and only queue
+    the frame; everything else happens on the hub's own thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_subscribe: Callable[[int], None] | None = None,
+        flush_interval: float = SPECTATE_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            on_subscribe: For publishers that only publish watched streams
+                (see watching()). It is called on the hub thread when a
+                stream gets its first spectator, and should have a keyframe
+                of it published; the hub forgets streams nobody watches.
+                Without it, the hub keeps every stream it has been sent.
+        """
+        self.path = path
+        self.on_subscribe = on_subscribe
+        self.flush_interval = flush_interval
+        self._frames: deque[SpectatorFrame] = deque()
+        self._signalled = False  # A wake byte is on its way to the hub thread
+        self._closing = False
+        self._close_timeout = SPECTATE_CLOSE_TIMEOUT
+        self._games: dict[int, Game] = {}  # The hub's copy of every stream
+        self._watchers: dict[int, set[_Spectator]] = {}
+        if os.path.exists(path):
+            os.unlink(path)  # Left behind by a hub that didn't exit cleanly
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self._thread = threading.Thread(target=self._run, name="spectate", daemon=True)
+        self._thread.start()
+
+    def publish(self, frame: SpectatorFrame) -> None:
+        self._frames.append(frame)
+        if not self._signalled:
+            self._signalled = True
+            try:
+                self._wake_writer.send(b"\0")
+            except OSError:
+                pass  # The hub is closed, or already has wake bytes to read
+
+    def publish_keyframe(self, stream: int, game: Any) -> None:
+        """Publish a game's whole board, e.g. when it starts or is loaded."""
+        self.publish(keyframe(stream, game))
+
+    def publish_move(self, stream: int, game: Any) -> None:
+        """Publish the last move of a game."""
+        self.publish(delta(stream, game))
+
+    def watching(self, stream: int) -> bool:
+        """Whether anyone watches a stream."""
+        return stream in self._watchers
+
+    @property
+    def watched(self) -> bool:
+        """Whether anyone watches any stream."""
+        return bool(self._watchers)
+
+    @property
+    def spectators(self) -> int:
+        return sum(map(len, list(self._watchers.values())))
+
+    def close(self, timeout: float = SPECTATE_CLOSE_TIMEOUT) -> None:
+        """
+        Send spectators what has been published, waiting up to timeout
+        seconds for slow ones, then disconnect them and stop the hub thread.
+        """
+        if self._closing:
+            return
+        self._close_timeout = timeout
+        self._closing = True
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:
+            pass
+        self._thread.join()
+        self._wake_reader.close()
+        self._wake_writer.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __enter__(self) -> "SpectatorHub":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        selector = selectors.DefaultSelector()
+        selector.register(self._listener, selectors.EVENT_READ)
+        selector.register(self._wake_reader, selectors.EVENT_READ)
+        flush_due = False
+        next_flush = 0.0
+        try:
+            while not self._closing:
+                timeout = None
+                if flush_due:
+                    timeout = max(0.0, next_flush - time.monotonic())
+                for key, mask in selector.select(timeout):
+                    if key.fileobj is self._listener:
+                        self._accept(selector)
+                    elif key.fileobj is self._wake_reader:
+                        try:
+                            self._wake_reader.recv(4096)
+                        except BlockingIOError:
+                            pass
+                        flush_due = True
+                    else:
+                        self._service(selector, key.data, mask)
+                # Batch what arrives within a flush interval into one send
+                now = time.monotonic()
+                if flush_due and now >= next_flush:
+                    flush_due = False
+                    next_flush = now + self.flush_interval
+                    self._flush(selector)
+
+            selector.unregister(self._listener)
+            selector.unregister(self._wake_reader)
+            self._flush(selector)
+            deadline = time.monotonic() + self._close_timeout
+            while any(key.data.outbox for key in selector.get_map().values()):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                for key, mask in selector.select(timeout):
+                    self._service(selector, key.data, mask)
+        finally:
+            for key in list(selector.get_map().values()):
+                if isinstance(key.data, _Spectator):
+                    key.data.sock.close()
+            selector.close()
+            self._listener.close()
+
+    def _service(
+        self, selector: selectors.BaseSelector, spectator: _Spectator, mask: int
+    ) -> None:
+        if mask & selectors.EVENT_READ:
+            self._receive(selector, spectator)
+        closed = spectator.sock.fileno() == -1
+        if mask & selectors.EVENT_WRITE and not closed:
+            self._send(selector, spectator)
+
+    def _accept(self, selector: selectors.BaseSelector) -> None:
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        spectator = _Spectator(sock)
+        selector.register(sock, selectors.EVENT_READ, spectator)
+
+    def _receive(self, selector: selectors.BaseSelector, spectator: _Spectator) -> None:
+        try:
+            data = spectator.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._disconnect(selector, spectator)
+            return
+        spectator.inbox += data
+        while b"\n" in spectator.inbox:
+            line, _, rest = bytes(spectator.inbox).partition(b"\n")
+            spectator.inbox[:] = rest
+            try:
+                stream = int(line)
+            except ValueError:
+                self._disconnect(selector, spectator)
+                return
+            self._subscribe(selector, spectator, stream)
+            if spectator.sock.fileno() == -1:
+                return  # Disconnected while sending the keyframe
+
+    def _subscribe(
+        self, selector: selectors.BaseSelector, spectator: _Spectator, stream: int
+    ) -> None:
+        self._unsubscribe(spectator)
+        spectator.stream = stream
+        watchers = self._watchers.get(stream)
+        first = watchers is None
+        if watchers is None:
+            watchers = self._watchers[stream] = set()
+        watchers.add(spectator)
+        game = self._games.get(stream)
+        if game is not None:
+            self._queue(spectator, encode_frame(keyframe(stream, game)))
+            self._send(selector, spectator)
+        if first and self.on_subscribe is not None:
+            self.on_subscribe(stream)
+
+    def _unsubscribe(self, spectator: _Spectator) -> None:
+        stream = spectator.stream
+        watchers = self._watchers.get(stream) if stream is not None else None
+        if stream is None or watchers is None:
+            return
+        watchers.discard(spectator)
+        if not watchers:
+            del self._watchers[stream]
+            if self.on_subscribe is not None:
+                # Its publisher stops sending it, so the copy would go stale
+                self._games.pop(stream, None)
+
+    def _disconnect(
+        self, selector: selectors.BaseSelector, spectator: _Spectator
+    ) -> None:
+        self._unsubscribe(spectator)
+        selector.unregister(spectator.sock)
+        spectator.sock.close()
+
+    def _flush(self, selector: selectors.BaseSelector) -> None:
+        # Clear the flag before taking frames, so none can be left unsignalled
+        self._signalled = False
+        encoded: dict[int, list[bytes]] = {}
+        while self._frames:
+            frame = self._frames.popleft()
+            game = self._games.get(frame.stream)
+            if frame.events is None:
+                if game is None:
+                    if self.on_subscribe is not None and not self.watching(
+                        frame.stream
+                    ):
+                        continue  # Its spectator left while it was queued
+                    game = self._games[frame.stream] = Game(frame.size, sparse=False)
+            elif game is None:
+                continue  # No keyframe yet to apply it to
+            apply_frame(game, frame)
+            if frame.stream in self._watchers:
+                encoded.setdefault(frame.stream, []).append(encode_frame(frame))
+
+        for stream, frames in encoded.items():
+            data = b"".join(frames)
+            for spectator in list(self._watchers.get(stream, ())):
+                self._queue(spectator, data)
+                self._send(selector, spectator)
+
+    def _queue(self, spectator: _Spectator, data: bytes) -> None:
+        if spectator.queued + len(data) > SPECTATE_CLIENT_BUFFER_LIMIT:
+            # Too far behind: skip to the current board instead
+            kept = spectator.outbox[0] if spectator.partial else b""
+            spectator.outbox.clear()
+            if kept:
+                spectator.outbox.append(kept)
+            spectator.queued = len(kept)
+            stream = spectator.stream
+            assert stream is not None  # Only subscribed spectators get frames
+            data = encode_frame(keyframe(stream, self._games[stream]))
+        spectator.outbox.append(data)
+        spectator.queued += len(data)
+
+    def _send(self, selector: selectors.BaseSelector, spectator: _Spectator) -> None:
+        outbox = spectator.outbox
+        try:
+            while outbox:
+                sent = spectator.sock.sendmsg(list(outbox)[:64])
+                spectator.queued -= sent
+                while sent and sent >= len(outbox[0]):
+                    sent -= len(outbox.popleft())
+                spectator.partial = sent > 0
+                if sent:
+                    outbox[0] = memoryview(outbox[0])[sent:]
+                    break
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._disconnect(selector, spectator)
+            return
+        events = selectors.EVENT_READ
+        if outbox:
+            events |= selectors.EVENT_WRITE
+        if selector.get_key(spectator.sock).events != events:
+            selector.modify(spectator.sock, events, spectator)
@@ -1,26 +1,64 @@
+import argparse
 import curses
-import random
+import sys
+from typing import Any
 
-from core.config import get_key_codes, load_config
+from core.config import get_autosave_config, get_key_codes, load_config
 from core.constants import (
-    BASE_CHANCE_OF_4,
-    CHANCE_INCREASE_RATE,
-    CHANCE_SCORE_INTERVAL,
-    INITIAL_TILE_VALUE,
-    SCORE_THRESHOLD_FOR_SPECIAL_TILES,
-    SPECIAL_TILE_VALUE,
+    AUTOPLAY_MAX_FPS,
+    DEFAULT_BOARD_SIZE,
+    PERSISTENCE_CLOSE_TIMEOUT,
+    SAVE_MENU_FLUSH_TIMEOUT,
+    SEARCH_DEPTH,
 )
-from core.save_load import load_game, save_game
-from game.game import Game
+from core.i18n import t
+from core.metrics import MetricsExporter
+from core.persistence import Autosaver, PersistenceWorker
+from core.save_load import load_game, save_game, snapshot_game
+from game.game import Afterstate, Game
+from headless.pipe import run_pipe
+from headless.protocol import STATE_FORMATTERS
+from headless.spectate import SpectatorHub
 from ui.settings_menu import show_settings_menu
+from ui.autoplay import run_autoplay
+from ui.input import drain_pending_keys, wait_for_key
 from ui.menu import show_load_menu, show_save_menu, show_start_menu
-from ui.modern_display import draw_board, init_colors
-
-AUTO_SAVE_SLOT = 0
-MANUAL_SAVE_SLOTS = 5
+from ui.modern_display import (
+    draw_board,
+    get_animation_manager,
+    get_frame_timeout,
+    init_colors,
+    invalidate_display,
+    invalidate_layout,
+    pan_viewport,
+    prerender_board,
+    queue_move_animations,
+    toggle_compact_board,
+)
+from ui.spectator import run_spectator
+from ui.speculation import MoveSpeculator
+from ui.viewport import COMPACT_TOGGLE_KEY, PAN_KEYS
 
 
-def main(stdscr: curses.window) -> None:
+def main(
+    stdscr: curses.window,
+    board_size: int = DEFAULT_BOARD_SIZE,
+    autoplay: dict[str, Any] | None = None,
+    spectators: SpectatorHub | None = None,
+    watch: tuple[str, int] | None = None,
+    persistence: PersistenceWorker | None = None,
+) -> None:
+    """
+    Args:
+        autoplay: Options for run_autoplay() from the command line; if given,
+            autoplay starts straight away and the program ends with it
+        spectators: Hub to broadcast every game to, as stream 0
+        watch: Socket path and stream to watch in spectator mode instead
+            of playing
+        persistence: Worker that saves in the background and autosaves the
+            game; without one, saves are written directly and there is no
+            autosave
+    """
     curses.curs_set(0)
 
     # Load configuration
@@ -33,6 +71,28 @@ def main(stdscr: curses.window) -> None:
     init_colors()  # Modern display uses fixed modern theme
     key_map, action_keys = get_key_codes(config)
 
+    # Precomputes the next states while the loop waits for input
+    speculator = MoveSpeculator(prerender_board)
+
+    if watch is not None:
+        run_spectator(stdscr, config, *watch)
+        return
+
+    if autoplay is not None:
+        run_autoplay(stdscr, config, board_size, spectators=spectators, **autoplay)
+        return
+
+    autosaver = None
+    autosave = get_autosave_config(config)
+    if persistence is not None and autosave["enabled"]:
+        autosaver = Autosaver(
+            persistence,
+            config,
+            t("game.autosave"),
+            every_moves=autosave["every_moves"],
+            interval=autosave["interval"],
+        )
+
     while True:  # Main application loop
         # Game start menu
         choice = show_start_menu(stdscr, config)
@@ -46,71 +106,286 @@ def main(stdscr: curses.window) -> None:
             initialize_i18n_from_config(config)
             continue
 
-        game = Game()
+        if choice == "autoplay":
+            run_autoplay(stdscr, config, board_size, spectators=spectators)
+            continue
+
+        game = Game(board_size)
 
         if choice == "new":
             game.start()
         elif choice == "load":
-            slot = show_load_menu(stdscr, config)
-            if slot is None or not load_game(game, slot, config):
+            slot = show_load_menu(stdscr, config, saving_slots(persistence))
+            if slot is None or not load_slot(game, slot, config, persistence):
                 # Fallback to new game if load fails or user quits load menu
                 game.start()
+        if spectators is not None:
+            spectators.publish_keyframe(0, game)
+        if autosaver is not None:
+            autosaver.reset()
 
         # Game loop
         return_to_title = False
+        board_frame = None
+        invalidate_display()  # Menus drew over the screen through curses
+        invalidate_layout()  # Settings may have changed language or keys
         while not game.game_over and not return_to_title:
-            draw_board(stdscr, game, config)
-            key = stdscr.getch()
+            draw_board(stdscr, game, config, board_frame)
+            board_frame = None
 
-            if key in action_keys.get("quit", []):  # Quit application
-                return
+            speculator.prepare(game)
+            key = wait_for_key(stdscr, get_frame_timeout(), speculator.step)
 
-            if key in action_keys.get("return_to_title", []):  # Return to title
-                return_to_title = True
+            if key == -1:  # Frame interval elapsed, draw the next animation frame
                 continue
 
-            if key in action_keys.get("save", []):  # Manual save
-                result = show_save_menu(stdscr)
-                if result is not None:
-                    slot, name = result
-                    success = save_game(game, slot, name, config)
-                    # TODO: Show save confirmation/error message to user
-                    # For now, we silently handle the success/failure
-                continue
+            # Coalesce key repeat: apply everything already typed, render once
+            moves_applied = 0
+            for pending in [key, *drain_pending_keys(stdscr)]:
+                if pending == curses.KEY_RESIZE:  # Terminal size changed
+                    invalidate_layout()
+                    invalidate_display()
+                    continue
 
-            if key in action_keys.get("load", []):  # Load game
-                slot = show_load_menu(stdscr, config)
-                if slot is not None and load_game(game, slot, config):
-                    # Game loaded successfully, continue with loaded state
-                    pass
-                continue
+                if pending in action_keys.get("quit", []):  # Quit application
+                    if autosaver is not None:
+                        autosaver.save(game)
+                    return
 
-            if key in action_keys.get("change_theme", []):  # Theme cycling disabled
-                continue  # Skip - modern design uses fixed theme
-
-            if key in key_map:
-                direction = key_map[key]
-                if game.move(direction):
-                    # Add new tile based on score
-                    score = game.score
-                    if score < SCORE_THRESHOLD_FOR_SPECIAL_TILES:
-                        game.board.place_new_tile(INITIAL_TILE_VALUE)
-                    else:
-                        chance_of_4 = min(
-                            BASE_CHANCE_OF_4,
-                            (score - SCORE_THRESHOLD_FOR_SPECIAL_TILES)
-                            // CHANCE_SCORE_INTERVAL
-                            * CHANCE_INCREASE_RATE,
-                        )
-                        if random.random() < chance_of_4:
-                            game.board.place_new_tile(SPECIAL_TILE_VALUE)
+                if pending in action_keys.get("return_to_title", []):  # Return to title
+                    return_to_title = True
+                    break
+
+                # Menus read their own input, so keys typed after them are dropped
+                if pending in action_keys.get("save", []):  # Manual save
+                    result = show_save_menu(stdscr, config, saving_slots(persistence))
+                    if result is not None:
+                        slot, name = result
+                        if persistence is not None:  # Written in the background
+                            persistence.submit(slot, snapshot_game(game, name), config)
                         else:
-                            game.board.place_new_tile(INITIAL_TILE_VALUE)
+                            save_game(game, slot, name, config)
+                        # TODO: Show save confirmation/error message to user
+                        # For now, we silently handle the success/failure
+                    invalidate_display()
+                    break
+
+                if pending in action_keys.get("load", []):  # Load game
+                    slot = show_load_menu(stdscr, config, saving_slots(persistence))
+                    if slot is not None and load_slot(game, slot, config, persistence):
+                        # Game loaded successfully, continue with loaded state
+                        board_frame = None
+                        if spectators is not None:
+                            spectators.publish_keyframe(0, game)
+                        if autosaver is not None:
+                            autosaver.reset()
+                    invalidate_display()
+                    break
+
+                if pending in action_keys.get("change_theme", []):  # Theme cycling disabled
+                    continue  # Skip - modern design uses fixed theme
 
-                # Check for game over
-                if game.is_game_over():
-                    game.game_over = True
+                if pending in key_map:
+                    direction = key_map[pending]
+                    precomputed = speculator.take(game, direction)
+                    afterstate = precomputed[0] if precomputed else None
+                    if apply_move(game, direction, afterstate):
+                        moves_applied += 1
+                        board_frame = precomputed[1] if precomputed else None
+                        if spectators is not None:
+                            spectators.publish_move(0, game)
+                        if autosaver is not None:
+                            autosaver.moved(game)
+                    if game.game_over:
+                        break
+                elif pending in PAN_KEYS:  # Scroll a board larger than the screen
+                    pan_viewport(*PAN_KEYS[pending])
+                elif pending == COMPACT_TOGGLE_KEY:
+                    toggle_compact_board()
+
+            # Intermediate states of a burst are never shown, so don't animate them
+            animation_manager = get_animation_manager()
+            if moves_applied > 1 and animation_manager:
+                animation_manager.skip_all_animations()
+            elif moves_applied == 1:
+                queue_move_animations(game.last_events)
+
+        if autosaver is not None:  # Game over or back to the title
+            autosaver.save(game)
+
+
+def apply_move(
+    game: Game, direction: str, afterstate: Afterstate | None = None
+) -> bool:
+    """Apply a move, spawn the next tile and update game over state."""
+    if afterstate is None:
+        return game.step(direction)
+
+    # Precomputed while idle, spawn included
+    moved = game.commit_afterstate(afterstate)
+
+    # Check for game over
+    if game.is_game_over():
+        game.game_over = True
+    return moved
+
+
+def saving_slots(persistence: PersistenceWorker | None) -> set[int]:
+    """
+    Slots whose saves are still being written, for the save menus to mark.
+    Saves just made get a moment to land first, so they are usually listed.
+    """
+    if persistence is None:
+        return set()
+    persistence.flush(SAVE_MENU_FLUSH_TIMEOUT)
+    return persistence.pending_slots()
+
+
+def load_slot(
+    game: Game,
+    slot: int,
+    config: dict[str, Any],
+    persistence: PersistenceWorker | None = None,
+) -> bool:
+    """load_game(), waiting first if the slot's latest save isn't written yet."""
+    if persistence is not None and slot in persistence.pending_slots():
+        persistence.flush(PERSISTENCE_CLOSE_TIMEOUT)
+    return load_game(game, slot, config)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="2048 in the terminal")
+    parser.add_argument(
+        "--board-size",
+        type=int,
+        default=DEFAULT_BOARD_SIZE,
+        help="tiles per side; boards larger than the terminal scroll",
+    )
+    pipe = parser.add_argument_group("pipe mode")
+    pipe.add_argument(
+        "--pipe",
+        nargs="?",
+        const="text",
+        choices=sorted(STATE_FORMATTERS),
+        help="play without a terminal: read moves (L/R/U/D or JSON lines) "
+        "from stdin and write states to stdout in this format (default: text)",
+    )
+    pipe.add_argument(
+        "--seed", type=int, help="random seed for tile spawns in pipe mode"
+    )
+    autoplay = parser.add_argument_group("autoplay")
+    autoplay.add_argument(
+        "--autoplay",
+        action="store_true",
+        help="let the built-in player play, starting a new game after each one",
+    )
+    autoplay.add_argument(
+        "--turbo",
+        action="store_true",
+        help="play as fast as possible, redrawing only now and then",
+    )
+    autoplay.add_argument(
+        "--render-every",
+        type=int,
+        default=1,
+        metavar="N",
+        help="in turbo mode, redraw at most once every N moves",
+    )
+    autoplay.add_argument(
+        "--max-fps",
+        type=float,
+        default=AUTOPLAY_MAX_FPS,
+        help="in turbo mode, redraw at most this many times a second (0: no limit)",
+    )
+    autoplay.add_argument(
+        "--depth",
+        type=int,
+        default=SEARCH_DEPTH,
+        help="moves the built-in player looks ahead",
+    )
+    spectate = parser.add_argument_group("spectators")
+    spectate.add_argument(
+        "--spectate",
+        metavar="PATH",
+        help="broadcast the game (interactive or autoplay) to spectators "
+        "connecting to this Unix socket",
+    )
+    spectate.add_argument(
+        "--watch",
+        metavar="PATH",
+        help="watch a game broadcast on this Unix socket instead of playing",
+    )
+    spectate.add_argument(
+        "--stream",
+        type=int,
+        default=0,
+        help="stream to watch: 0 for a player's game, or a game server "
+        "session ID (default: 0)",
+    )
+    metrics = parser.add_argument_group("metrics")
+    metrics.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="write metrics in the Prometheus text format to this file, "
+        "rewritten every few seconds and on exit",
+    )
+    metrics.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="serve metrics at http://127.0.0.1:PORT/metrics",
+    )
+    args = parser.parse_args()
+    if args.board_size < 2:
+        parser.error("--board-size must be at least 2")
+    if args.render_every < 1:
+        parser.error("--render-every must be at least 1")
+    if args.max_fps < 0:
+        parser.error("--max-fps must not be negative")
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+    if args.stream < 0:
+        parser.error("--stream must not be negative")
+    return args
 
 
 if __name__ == "__main__":
-    curses.wrapper(main)
+    args = parse_args()
+    exporter = None
+    if args.metrics_file or args.metrics_port is not None:
+        exporter = MetricsExporter(args.metrics_file, args.metrics_port)
+    if args.pipe:
+        try:
+            run_pipe(
+                sys.stdin.buffer,
+                sys.stdout.buffer,
+                args.pipe,
+                args.board_size,
+                args.seed,
+            )
+        finally:
+            if exporter is not None:
+                exporter.close()
+        sys.exit(0)
+
+    autoplay_options = None
+    if args.autoplay:
+        autoplay_options = {
+            "turbo": args.turbo,
+            "render_every": args.render_every,
+            "max_fps": args.max_fps,
+            "depth": args.depth,
+        }
+    watch = (args.watch, args.stream) if args.watch else None
+    spectators = SpectatorHub(args.spectate) if args.spectate else None
+    persistence = PersistenceWorker()
+    try:
+        curses.wrapper(
+            main, args.board_size, autoplay_options, spectators, watch, persistence
+        )
+    finally:
+        persistence.close()  # Pending saves are written after the screen is restored
+        if spectators is not None:
+            spectators.close()
+        if exporter is not None:
+            exporter.close()
@@ -0,0 +1,265 @@
+"""
+Gym-style environments for 2048-CLI.
+GameEnv plays one Game; VectorEnv plays many games together on the vector
+engine's arrays, stepping all of them with a fixed set of array operations
+that write into buffers allocated up front.
+
+Observations are tile ranks (log2 of the value, 0 for empty cells) as
+uint8 arrays, and actions are indices into DIRECTIONS. Both follow the
+Gymnasium API: reset() returns (observation, info) and step() returns
+(observation, reward, terminated, truncated, info).
+
+NumPy is required here, although the rest of the game runs without it.
+"""
+
+import math
+import random
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from ai.expectimax import legal_mask
+from core.constants import DEFAULT_BOARD_SIZE
+from game import vector_engine
+from game.game import DIRECTIONS, Game
+from game.vector_engine import BatchStepper, VectorGames
+
+try:
+    import numpy as np
+except ImportError:  # Checked when an environment is created
+    np = None  # type: ignore[assignment]
+
+ACTION_COUNT = len(DIRECTIONS)
+
+
+@dataclass(frozen=True)
+class RewardShaping:
+    """How the points of a move turn into a reward."""
+
+    log_scale: bool = False  # Reward log2(1 + points) instead of the points
+    invalid_move_penalty: float = 0.0  # Subtracted when a move changes nothing
+    game_over_penalty: float = 0.0  # Subtracted on the move that ends the game
+
+    def reward(self, points: int, moved: bool, game_over: bool) -> float:
+        reward = math.log2(1 + points) if self.log_scale else float(points)
+        if not moved:
+            reward -= self.invalid_move_penalty
+        if game_over:
+            reward -= self.game_over_penalty
+        return reward
+
+
+class EnvBuffers(NamedTuple):
+    """The arrays a VectorEnv keeps its games and results in, one row per game."""
+
+    observations: Any  # (num_envs, size, size) uint8 tile ranks
+    scores: Any  # int64
+    rewards: Any  # float32
+    terminated: Any  # bool
+    truncated: Any  # bool
+    action_mask: Any  # (num_envs, ACTION_COUNT) bool
+
+    @classmethod
+    def allocate(cls, num_envs: int, size: int) -> "EnvBuffers":
+        return cls(
+            np.zeros((num_envs, size, size), dtype=np.uint8),
+            np.zeros(num_envs, dtype=np.int64),
+            np.zeros(num_envs, dtype=np.float32),
+            np.zeros(num_envs, dtype=bool),
+            np.zeros(num_envs, dtype=bool),
+            np.zeros((num_envs, ACTION_COUNT), dtype=bool),
+        )
+
+    def rows(self, start: int, stop: int) -> "EnvBuffers":
+        """Views of the rows of games start to stop."""
+        return EnvBuffers(*(array[start:stop] for array in self))
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("the environments need NumPy (pip install numpy)")
+
+
+class GameEnv:
+    """
+    One game of any size behind a Gym-style API.
+
+    The observation is one (size, size) array that each call overwrites.
+    Unlike VectorEnv, a finished game stays finished until reset().
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_BOARD_SIZE,
+        shaping: RewardShaping | None = None,
+        action_masks: bool = False,
+    ) -> None:
+        """
+        Args:
+            action_masks: Put the legal moves in info["action_mask"]
+        """
+        _require_numpy()
+        self.size = size
+        self.shaping = shaping or RewardShaping()
+        self.action_masks = action_masks
+        self.game = Game(size)
+        self.observation = np.zeros((size, size), dtype=np.uint8)
+        self.action_mask = np.zeros(ACTION_COUNT, dtype=bool)
+        self.info: dict[str, Any] = {"score": 0}
+        if action_masks:
+            self.info["action_mask"] = self.action_mask
+
+    def reset(self, seed: int | None = None) -> tuple[Any, dict[str, Any]]:
+        self.game = Game(self.size, rng=random.Random(seed))
+        self.game.start()
+        self._update()
+        return self.observation, self.info
+
+    def step(self, action: int) -> tuple[Any, float, bool, bool, dict[str, Any]]:
+        game = self.game
+        score = game.score
+        moved = False if game.game_over else game.step(DIRECTIONS[action])
+        reward = self.shaping.reward(game.score - score, moved, game.game_over)
+        self._update()
+        return self.observation, reward, game.game_over, False, self.info
+
+    def _update(self) -> None:
+        self.observation[...] = [
+            [value.bit_length() - 1 if value else 0 for value in row]
+            for row in self.game.board.grid
+        ]
+        self.info["score"] = self.game.score
+        if self.action_masks:
+            mask = legal_mask(self.game.board)
+            for bit in range(ACTION_COUNT):
+                self.action_mask[bit] = mask >> bit & 1
+
+
+class VectorEnv:
+    """
+    num_envs games of one size stepped together.
+
+    step() takes one action per game and returns the same arrays every time:
+    observations is the engine's own (num_envs, size, size) rank array, so
+    no board is copied, and rewards, terminated, truncated and the info
+    entries are buffers that each step overwrites. Read or copy them before
+    the next step.
+
+    Finished games are reset on the step after the one that ended them
+    (Gymnasium's "next step" autoreset): that step ignores their action,
+    starts a new game and reports a reward of 0. A reset game keeps drawing
+    from its own random stream, so a seeded run replays exactly.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        size: int = DEFAULT_BOARD_SIZE,
+        shaping: RewardShaping | None = None,
+        action_masks: bool = False,
+        buffers: EnvBuffers | None = None,
+    ) -> None:
+        """
+        Args:
+            action_masks: Put the legal moves of every game, a
+                (num_envs, ACTION_COUNT) bool array, in info["action_mask"]
+            buffers: Arrays to play in, e.g. views of shared memory; new
+                ones by default
+        """
+        _require_numpy()
+        if not vector_engine.is_available(size):
+            raise ValueError(f"the vector engine can't play {size}x{size} boards")
+        self.num_envs = num_envs
+        self.size = size
+        self.shaping = shaping or RewardShaping()
+        self.action_masks = action_masks
+        if buffers is None:
+            buffers = EnvBuffers.allocate(num_envs, size)
+        self.games = VectorGames(
+            size,
+            num_envs,
+            ranks=buffers.observations,
+            scores=buffers.scores,
+            game_over=buffers.terminated,
+        )
+        self.games.allocate_many(num_envs)
+        self._stepper = BatchStepper(self.games)
+
+        self.observations = buffers.observations
+        self.rewards = buffers.rewards
+        self.terminated = buffers.terminated
+        self.truncated = buffers.truncated  # Games are never cut short
+        self.truncated[:] = False
+        self.action_mask = buffers.action_mask
+        self.info: dict[str, Any] = {"score": self.games.scores}
+        if action_masks:
+            self.info["action_mask"] = self.action_mask
+        self._resetting = np.zeros(num_envs, dtype=bool)
+        self._not_moved = np.zeros(num_envs, dtype=bool)
+        self._update_action_mask()
+
+    def reset(
+        self, seed: int | Sequence[int] | None = None
+    ) -> tuple[Any, dict[str, Any]]:
+        """
+        Start a new game everywhere.
+
+        Args:
+            seed: Makes the whole run reproducible; either one seed, or one
+                per game to seed each game's own random stream
+        """
+        seeds: Any = seed
+        if seed is not None and np.ndim(seed) == 0:
+            seeds = np.random.SeedSequence(seed).generate_state(
+                self.num_envs, dtype=np.uint64
+            )
+        self.games.reset(np.arange(self.num_envs), seeds)
+        self._update_action_mask()
+        return self.observations, self.info
+
+    def step(self, actions: Any) -> tuple[Any, Any, Any, Any, dict[str, Any]]:
+        """
+        Play one action in every game.
+
+        Args:
+            actions: num_envs indices into DIRECTIONS
+        """
+        stepper = self._stepper
+        # Games that ended last step can't move, so the step leaves them be
+        np.copyto(self._resetting, self.terminated)
+        stepper.step(actions)
+        self._update_rewards(stepper.points, stepper.moved)
+        if self._resetting.any():
+            stepper.restart(self._resetting)
+        self._update_action_mask()
+        return (
+            self.observations,
+            self.rewards,
+            self.terminated,
+            self.truncated,
+            self.info,
+        )
+
+    def _update_rewards(self, points: Any, moved: Any) -> None:
+        shaping, rewards = self.shaping, self.rewards
+        np.copyto(rewards, points)
+        if shaping.log_scale:
+            np.add(rewards, 1, out=rewards)
+            np.log2(rewards, out=rewards)
+        if shaping.invalid_move_penalty:
+            np.logical_not(moved, out=self._not_moved)
+            np.subtract(
+                rewards,
+                shaping.invalid_move_penalty,
+                out=rewards,
+                where=self._not_moved,
+            )
+        if shaping.game_over_penalty:
+            np.subtract(
+                rewards, shaping.game_over_penalty, out=rewards, where=self.terminated
+            )
+        np.copyto(rewards, 0, where=self._resetting)
+
+    def _update_action_mask(self) -> None:
+        if self.action_masks:
+            self._stepper.legal_moves_into(self.action_mask)
@@ -0,0 +1,296 @@
+"""
+Multi-process vectorized environment for 2048-CLI.
+SubprocVectorEnv splits its games across worker processes, each running a
+VectorEnv on its own rows of arrays in shared memory, so stepping runs in
+parallel and away from the process that runs the policy.
+
+After start-up nothing is pickled: a step writes the actions to shared
+memory and wakes each worker with a one-byte message on its pipe, and the
+worker answers with one byte once its rows hold the new observations.
+"""
+
+import math
+import multiprocessing
+import os
+import signal
+import traceback
+from collections.abc import Sequence
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Any
+
+from core.constants import DEFAULT_BOARD_SIZE
+from game import vector_engine
+
+from .env import ACTION_COUNT, EnvBuffers, RewardShaping, VectorEnv, _require_numpy
+
+try:
+    import numpy as np
+except ImportError:  # Checked when an environment is created
+    np = None  # type: ignore[assignment]
+
+# Messages on the worker pipes
+_STEP = b"s"
+_RESET = b"r"
+_RESET_SEEDED = b"R"  # Seeds are in the shared seeds array
+_CLOSE = b"c"
+_DONE = b"d"
+_FAILED = b"e"  # Followed by the worker's traceback
+
+
+def _shared_arrays(buffer: Any, num_envs: int, size: int) -> dict[str, Any]:
+    """Lay the environment's arrays out in buffer; None as buffer gives the size."""
+    fields = [
+        ("observations", np.uint8, (num_envs, size, size)),
+        ("scores", np.int64, (num_envs,)),
+        ("rewards", np.float32, (num_envs,)),
+        ("terminated", np.bool_, (num_envs,)),
+        ("truncated", np.bool_, (num_envs,)),
+        ("action_mask", np.bool_, (num_envs, ACTION_COUNT)),
+        ("actions", np.uint8, (num_envs,)),
+        ("seeds", np.uint64, (num_envs,)),
+    ]
+    arrays: dict[str, Any] = {}
+    offset = 0
+    for name, dtype, shape in fields:
+        offset = -(-offset // 8) * 8  # Keep every array 8-byte aligned
+        if buffer is not None:
+            arrays[name] = np.ndarray(shape, dtype, buffer=buffer, offset=offset)
+        offset += np.dtype(dtype).itemsize * math.prod(shape)
+    arrays["bytes"] = offset
+    return arrays
+
+
+def _env_buffers(arrays: dict[str, Any]) -> EnvBuffers:
+    return EnvBuffers(*(arrays[name] for name in EnvBuffers._fields))
+
+
+def _worker(
+    connection: Connection,
+    memory_name: str,
+    num_envs: int,
+    size: int,
+    rows: tuple[int, int],
+    shaping: RewardShaping,
+    action_masks: bool,
+) -> None:
+    """Play rows start to stop of the shared games until told to stop."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent shuts us down
+    memory = shared_memory.SharedMemory(name=memory_name)
+    # Dropped before the block is closed, as they hold views of it
+    arrays: dict[str, Any] | None
+    env: VectorEnv | None
+    arrays = _shared_arrays(memory.buf, num_envs, size)
+    start, stop = rows
+    try:
+        env = VectorEnv(
+            stop - start,
+            size,
+            shaping,
+            action_masks,
+            _env_buffers(arrays).rows(start, stop),
+        )
+        actions = arrays["actions"][start:stop]
+        seeds = arrays["seeds"][start:stop]
+        connection.send_bytes(_DONE)
+        while True:
+            command = connection.recv_bytes()
+            if command == _STEP:
+                env.step(actions)
+            elif command == _RESET:
+                env.reset()
+            elif command == _RESET_SEEDED:
+                env.reset(seeds)
+            else:
+                break
+            connection.send_bytes(_DONE)
+    except (EOFError, BrokenPipeError):
+        pass  # The parent is gone
+    except Exception:
+        connection.send_bytes(_FAILED + traceback.format_exc().encode())
+    finally:
+        # Views of the block must go before it can be closed
+        env = actions = seeds = arrays = None
+        memory.close()
+
+
+class SubprocVectorEnv:
+    """
+    VectorEnv with its games split across worker processes.
+
+    It has the same reset() and step() as VectorEnv and returns the same
+    kind of reused arrays, here views of shared memory. step_async() and
+    step_wait() split a step so the caller can work while the workers
+    play; the arrays must not be read in between.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        num_workers: int | None = None,
+        size: int = DEFAULT_BOARD_SIZE,
+        shaping: RewardShaping | None = None,
+        action_masks: bool = False,
+    ) -> None:
+        """
+        Args:
+            num_workers: Worker processes (default: one per CPU), each
+                playing an equal share of the games
+        """
+        _require_numpy()
+        if not vector_engine.is_available(size):
+            raise ValueError(f"the vector engine can't play {size}x{size} boards")
+        self.num_envs = num_envs
+        self.size = size
+        self.action_masks = action_masks
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, num_envs))
+
+        self._memory: shared_memory.SharedMemory | None = shared_memory.SharedMemory(
+            create=True, size=max(1, _shared_arrays(None, num_envs, size)["bytes"])
+        )
+        arrays = _shared_arrays(self._memory.buf, num_envs, size)
+        buffers = _env_buffers(arrays)
+        self.observations = buffers.observations
+        self.rewards = buffers.rewards
+        self.terminated = buffers.terminated
+        self.truncated = buffers.truncated
+        self.action_mask = buffers.action_mask
+        self.info: dict[str, Any] = {"score": buffers.scores}
+        if action_masks:
+            self.info["action_mask"] = self.action_mask
+        self._actions = arrays["actions"]
+        self._seeds = arrays["seeds"]
+
+        context = multiprocessing.get_context()
+        self._connections: list[Connection] = []
+        self._workers: list[Any] = []
+        self._waiting = False
+        try:
+            for worker in range(num_workers):
+                rows = (
+                    num_envs * worker // num_workers,
+                    num_envs * (worker + 1) // num_workers,
+                )
+                connection, worker_connection = context.Pipe()
+                process = context.Process(
+                    target=_worker,
+                    args=(
+                        worker_connection,
+                        self._memory.name,
+                        num_envs,
+                        size,
+                        rows,
+                        shaping or RewardShaping(),
+                        action_masks,
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                worker_connection.close()
+                self._connections.append(connection)
+                self._workers.append(process)
+            self._wait()
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._workers)
+
+    def reset(
+        self, seed: int | Sequence[int] | None = None
+    ) -> tuple[Any, dict[str, Any]]:
+        """Start a new game everywhere; seeds as for VectorEnv.reset()."""
+        if seed is None:
+            self._send(_RESET)
+        else:
+            seeds: Any = seed
+            if np.ndim(seed) == 0:
+                seeds = np.random.SeedSequence(seed).generate_state(
+                    self.num_envs, dtype=np.uint64
+                )
+            np.copyto(self._seeds, seeds, casting="unsafe")
+            self._send(_RESET_SEEDED)
+        self._wait()
+        return self.observations, self.info
+
+    def step(self, actions: Any) -> tuple[Any, Any, Any, Any, dict[str, Any]]:
+        self.step_async(actions)
+        return self.step_wait()
+
+    def step_async(self, actions: Any) -> None:
+        """Start a step with one index into DIRECTIONS per game."""
+        if self._waiting:
+            raise RuntimeError("step_async() called again before step_wait()")
+        if len(actions) != self.num_envs:
+            raise ValueError(f"expected {self.num_envs} actions")
+        np.copyto(self._actions, actions, casting="unsafe")
+        if self.num_envs and self._actions.max() >= ACTION_COUNT:
+            raise ValueError("actions must be indices into DIRECTIONS")
+        self._send(_STEP)
+
+    def step_wait(self) -> tuple[Any, Any, Any, Any, dict[str, Any]]:
+        """Wait for the step started by step_async()."""
+        self._wait()
+        return (
+            self.observations,
+            self.rewards,
+            self.terminated,
+            self.truncated,
+            self.info,
+        )
+
+    def _send(self, command: bytes) -> None:
+        for connection in self._connections:
+            connection.send_bytes(command)
+        self._waiting = True
+
+    def _wait(self) -> None:
+        """Collect one reply from every worker; raise if any of them failed."""
+        errors = []
+        for connection in self._connections:
+            try:
+                reply = connection.recv_bytes()
+            except EOFError:
+                reply = _FAILED + b"worker exited"
+            if reply != _DONE:
+                errors.append(reply[len(_FAILED) :].decode(errors="replace"))
+        self._waiting = False
+        if errors:
+            raise RuntimeError(f"environment worker failed:\n{errors[0]}")
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if self._memory is None:
+            return
+        for connection in self._connections:
+            try:
+                connection.send_bytes(_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._workers = []
+
+        self.observations = self.rewards = self.terminated = None
+        self.truncated = self.action_mask = self._actions = self._seeds = None
+        self.info = {}
+        try:
+            self._memory.close()
+        except BufferError:
+            pass  # The caller still holds views; the mapping goes with them
+        self._memory.unlink()
+        self._memory = None
+
+    def __enter__(self) -> "SubprocVectorEnv":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -1,6 +1,9 @@
 """
 Animation system for the 2048-CLI game.
 Provides smooth animations for tile movement, merging, and spawning.
+
+Active animations are kept as parallel arrays and advanced together in one
+pass, with easing read from precomputed lookup tables.
 """
 
 import threading
@@ -9,6 +12,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
+from ui.easing import EASE_OUT_BACK, EASE_OUT_CUBIC, MERGE_PULSE
+
 
 class AnimationType(Enum):
     """Types of animations supported."""
@@ -36,84 +41,11 @@ class Position:
         return Position(self.x * scalar, self.y * scalar)
 
 
-@dataclass
-class TileAnimation:
-    """Represents a single tile animation."""
-
-    tile_id: str
-    animation_type: AnimationType
-    start_pos: Position
-    end_pos: Position
-    start_time: float
-    duration: float
-    value: int
-    start_value: int | None = None  # For merge animations
-    scale: float = 1.0  # For scale animations
-    alpha: float = 1.0  # For fade animations
-
-    @property
-    def progress(self) -> float:
-        """Get animation progress (0.0 to 1.0)."""
-        elapsed = time.time() - self.start_time
-        return min(1.0, max(0.0, elapsed / self.duration))
-
-    @property
-    def is_finished(self) -> bool:
-        """Check if animation is complete."""
-        return self.progress >= 1.0
-
-    def get_current_position(self) -> Position:
-        """Get current interpolated position."""
-        if self.animation_type == AnimationType.MOVE:
-            return self._ease_out_cubic(self.start_pos, self.end_pos, self.progress)
-        return self.start_pos
-
-    def get_current_scale(self) -> float:
-        """Get current scale for merge animations."""
-        if self.animation_type == AnimationType.MERGE:
-            # Bounce effect: shrink then grow
-            if self.progress < 0.5:
-                # Shrink phase
-                return 1.0 - (self.progress * 0.3)
-            else:
-                # Grow phase
-                return 0.7 + ((self.progress - 0.5) * 0.6)
-        elif self.animation_type == AnimationType.SPAWN:
-            # Grow from 0 to 1
-            return self._ease_out_back(0.0, 1.0, self.progress)
-        return 1.0
-
-    def get_current_alpha(self) -> float:
-        """Get current alpha for fade animations."""
-        if self.animation_type == AnimationType.SPAWN:
-            return self._ease_out_cubic_scalar(0.0, 1.0, self.progress)
-        return 1.0
-
-    def _ease_out_cubic(self, start: Position, end: Position, t: float) -> Position:
-        """Cubic ease-out interpolation for smooth movement."""
-        eased_t = 1 - pow(1 - t, 3)
-        diff = end - start
-        return start + (diff * eased_t)
-
-    def _ease_out_cubic_scalar(self, start: float, end: float, t: float) -> float:
-        """Cubic ease-out interpolation for scalar values."""
-        eased_t = 1 - pow(1 - t, 3)
-        return start + (end - start) * eased_t
-
-    def _ease_out_back(self, start: float, end: float, t: float) -> float:
-        """Back ease-out for bounce effect."""
-        c1 = 1.70158
-        c3 = c1 + 1
-        eased_t = 1 + c3 * pow(t - 1, 3) + c1 * pow(t - 1, 2)
-        return start + (end - start) * eased_t
-
-
 class AnimationManager:
     """Manages all game animations."""
 
     def __init__(self, board_size: int = 4):
         self.board_size = board_size
-        self.active_animations: list[TileAnimation] = []
         self.running = False
         self.fps = 60
         self.speed_multiplier = 1.0
@@ -125,10 +57,19 @@ class AnimationManager:
         self.merge_duration = 0.2
         self.spawn_duration = 0.15
 
-        # Tile positions cache for drawing
-        self.tile_positions: dict[str, Position] = {}
-        self.tile_scales: dict[str, float] = {}
-        self.tile_alphas: dict[str, float] = {}
+        # Active animations as parallel arrays, one index per animation
+        self._types: list[AnimationType] = []
+        self._start_times: list[float] = []
+        self._rates: list[float] = []  # 1 / duration
+        self._start_x: list[float] = []
+        self._start_y: list[float] = []
+        self._delta_x: list[float] = []
+        self._delta_y: list[float] = []
+        self._tile_ids: list[int] = []
+        self._states: list[list[float]] = []  # The tile's state, shared
+
+        # Render state per animated tile: [x, y, scale, alpha], updated in place
+        self._tile_states: dict[int, list[float]] = {}
 
     def set_fps(self, fps: int) -> None:
         """Set animation frame rate."""
@@ -153,99 +94,92 @@ class AnimationManager:
         if self._render_thread:
             self._render_thread.join(timeout=1.0)
 
+    def _add_animation(
+        self,
+        animation_type: AnimationType,
+        tile_id: int,
+        from_pos: tuple[int, int],
+        to_pos: tuple[int, int],
+        duration: float,
+    ) -> None:
+        start_x, start_y = float(from_pos[1]), float(from_pos[0])
+        with self._lock:
+            state = self._tile_states.get(tile_id)
+            if state is None:
+                state = [start_x, start_y, 1.0, 1.0]
+                self._tile_states[tile_id] = state
+            self._types.append(animation_type)
+            self._start_times.append(time.time())
+            self._rates.append(self.speed_multiplier / duration)
+            self._start_x.append(start_x)
+            self._start_y.append(start_y)
+            self._delta_x.append(to_pos[1] - start_x)
+            self._delta_y.append(to_pos[0] - start_y)
+            self._tile_ids.append(tile_id)
+            self._states.append(state)
+
     def add_move_animation(
         self,
-        tile_id: str,
+        tile_id: int,
         from_pos: tuple[int, int],
         to_pos: tuple[int, int],
         value: int,
     ) -> None:
         """Add a tile movement animation."""
-        start_pos = Position(float(from_pos[1]), float(from_pos[0]))
-        end_pos = Position(float(to_pos[1]), float(to_pos[0]))
-
-        animation = TileAnimation(
-            tile_id=tile_id,
-            animation_type=AnimationType.MOVE,
-            start_pos=start_pos,
-            end_pos=end_pos,
-            start_time=time.time(),
-            duration=self.move_duration / self.speed_multiplier,
-            value=value,
+        self._add_animation(
+            AnimationType.MOVE, tile_id, from_pos, to_pos, self.move_duration
         )
 
-        with self._lock:
-            self.active_animations.append(animation)
-
     def add_merge_animation(
-        self, tile_id: str, pos: tuple[int, int], old_value: int, new_value: int
+        self, tile_id: int, pos: tuple[int, int], old_value: int, new_value: int
     ) -> None:
         """Add a tile merge animation."""
-        position = Position(float(pos[1]), float(pos[0]))
-
-        animation = TileAnimation(
-            tile_id=tile_id,
-            animation_type=AnimationType.MERGE,
-            start_pos=position,
-            end_pos=position,
-            start_time=time.time(),
-            duration=self.merge_duration / self.speed_multiplier,
-            value=new_value,
-            start_value=old_value,
-        )
-
-        with self._lock:
-            self.active_animations.append(animation)
+        self._add_animation(AnimationType.MERGE, tile_id, pos, pos, self.merge_duration)
 
     def add_spawn_animation(
-        self, tile_id: str, pos: tuple[int, int], value: int
+        self, tile_id: int, pos: tuple[int, int], value: int
     ) -> None:
         """Add a new tile spawn animation."""
-        position = Position(float(pos[1]), float(pos[0]))
-
-        animation = TileAnimation(
-            tile_id=tile_id,
-            animation_type=AnimationType.SPAWN,
-            start_pos=position,
-            end_pos=position,
-            start_time=time.time(),
-            duration=self.spawn_duration / self.speed_multiplier,
-            value=value,
-        )
-
-        with self._lock:
-            self.active_animations.append(animation)
+        self._add_animation(AnimationType.SPAWN, tile_id, pos, pos, self.spawn_duration)
 
     def has_active_animations(self) -> bool:
         """Check if there are any active animations."""
         with self._lock:
-            return len(self.active_animations) > 0
+            return len(self._types) > 0
 
     def skip_all_animations(self) -> None:
         """Skip all current animations to their end state."""
         with self._lock:
-            for animation in self.active_animations:
-                # Force animation to completion
-                animation.start_time = time.time() - animation.duration
-            self._update_positions()
-            self.active_animations.clear()
+            # Start every animation far enough back to have finished
+            self._start_times = [0.0] * len(self._start_times)
+            self._update_animations()
+
+    def get_tile_state(self, tile_id: int) -> list[float] | None:
+        """
+        Get the current [x, y, scale, alpha] of an animated tile.
 
-    def get_tile_render_data(self, tile_id: str) -> dict[str, Any] | None:
+        The list is updated in place by the animation thread; read it for
+        the current frame and don't keep it.
+        """
+        return self._tile_states.get(tile_id)
+
+    def get_tile_render_data(self, tile_id: int) -> dict[str, Any] | None:
         """Get current rendering data for a tile."""
         with self._lock:
-            if tile_id in self.tile_positions:
+            state = self._tile_states.get(tile_id)
+            if state is not None:
                 return {
-                    "position": self.tile_positions[tile_id],
-                    "scale": self.tile_scales.get(tile_id, 1.0),
-                    "alpha": self.tile_alphas.get(tile_id, 1.0),
+                    "position": Position(state[0], state[1]),
+                    "scale": state[2],
+                    "alpha": state[3],
                 }
         return None
 
     def _animation_loop(self) -> None:
         """Main animation loop running in separate thread."""
-        frame_time = 1.0 / self.fps
-
         while self.running:
+            # Re-read the frame rate so pacing changes apply immediately
+            frame_time = 1.0 / self.fps
             loop_start = time.time()
 
             with self._lock:
@@ -257,49 +191,81 @@ class AnimationManager:
             time.sleep(sleep_time)
 
     def _update_animations(self) -> None:
-        """Update all active animations."""
+        """Advance every active animation in one pass over the arrays."""
         current_time = time.time()
-        finished_animations = []
-
-        for animation in self.active_animations:
-            if animation.is_finished:
-                finished_animations.append(animation)
-            else:
-                # Update tile render data
-                self.tile_positions[animation.tile_id] = (
-                    animation.get_current_position()
-                )
-                self.tile_scales[animation.tile_id] = animation.get_current_scale()
-                self.tile_alphas[animation.tile_id] = animation.get_current_alpha()
-
-        # Remove finished animations
-        for animation in finished_animations:
-            self.active_animations.remove(animation)
-            # Set final state
-            self.tile_positions[animation.tile_id] = animation.end_pos
-            self.tile_scales[animation.tile_id] = 1.0
-            self.tile_alphas[animation.tile_id] = 1.0
-
-        self._update_positions()
-
-    def _update_positions(self) -> None:
-        """Update cached positions for all tiles."""
-        # Clean up positions for animations that are no longer active
-        active_tile_ids = {anim.tile_id for anim in self.active_animations}
-
-        # Keep positions for tiles that might still be rendering
-        for tile_id in list(self.tile_positions.keys()):
+        types, states = self._types, self._states
+        start_times, rates = self._start_times, self._rates
+        start_x, start_y = self._start_x, self._start_y
+        delta_x, delta_y = self._delta_x, self._delta_y
+        last_sample = len(EASE_OUT_CUBIC) - 1
+        finished = 0
+
+        for i in range(len(types)):
+            t = (current_time - start_times[i]) * rates[i]
+            if t >= 1.0:
+                t = 1.0
+                finished += 1
+            index = int(t * last_sample) if t > 0.0 else 0
+            state = states[i]
+            animation_type = types[i]
+            if animation_type is AnimationType.MOVE:
+                eased = EASE_OUT_CUBIC[index]
+                state[0] = start_x[i] + delta_x[i] * eased
+                state[1] = start_y[i] + delta_y[i] * eased
+            elif animation_type is AnimationType.MERGE:
+                state[2] = MERGE_PULSE[index]
+            elif animation_type is AnimationType.SPAWN:
+                state[2] = EASE_OUT_BACK[index]
+                state[3] = EASE_OUT_CUBIC[index]
+
+        if finished:
+            self._remove_finished(current_time)
+
+    def _remove_finished(self, current_time: float) -> None:
+        """Drop finished animations and the state of tiles left with none."""
+        keep = [
+            i
+            for i in range(len(self._types))
+            if (current_time - self._start_times[i]) * self._rates[i] < 1.0
+        ]
+        self._types = [self._types[i] for i in keep]
+        self._start_times = [self._start_times[i] for i in keep]
+        self._rates = [self._rates[i] for i in keep]
+        self._start_x = [self._start_x[i] for i in keep]
+        self._start_y = [self._start_y[i] for i in keep]
+        self._delta_x = [self._delta_x[i] for i in keep]
+        self._delta_y = [self._delta_y[i] for i in keep]
+        self._tile_ids = [self._tile_ids[i] for i in keep]
+        self._states = [self._states[i] for i in keep]
+
+        # Tiles with nothing left to animate are drawn at their board cell,
+        # and effects end at their rest values once their animation is over
+        active_tile_ids = set(self._tile_ids)
+        effect_tile_ids = {
+            tile_id
+            for tile_id, animation_type in zip(self._tile_ids, self._types, strict=True)
+            if animation_type is not AnimationType.MOVE
+        }
+        for tile_id in list(self._tile_states):
             if tile_id not in active_tile_ids:
-                # Keep the final position but reset effects
-                if tile_id in self.tile_scales:
-                    self.tile_scales[tile_id] = 1.0
-                if tile_id in self.tile_alphas:
-                    self.tile_alphas[tile_id] = 1.0
+                del self._tile_states[tile_id]
+            elif tile_id not in effect_tile_ids:
+                state = self._tile_states[tile_id]
+                state[2] = state[3] = 1.0
 
     def clear_all_animations(self) -> None:
         """Clear all animations and reset state."""
         with self._lock:
-            self.active_animations.clear()
-            self.tile_positions.clear()
-            self.tile_scales.clear()
-            self.tile_alphas.clear()
+            for array in (
+                self._types,
+                self._start_times,
+                self._rates,
+                self._start_x,
+                self._start_y,
+                self._delta_x,
+                self._delta_y,
+                self._tile_ids,
+                self._states,
+            ):
+                array.clear()
+            self._tile_states.clear()
@@ -0,0 +1,242 @@
+"""
+Raw ANSI render backend for 2048-CLI.
+Composes the whole frame off-screen and flushes only the cells that changed
+as one buffered write of ANSI escape sequences, bypassing curses output.
+"""
+
+import curses
+import os
+import unicodedata
+from functools import lru_cache
+
+from core.modern_themes import get_color_pair_colors
+
+# Rewriting a few unchanged cells is cheaper than a cursor jump
+_MAX_REWRITE_GAP = 4
+
+_CSI = "\x1b["
+
+
+@lru_cache(maxsize=4096)
+def _char_width(char: str) -> int:
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+
+class AnsiScreen:
+    """Off-screen frame with the subset of the curses window API the display uses."""
+
+    def __init__(self, height: int, width: int, fd: int = 1) -> None:
+        self._fd = fd
+        self._height = height
+        self._width = width
+        self._sgr_cache: dict[int, str] = {}
+        self._blank_safe: dict[int, bool] = {}
+        self._back = self._blank_frame()
+        self._front = self._blank_frame()
+        self._full_redraw = True
+        self.bytes_written = 0
+
+    def _blank_frame(self) -> list[list[tuple[str, int]]]:
+        return [[(" ", 0)] * self._width for _ in range(self._height)]
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self._height, self._width
+
+    def resize(self, height: int, width: int) -> None:
+        """Change the frame size; the next refresh redraws everything."""
+        if (height, width) != (self._height, self._width):
+            self._height, self._width = height, width
+            self._back = self._blank_frame()
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget what the terminal shows, e.g. after curses drew a menu."""
+        self._front = self._blank_frame()
+        self._full_redraw = True
+
+    def erase(self) -> None:
+        self._back = self._blank_frame()
+
+    clear = erase
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
+        """Write text into the frame; raises curses.error when it doesn't fit."""
+        if not 0 <= y < self._height or not 0 <= x < self._width:
+            raise curses.error("addstr() returned ERR")
+        row = self._back[y]
+        for char in text:
+            width = _char_width(char)
+            if x + width > self._width:
+                raise curses.error("addstr() returned ERR")
+            row[x] = (char, attr)
+            if width == 2:
+                row[x + 1] = ("", attr)  # Covered by the wide character
+            x += width
+
+    def derwin(self, height: int, width: int, y: int, x: int) -> "AnsiRegion":
+        """Get a region of the frame that is drawn like a curses window."""
+        if y < 0 or x < 0 or y + height > self._height or x + width > self._width:
+            raise curses.error("derwin() returned ERR")
+        return AnsiRegion(self, height, width, y, x)
+
+    def fill(self, y: int, x: int, width: int) -> None:
+        """Blank part of a row."""
+        self._back[y][x : x + width] = [(" ", 0)] * width
+
+    def refresh(self) -> None:
+        """Flush the changed cells with a single write."""
+        data = self.render_diff().encode("utf-8")
+        if data:
+            view = memoryview(data)
+            while view:
+                written = os.write(self._fd, view)
+                view = view[written:]
+            self.bytes_written += len(data)
+
+    def render_diff(self) -> str:
+        """Build the escape sequences that bring the terminal up to date."""
+        out: list[str] = []
+        current_attr = -1
+        cursor_y, cursor_x = -1, -1
+
+        if self._full_redraw:
+            out.append(f"{_CSI}0m{_CSI}2J")
+            current_attr = 0
+            self._full_redraw = False
+
+        for y in range(self._height):
+            back_row, front_row = self._back[y], self._front[y]
+            if back_row == front_row:
+                continue
+
+            x = 0
+            while x < self._width:
+                if back_row[x] == front_row[x]:
+                    x += 1
+                    continue
+
+                # Extend the run over small gaps of unchanged cells
+                end = x + 1
+                gap = 0
+                while end < self._width and gap <= _MAX_REWRITE_GAP:
+                    gap = 0 if back_row[end] != front_row[end] else gap + 1
+                    end += 1
+                end -= gap
+
+                # A run can't start on the right half of a wide character
+                while x > 0 and back_row[x][0] == "":
+                    x -= 1
+
+                out.append(self._move_cursor(cursor_y, cursor_x, y, x))
+                for char, attr in back_row[x:end]:
+                    if char == "":
+                        continue
+                    # A plain space looks the same in any attribute without a
+                    # background, so it doesn't break the current color run
+                    if (
+                        char == " "
+                        and self._is_blank_safe(attr)
+                        and (current_attr >= 0 and self._is_blank_safe(current_attr))
+                    ):
+                        out.append(char)
+                        continue
+                    if attr != current_attr:
+                        out.append(self._sgr(attr))
+                        current_attr = attr
+                    out.append(char)
+                cursor_y, cursor_x = y, end
+                x = end
+
+            self._front[y] = list(back_row)
+
+        if out:
+            out.append(f"{_CSI}0m")
+        return "".join(out)
+
+    @staticmethod
+    def _move_cursor(cursor_y: int, cursor_x: int, y: int, x: int) -> str:
+        if (cursor_y, cursor_x) == (y, x):
+            return ""
+        if cursor_y == y:
+            if x > cursor_x:
+                return f"{_CSI}{x - cursor_x}C" if x - cursor_x > 1 else f"{_CSI}C"
+            return f"{_CSI}{x + 1}G"
+        return f"{_CSI}{y + 1};{x + 1}H"
+
+    def _is_blank_safe(self, attr: int) -> bool:
+        """Whether a space drawn with this attribute is indistinguishable from blank."""
+        safe = self._blank_safe.get(attr)
+        if safe is None:
+            colors = get_color_pair_colors((attr & curses.A_COLOR) >> 8)
+            has_background = colors is not None and colors[1] >= 0
+            safe = not has_background and not attr & curses.A_REVERSE
+            self._blank_safe[attr] = safe
+        return safe
+
+    def _sgr(self, attr: int) -> str:
+        """Get the select-graphic-rendition sequence for a curses attribute."""
+        sgr = self._sgr_cache.get(attr)
+        if sgr is None:
+            params = ["0"]
+            if attr & curses.A_BOLD:
+                params.append("1")
+            if attr & curses.A_DIM:
+                params.append("2")
+            if attr & curses.A_BLINK:
+                params.append("5")
+            if attr & curses.A_REVERSE:
+                params.append("7")
+            colors = get_color_pair_colors((attr & curses.A_COLOR) >> 8)
+            if colors:
+                fg, bg = colors
+                if fg >= 0:
+                    params.append(f"38;5;{fg}")
+                if bg >= 0:
+                    params.append(f"48;5;{bg}")
+            sgr = f"{_CSI}{';'.join(params)}m"
+            self._sgr_cache[attr] = sgr
+        return sgr
+
+
+class AnsiRegion:
+    """A rectangle of an AnsiScreen, addressed relative to its top-left corner."""
+
+    def __init__(
+        self, screen: AnsiScreen, height: int, width: int, y: int, x: int
+    ) -> None:
+        self._screen = screen
+        self._height = height
+        self._width = width
+        self._y = y
+        self._x = x
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self._height, self._width
+
+    def erase(self) -> None:
+        for row in range(self._height):
+            self._screen.fill(self._y + row, self._x, self._width)
+
+    clear = erase
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
+        """Write text into the region; raises curses.error when it doesn't fit."""
+        if not 0 <= y < self._height or not 0 <= x < self._width:
+            raise curses.error("addstr() returned ERR")
+        room = self._width - x
+        fitting = ""
+        for char in text:
+            room -= _char_width(char)
+            if room < 0:
+                break
+            fitting += char
+        self._screen.addstr(self._y + y, self._x + x, fitting, attr)
+        if len(fitting) < len(text):
+            raise curses.error("addstr() returned ERR")
+
+    # The screen is flushed as a whole, so per-region refreshes are no-ops
+    def noutrefresh(self) -> None:
+        pass
+
+    def touchwin(self) -> None:
+        pass
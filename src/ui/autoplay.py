@@ -0,0 +1,229 @@
+"""
+Autoplay mode for 2048-CLI.
+The built-in player plays game after game on its own, either at demo speed
+with animations or in turbo mode, where moves run flat out and the screen is
+only redrawn every few moves or at a capped frame rate.
+"""
+
+import curses
+import time
+from collections import deque
+from typing import Any
+
+from ai.expectimax import search
+from core.constants import (
+    AUTOPLAY_GAME_OVER_PAUSE,
+    AUTOPLAY_INPUT_CHECK_INTERVAL,
+    AUTOPLAY_MAX_FPS,
+    AUTOPLAY_MOVE_INTERVAL,
+    AUTOPLAY_STATS_WINDOW,
+    DEFAULT_BOARD_SIZE,
+    ESCAPE_KEY_CODE,
+    SEARCH_DEPTH,
+)
+from core.i18n import t
+from game.game import Game
+from headless.spectate import SpectatorHub
+from ui.input import wait_for_key
+from ui.modern_display import (
+    draw_board,
+    get_animation_manager,
+    get_frame_timeout,
+    invalidate_display,
+    invalidate_layout,
+    queue_move_animations,
+)
+
+TURBO_TOGGLE_KEY = ord(" ")
+STOP_KEYS = (ord("q"), ord("Q"), ESCAPE_KEY_CODE)
+
+
+class RateMeter:
+    """Events per second over a sliding window, from cumulative counts."""
+
+    def __init__(self, window: float = AUTOPLAY_STATS_WINDOW) -> None:
+        self.window = window
+        self._samples: deque[tuple[float, int]] = deque()
+
+    def record(self, now: float, count: int) -> float:
+        """Add a sample of the running total and return the current rate."""
+        samples = self._samples
+        samples.append((now, count))
+        # Keep one sample older than the window to measure across it
+        while len(samples) > 2 and now - samples[1][0] >= self.window:
+            samples.popleft()
+        first_time, first_count = samples[0]
+        if now <= first_time:
+            return 0.0
+        return (count - first_count) / (now - first_time)
+
+
+class Autoplay:
+    """State of an autoplay session: the current game and running totals."""
+
+    def __init__(
+        self,
+        board_size: int = DEFAULT_BOARD_SIZE,
+        depth: int = SEARCH_DEPTH,
+        turbo: bool = False,
+        spectators: SpectatorHub | None = None,
+    ) -> None:
+        self.board_size = board_size
+        self.depth = depth
+        self.turbo = turbo
+        self.spectators = spectators  # Games are broadcast as stream 0
+        self.moves = 0  # Across all games
+        self.games = 1
+        self.best_score = 0
+        self.frames = 0
+        self.move_rate = RateMeter()
+        self.frame_rate = RateMeter()
+        self.game = self._new_game()
+
+    def _new_game(self) -> Game:
+        game = Game(self.board_size)
+        game.start()
+        if self.spectators is not None:
+            self.spectators.publish_keyframe(0, game)
+        return game
+
+    def play_move(self) -> bool:
+        """
+        Play the player's best move.
+
+        Returns:
+            False if the game was already over and a new one was started
+        """
+        game = self.game
+        if game.game_over:
+            self.best_score = max(self.best_score, game.score)
+            self.game = self._new_game()
+            self.games += 1
+            return False
+        result = search(game.board, game.score, self.depth)
+        if result.direction is None:  # Can't happen unless game over was missed
+            game.game_over = True
+            return True
+        game.step(result.direction)
+        if self.spectators is not None:
+            self.spectators.publish_move(0, game)
+        self.moves += 1
+        return True
+
+    def status_text(self, now: float) -> str:
+        mode = t("ui.autoplay.turbo") if self.turbo else t("ui.autoplay.demo")
+        status = t(
+            "ui.autoplay.status",
+            mode,
+            self.moves,
+            self.games,
+            max(self.best_score, self.game.score),
+            self.move_rate.record(now, self.moves),
+            self.frame_rate.record(now, self.frames),
+        )
+        return f"{status}   {t('ui.autoplay.help')}"
+
+    def draw(self, stdscr: curses.window, config: dict[str, Any]) -> float:
+        """Draw the current game with the live stats; returns the frame time."""
+        now = time.monotonic()
+        self.frames += 1
+        draw_board(stdscr, self.game, config, status_text=self.status_text(now))
+        return now
+
+
+def poll_key(stdscr: curses.window) -> int:
+    """Read a pending key without waiting; -1 if there is none."""
+    stdscr.nodelay(True)
+    try:
+        return stdscr.getch()
+    finally:
+        stdscr.nodelay(False)
+
+
+def run_autoplay(
+    stdscr: curses.window,
+    config: dict[str, Any],
+    board_size: int = DEFAULT_BOARD_SIZE,
+    turbo: bool = False,
+    render_every: int = 1,
+    max_fps: float = AUTOPLAY_MAX_FPS,
+    depth: int = SEARCH_DEPTH,
+    spectators: SpectatorHub | None = None,
+) -> None:
+    """
+    Let the built-in player play until a stop key is pressed.
+
+    A new game starts whenever one ends, so autoplay can run unattended.
+    In turbo mode moves are played without animations, and the screen is
+    redrawn once at least render_every moves and 1 / max_fps seconds have
+    passed since the last frame; the moves in between are never drawn.
+
+    Args:
+        turbo: Start in turbo mode; Space switches between the two
+        render_every: In turbo mode, the fewest moves between screen updates
+        max_fps: In turbo mode, the most screen updates per second;
+            0 for no limit
+        depth: Search depth of the player
+        spectators: Hub to broadcast the games to, as stream 0
+    """
+    session = Autoplay(board_size, depth, turbo, spectators)
+    frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+    render_every = max(1, render_every)
+    invalidate_display()  # The start menu drew over the screen
+    invalidate_layout()
+
+    last_frame = 0.0
+    moves_since_frame = render_every  # Draw the first frame straight away
+    next_move = time.monotonic() + AUTOPLAY_MOVE_INTERVAL
+    while True:
+        now = time.monotonic()
+        if session.turbo:
+            if moves_since_frame >= render_every and now - last_frame >= frame_interval:
+                last_frame = session.draw(stdscr, config)
+                moves_since_frame = 0
+            # Play flat out between input polls
+            poll_at = now + AUTOPLAY_INPUT_CHECK_INTERVAL
+            while True:
+                session.play_move()
+                moves_since_frame += 1
+                now = time.monotonic()
+                frame_due = (
+                    moves_since_frame >= render_every
+                    and now - last_frame >= frame_interval
+                )
+                if frame_due or now >= poll_at:
+                    break
+            key = poll_key(stdscr)
+        else:
+            now = session.draw(stdscr, config)
+            wait = max(0, int((next_move - now) * 1000))
+            frame_timeout = get_frame_timeout()
+            if frame_timeout >= 0:
+                wait = min(wait, frame_timeout)
+            key = wait_for_key(stdscr, wait)
+            if key == -1 and time.monotonic() >= next_move:
+                if session.play_move():
+                    queue_move_animations(session.game.last_events)
+                next_move = time.monotonic() + AUTOPLAY_MOVE_INTERVAL
+                if session.game.game_over:  # Leave the final board up for a while
+                    next_move += AUTOPLAY_GAME_OVER_PAUSE
+
+        if key == -1:
+            continue
+        if key in STOP_KEYS:
+            break
+        if key == curses.KEY_RESIZE:
+            invalidate_layout()
+            invalidate_display()
+        elif key == TURBO_TOGGLE_KEY:
+            session.turbo = not session.turbo
+            animation_manager = get_animation_manager()
+            if animation_manager:
+                animation_manager.skip_all_animations()
+            moves_since_frame = render_every
+            next_move = time.monotonic()
+
+    animation_manager = get_animation_manager()
+    if animation_manager:
+        animation_manager.clear_all_animations()
+    invalidate_display()
@@ -0,0 +1,41 @@
+"""
+Easing curves for 2048-CLI animations.
+Each curve is sampled once into a lookup table, so evaluating it per frame
+is a single list index instead of a pow() chain.
+"""
+
+from collections.abc import Callable
+
+from core.constants import EASING_TABLE_SIZE
+
+
+def ease_out_cubic(t: float) -> float:
+    """Fast start, slow finish."""
+    return 1 - (1 - t) ** 3
+
+
+def ease_out_back(t: float) -> float:
+    """Overshoots past 1 before settling, for a bounce effect."""
+    c1 = 1.70158
+    c3 = c1 + 1
+    return 1 + c3 * (t - 1) ** 3 + c1 * (t - 1) ** 2
+
+
+def merge_pulse(t: float) -> float:
+    """Scale of a merging tile: shrink to 0.7, then grow back to 1."""
+    if t < 0.5:
+        return 1.0 - t * 0.3
+    return 0.7 + (t - 0.5) * 0.6
+
+
+def build_table(
+    curve: Callable[[float], float], size: int = EASING_TABLE_SIZE
+) -> list[float]:
+    """Sample a curve at size evenly spaced points from 0 to 1."""
+    last = size - 1
+    return [curve(i / last) for i in range(size)]
+
+
+EASE_OUT_CUBIC = build_table(ease_out_cubic)
+EASE_OUT_BACK = build_table(ease_out_back)
+MERGE_PULSE = build_table(merge_pulse)
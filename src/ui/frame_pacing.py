@@ -0,0 +1,137 @@
+"""
+Adaptive frame pacing for the 2048-CLI renderer.
+Measures how long frames take to render and flush, and degrades animation
+quality on slow terminals (SSH, tmux) before output starts to back up.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+
+from core.constants import (
+    FRAME_PACING_DEGRADE_FRAMES,
+    FRAME_PACING_MIN_FPS,
+    FRAME_PACING_RECOVER_FRAMES,
+    FRAME_PACING_RECOVER_RATIO,
+    FRAME_PACING_SMOOTHING,
+)
+
+
+class PacingLevel(IntEnum):
+    """Animation quality levels, from best to most degraded."""
+
+    FULL = 0  # Configured frame rate, every interpolation frame drawn
+    REDUCED_FPS = 1  # Half the configured frame rate
+    DROP_FRAMES = 2  # Interpolation frames dropped, minimum frame rate only
+    SNAP = 3  # Animations jump straight to their end state
+
+
+@dataclass
+class FrameStats:
+    """Smoothed frame timings shown in the debug overlay."""
+
+    render_time: float = 0.0  # Seconds spent composing the frame
+    flush_time: float = 0.0  # Seconds spent pushing the frame to the terminal
+    frames: int = 0
+    level_changes: int = 0
+
+    @property
+    def frame_cost(self) -> float:
+        """Total smoothed cost of one frame in seconds."""
+        return self.render_time + self.flush_time
+
+
+class FramePacer:
+    """Chooses an animation quality level from measured frame costs."""
+
+    def __init__(self, target_fps: int = 60) -> None:
+        self.target_fps = target_fps
+        self.level = PacingLevel.FULL
+        self.stats = FrameStats()
+        self._slow_frames = 0
+        self._fast_frames = 0
+
+    def set_target_fps(self, fps: int) -> None:
+        """Set the frame rate used at full quality."""
+        self.target_fps = max(FRAME_PACING_MIN_FPS, fps)
+
+    def fps_for_level(self, level: PacingLevel) -> int:
+        """Get the frame rate used at a given quality level."""
+        if level == PacingLevel.FULL:
+            return self.target_fps
+        if level == PacingLevel.REDUCED_FPS:
+            return max(FRAME_PACING_MIN_FPS, self.target_fps // 2)
+        return FRAME_PACING_MIN_FPS
+
+    @property
+    def effective_fps(self) -> int:
+        """Frame rate the renderer should currently aim for."""
+        return self.fps_for_level(self.level)
+
+    @property
+    def frame_interval(self) -> float:
+        """Seconds between animation frames at the current level."""
+        return 1.0 / self.effective_fps
+
+    @property
+    def should_snap(self) -> bool:
+        """Whether animations should jump to their end state."""
+        return self.level == PacingLevel.SNAP
+
+    def record_frame(self, render_time: float, flush_time: float) -> None:
+        """Record the cost of one frame and adjust the quality level."""
+        stats = self.stats
+        if stats.frames == 0:
+            stats.render_time = render_time
+            stats.flush_time = flush_time
+        else:
+            stats.render_time += FRAME_PACING_SMOOTHING * (
+                render_time - stats.render_time
+            )
+            stats.flush_time += FRAME_PACING_SMOOTHING * (flush_time - stats.flush_time)
+        stats.frames += 1
+
+        cost = stats.frame_cost
+        budget = 1.0 / self.fps_for_level(min(self.level, PacingLevel.DROP_FRAMES))
+
+        if cost > budget and self.level < PacingLevel.SNAP:
+            self._fast_frames = 0
+            self._slow_frames += 1
+            if self._slow_frames >= FRAME_PACING_DEGRADE_FRAMES:
+                self._change_level(PacingLevel(self.level + 1))
+            return
+
+        self._slow_frames = 0
+        if self.level == PacingLevel.FULL:
+            return
+
+        # Only recover once the better level's budget would be comfortably met
+        better_level = PacingLevel(self.level - 1)
+        better_budget = 1.0 / self.fps_for_level(better_level)
+        if cost < better_budget * FRAME_PACING_RECOVER_RATIO:
+            self._fast_frames += 1
+            if self._fast_frames >= FRAME_PACING_RECOVER_FRAMES:
+                self._change_level(better_level)
+        else:
+            self._fast_frames = 0
+
+    def reset(self) -> None:
+        """Return to full quality and forget measured timings."""
+        self.level = PacingLevel.FULL
+        self.stats = FrameStats()
+        self._slow_frames = 0
+        self._fast_frames = 0
+
+    def describe(self) -> str:
+        """One-line summary of the pacing decision for the debug overlay."""
+        stats = self.stats
+        return (
+            f"{self.level.name} {self.effective_fps}/{self.target_fps}fps "
+            f"render {stats.render_time * 1000:.1f}ms "
+            f"flush {stats.flush_time * 1000:.1f}ms"
+        )
+
+    def _change_level(self, level: PacingLevel) -> None:
+        self.level = level
+        self.stats.level_changes += 1
+        self._slow_frames = 0
+        self._fast_frames = 0
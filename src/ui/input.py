@@ -1,4 +1,6 @@
 import curses
+import time
+from collections.abc import Callable
 
 from core.constants import (
     ASCII_PRINTABLE_END,
@@ -6,11 +8,71 @@ from core.constants import (
     BACKSPACE_KEY_CODES,
     ENTER_KEY_CODES,
     ESCAPE_KEY_CODE,
+    MAX_COALESCED_KEYS,
     MAX_INPUT_LENGTH,
 )
 from core.i18n import t
 
 
+def drain_pending_keys(
+    stdscr: curses.window, limit: int = MAX_COALESCED_KEYS
+) -> list[int]:
+    """Read every key already waiting in the input buffer without blocking."""
+    keys: list[int] = []
+    stdscr.nodelay(True)
+    try:
+        while len(keys) < limit:
+            key = stdscr.getch()
+            if key == -1:
+                break
+            keys.append(key)
+    finally:
+        stdscr.nodelay(False)
+    return keys
+
+
+def wait_for_key(
+    stdscr: curses.window,
+    timeout: int = -1,
+    idle_task: Callable[[], bool] | None = None,
+) -> int:
+    """
+    Wait for a key press, running idle work in slices while no key is pending.
+
+    Args:
+        timeout: Milliseconds to wait, or -1 to block until a key arrives
+        idle_task: Called repeatedly while idle; returns True while it has
+            more work to do
+
+    Returns:
+        The key code, or -1 if the timeout elapsed
+    """
+    deadline = time.monotonic() + timeout / 1000 if timeout >= 0 else None
+
+    if idle_task is not None:
+        stdscr.nodelay(True)
+        try:
+            while True:
+                key = stdscr.getch()
+                if key != -1:
+                    return key
+                if not idle_task():
+                    break
+        finally:
+            stdscr.nodelay(False)
+
+    if deadline is not None:
+        timeout = int((deadline - time.monotonic()) * 1000)
+        if timeout <= 0:
+            return -1
+
+    stdscr.timeout(timeout)
+    try:
+        return stdscr.getch()
+    finally:
+        stdscr.timeout(-1)
+
+
 def get_text_input(
     stdscr: curses.window, prompt: str, max_length: int = MAX_INPUT_LENGTH
 ) -> str | None:
@@ -0,0 +1,173 @@
+"""
+Screen layout for the 2048-CLI game view.
+Every coordinate and static string the game screen needs is computed once
+per terminal size and board size, so drawing a frame does no layout work.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from core.constants import COMPACT_TILE_STEP_X, TILE_HEIGHT, TILE_SPACING, TILE_WIDTH
+from core.i18n import t
+from core.key_config import get_key_display_name
+
+HEADER_HEIGHT = 4  # Title/score line plus the score history below it
+FOOTER_OFFSET = 4  # Control lines start this many rows above the bottom
+HISTORY_LINES = 4  # Score additions shown below the score
+HISTORY_WIDTH = 12  # Columns reserved for the score history
+
+Rect = tuple[int, int, int, int]  # (y, x, height, width)
+
+
+def _clamp_rect(y: int, x: int, height: int, width: int, screen: Rect) -> Rect:
+    """Cut a rectangle down to the part that is on screen."""
+    y, x = max(0, y), max(0, x)
+    return (y, x, min(height, screen[2] - y), min(width, screen[3] - x))
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Precomputed positions for one terminal size and board size."""
+
+    height: int
+    width: int
+    board_size: int
+    compact: bool  # One cell per tile
+
+    # Board; in viewport mode only view_rows x view_cols tiles are shown
+    viewport: bool
+    view_rows: int
+    view_cols: int
+    board_start_y: int
+    board_start_x: int
+    board_height: int
+    board_width: int
+    tile_step_y: int  # Rows from one tile to the next
+    tile_step_x: int  # Columns from one tile to the next
+
+    # Panel rectangles by name, clipped to the screen
+    panel_rects: dict[str, Rect]
+
+    # Header
+    score_right_x: int  # Score text ends one column before this
+
+    # Footer: (y, x, text) for every static control string that fits,
+    # relative to the footer panel
+    controls: tuple[tuple[int, int, str], ...]
+
+    # Game over message, relative to the board panel
+    game_over_text: str
+    game_over_y: int
+    game_over_x: int
+
+    def tile_origin(self, row: int, col: int) -> tuple[int, int]:
+        """Screen position of the top-left corner of a tile."""
+        return (
+            self.board_start_y + row * self.tile_step_y,
+            self.board_start_x + col * self.tile_step_x,
+        )
+
+
+def tile_steps(compact: bool) -> tuple[int, int]:
+    """Rows and columns from one tile to the next."""
+    if compact:
+        return 1, COMPACT_TILE_STEP_X
+    return TILE_HEIGHT + 1, TILE_WIDTH + TILE_SPACING  # tile size + spacing
+
+
+def compute_layout(
+    height: int,
+    width: int,
+    board_size: int,
+    config: dict[str, Any] | None,
+    compact: bool = False,
+) -> Layout:
+    """Compute the layout of the game screen."""
+    tile_step_y, tile_step_x = tile_steps(compact)
+    tile_height, tile_width = (1, 1) if compact else (TILE_HEIGHT, TILE_WIDTH)
+    gap_y, gap_x = tile_step_y - tile_height, tile_step_x - tile_width
+
+    # Boards that don't fit show a scrollable window of whole tiles, kept
+    # clear of the score history column
+    available_height = height - HEADER_HEIGHT - FOOTER_OFFSET - 1
+    available_width = width - 4
+    view_rows, view_cols = board_size, board_size
+    viewport = (
+        board_size * tile_step_y - gap_y > available_height
+        or board_size * tile_step_x - gap_x > available_width
+    )
+    if viewport:
+        available_width = width - 2 * (HISTORY_WIDTH + 2)
+        view_rows = max(1, min(board_size, (available_height + gap_y) // tile_step_y))
+        view_cols = max(1, min(board_size, (available_width + gap_x) // tile_step_x))
+    board_height = view_rows * tile_step_y - gap_y
+    board_width = view_cols * tile_step_x - gap_x
+
+    # Center the board horizontally below the header
+    board_start_y = HEADER_HEIGHT
+    board_start_x = max(2, (width - board_width) // 2)
+
+    screen = (0, 0, height, width)
+    panel_rects = {
+        "header": _clamp_rect(0, 0, HEADER_HEIGHT - 1, width, screen),
+        "history": _clamp_rect(
+            HEADER_HEIGHT - 1,
+            width - HISTORY_WIDTH - 2,
+            HISTORY_LINES,
+            HISTORY_WIDTH,
+            screen,
+        ),
+        "board": _clamp_rect(
+            board_start_y, board_start_x, board_height, board_width, screen
+        ),
+        "footer": _clamp_rect(height - FOOTER_OFFSET, 0, 2, width, screen),
+        "status": _clamp_rect(height - 2, 0, 1, width, screen),
+    }
+
+    # Footer controls, with the key names from config baked in
+    control_y = 0
+    left, center, right = (
+        t("ui.controls.back_restart"),
+        t("ui.controls.arrows"),
+        t("ui.controls.quit"),
+    )
+    controls = [
+        (control_y, 2, left),
+        (control_y, (width - len(center)) // 2, center),
+        (control_y, width - len(right) - 2, right),
+    ]
+    if config and "keys" in config:
+        actions = config["keys"]["actions"]
+        extras = t(
+            "ui.controls.game_controls",
+            get_key_display_name(actions["return_to_title"][0]),
+            get_key_display_name(actions["save"][0]),
+            get_key_display_name(actions["load"][0]),
+            get_key_display_name(actions["change_theme"][0]),
+        )
+        if len(extras) < width - 4:
+            controls.append((control_y + 1, (width - len(extras)) // 2, extras))
+
+    game_over_text = t("game.game_over")
+
+    return Layout(
+        height=height,
+        width=width,
+        board_size=board_size,
+        compact=compact,
+        viewport=viewport,
+        view_rows=view_rows,
+        view_cols=view_cols,
+        board_start_y=board_start_y,
+        board_start_x=board_start_x,
+        board_height=board_height,
+        board_width=board_width,
+        tile_step_y=tile_step_y,
+        tile_step_x=tile_step_x,
+        panel_rects=panel_rects,
+        score_right_x=width - 2,
+        controls=tuple(controls),
+        game_over_text=game_over_text,
+        game_over_y=board_height // 2,
+        game_over_x=max(0, (board_width - len(game_over_text)) // 2),
+    )
@@ -4,12 +4,21 @@ Based on mm.png design - clean, floating tiles, minimal UI.
 """
 
 import curses
+import math
+import sys
 import time
-from typing import Any, Optional
-
-from core.config import get_animation_fps, get_animation_speed, is_animations_enabled
+from typing import Any
+
+from core import metrics
+from core.config import (
+    get_animation_fps,
+    get_animation_speed,
+    get_render_backend,
+    is_animations_enabled,
+    is_debug_overlay_enabled,
+)
 from core.constants import (
-    DEFAULT_BOARD_SIZE,
+    METRICS_TIME_BUCKETS,
     SCORE_CHANGE_DISPLAY_DURATION,
     SCORE_FADE_MEDIUM_THRESHOLD,
     SCORE_FADE_RECENT_THRESHOLD,
@@ -23,42 +32,201 @@ from core.modern_themes import (
     init_modern_colors,
 )
 from core.i18n import t
-from core.config import load_config
-from core.key_config import get_key_display_name
+from game.events import MoveEvent, MoveEventKind
 from ui.animation import AnimationManager
+from ui.ansi_backend import AnsiScreen
+from ui.frame_pacing import FramePacer
+from ui.layout import HISTORY_LINES, Layout, compute_layout
+from ui.panels import PanelSet
+from ui.timer_wheel import TimerWheel
+from ui.viewport import BoardViewport
 
 
 # Global animation manager instance
-_animation_manager: Optional[AnimationManager] = None
+_animation_manager: AnimationManager | None = None
+
+# Global frame pacer instance
+_frame_pacer: FramePacer | None = None
+
+# Frame times for the metrics registry, kept only while metrics are enabled
+_FRAME_SECONDS = metrics.registry.histogram(
+    "render_frame_seconds", "Time to draw and flush a frame", METRICS_TIME_BUCKETS
+)
+
+# Off-screen frame used by the "ansi" render backend
+_ansi_screen: AnsiScreen | None = None
+
+# Layout for the current terminal size and board size
+_layout: Layout | None = None
+
+# Screen panels for the current layout and render target
+_panels: PanelSet | None = None
+
+# Scrollable board view, used for compact mode and boards that don't fit
+_viewport: BoardViewport | None = None
+_compact_board = False
+
+# Whether the last frame showed animations in progress
+_frame_animated = False
+
+# Redraw deadlines at the fade boundaries of score history entries
+_history_timers: TimerWheel | None = None
+_history_scheduled_until = 0.0  # Time of the newest entry with timers
+_history_fades = 0  # Fade boundaries passed so far, part of the panel key
 
 
 def init_display() -> None:
     """Initialize the modern display system."""
-    global _animation_manager
+    global _animation_manager, _frame_pacer
     init_modern_colors()
     _animation_manager = AnimationManager()
+    _frame_pacer = FramePacer()
 
 
-def get_animation_manager() -> Optional[AnimationManager]:
+def get_animation_manager() -> AnimationManager | None:
     """Get the global animation manager instance."""
     return _animation_manager
 
 
-def draw_modern_game(
+def get_frame_pacer() -> FramePacer | None:
+    """Get the global frame pacer instance."""
+    return _frame_pacer
+
+
+def get_layout(
     stdscr: curses.window, game: Any, config: dict[str, Any] | None = None
+) -> Layout:
+    """Get the cached layout, computing it if the board size or mode changed."""
+    global _layout
+    if (
+        _layout is None
+        or _layout.board_size != game.board.size
+        or _layout.compact != _compact_board
+    ):
+        height, width = stdscr.getmaxyx()
+        _layout = compute_layout(
+            height, width, game.board.size, config, _compact_board
+        )
+    return _layout
+
+
+def invalidate_layout() -> None:
+    """Recompute the layout on the next frame, e.g. on KEY_RESIZE."""
+    global _layout
+    _layout = None
+
+
+def get_render_target(
+    stdscr: curses.window,
+    config: dict[str, Any] | None = None,
+    layout: Layout | None = None,
+) -> Any:
+    """Get the surface game frames are drawn on for the configured backend."""
+    global _ansi_screen
+    if not config or get_render_backend(config) != "ansi":
+        return stdscr
+
+    height, width = (layout.height, layout.width) if layout else stdscr.getmaxyx()
+    if _ansi_screen is None:
+        _ansi_screen = AnsiScreen(height, width, sys.stdout.fileno())
+    else:
+        _ansi_screen.resize(height, width)
+    return _ansi_screen
+
+
+def get_viewport(layout: Layout) -> BoardViewport | None:
+    """Get the board viewport, or None if the whole board is drawn as tiles."""
+    global _viewport
+    if not (layout.viewport or layout.compact):
+        _viewport = None
+        return None
+    if (
+        _viewport is None
+        or _viewport.board_size != layout.board_size
+        or _viewport.compact != layout.compact
+    ):
+        _viewport = BoardViewport(layout.board_size, layout.compact, draw_single_tile)
+    _viewport.attach(layout)
+    return _viewport
+
+
+def pan_viewport(rows: int, cols: int) -> bool:
+    """Scroll the board view. Returns False if the whole board is visible."""
+    if _viewport is None or _layout is None or not _layout.viewport:
+        return False
+    _viewport.pan(rows, cols)
+    return True
+
+
+def toggle_compact_board() -> None:
+    """Switch between full tiles and one cell per tile."""
+    global _compact_board
+    _compact_board = not _compact_board
+
+
+def get_panels(
+    screen: Any, layout: Layout, board_window: Any = None
+) -> PanelSet:
+    """Get the screen panels, creating new windows if the layout changed."""
+    global _panels
+    if (
+        _panels is None
+        or _panels.layout is not layout
+        or _panels.screen is not screen
+        or _panels.board_window is not board_window
+    ):
+        _panels = PanelSet(screen, layout, board_window)
+    return _panels
+
+
+def invalidate_display() -> None:
+    """Force a full redraw on the next frame, e.g. after curses drew a menu."""
+    if _ansi_screen:
+        _ansi_screen.invalidate()
+    if _panels:
+        _panels.invalidate()
+
+
+def draw_modern_game(
+    stdscr: curses.window,
+    game: Any,
+    config: dict[str, Any] | None = None,
+    board_frame: curses.window | None = None,
+    status_text: str | None = None,
 ) -> None:
     """
     Draw the game using modern minimalist design.
 
     Layout:
     - Top: Score and score change
-    - Center: 4x4 floating tile grid
+    - Center: floating tile grid, centred for any board size
     - Bottom: Simple controls
+
+    Boards that don't fit the terminal (or compact mode) are shown through a
+    BoardViewport: with curses, the board is kept in a pad that is updated
+    tile by tile, and only the visible part is copied to the screen.
+
+    Each region is a separate panel that is only redrawn when its content
+    changes; the static footer is drawn once per layout.
+
+    A board_frame from prerender_board() is copied in place of drawing the
+    tiles, unless animations are running (prerender_board() doesn't draw
+    one then). status_text, if given, is shown
+    on the status line in place of the debug overlay.
+
+    Frames go through curses or, with the "ansi" render backend, are composed
+    off-screen and flushed as a single write.
     """
-    global _animation_manager
-    
-    stdscr.clear()
-    height, width = stdscr.getmaxyx()
+    global _animation_manager, _frame_animated
+
+    frame_start = time.perf_counter()
+    layout = get_layout(stdscr, game, config)
+    screen = get_render_target(stdscr, config, layout)
+    viewport = get_viewport(layout)
+    # Pads are curses windows, so the ANSI backend draws visible tiles instead
+    use_pad = viewport is not None and screen is stdscr
+    panels = get_panels(screen, layout, viewport if use_pad else None)
+    panels.begin_frame()
 
     ui_colors = get_ui_color_pairs()
     
@@ -73,47 +241,171 @@ def draw_modern_game(
         elif _animation_manager.running:
             _animation_manager.stop()
 
-    # Draw header (score)
-    draw_score_header(stdscr, game, ui_colors, width)
+    # Slow terminals skip straight to the end state of running animations;
+    # the viewport has no tile animations at all
+    if config and _frame_pacer:
+        _frame_pacer.set_target_fps(get_animation_fps(config))
+        if (_frame_pacer.should_snap or viewport) and _animation_manager:
+            if _animation_manager.has_active_animations():
+                _animation_manager.skip_all_animations()
 
-    # Calculate board position (centered) for bordered tiles
-    board_start_y = 4  # Leave space for header
-    board_width = (
-        DEFAULT_BOARD_SIZE * TILE_WIDTH + (DEFAULT_BOARD_SIZE - 1) * TILE_SPACING
-    )
-    # Center the board properly
-    board_start_x = max(2, (width - board_width) // 2)
+    # Draw header (score)
+    title = get_game_title(game)
+    position = get_viewport_position_text(viewport, layout)
+    header = panels["header"]
+    if header.begin((title, game.score, position)):
+        draw_score_header(header.window, game, ui_colors, layout.score_right_x)
+        if position:
+            draw_viewport_position(header.window, ui_colors, position)
+
+    # The history panel only changes on new entries and fade boundaries
+    history = panels["history"]
+    score_history = game._score_history
+    newest = score_history[-1] if score_history else None
+    if history.begin((id(score_history), newest, update_score_fades(game))):
+        entries = get_visible_score_history(game)
+        draw_score_history(history.window, entries, ui_colors)
 
     # Draw floating tile grid with animation support
     animations_enabled = config and is_animations_enabled(config)
-    draw_floating_tiles(stdscr, game, board_start_y, board_start_x, animations_enabled)
+    animating = bool(
+        animations_enabled
+        and _animation_manager is not None
+        and _animation_manager.has_active_animations()
+    )
+    _frame_animated = animating
+    board = panels["board"]
+    if viewport is not None:
+        board_key = (game.board.version, game.game_over, viewport.top, viewport.left)
+        if board.begin(board_key):
+            if board.window is viewport:
+                viewport.sync(game.board.grid)
+            else:
+                viewport.draw_visible(board.window, game.board.grid)
+                if game.game_over:
+                    draw_game_over(board.window, ui_colors, layout)
+    elif board.begin((game.board.version, game.game_over), force=animating):
+        # Pre-rendered frames are curses pads, so only the curses backend uses them
+        if (
+            board_frame is None
+            or animating
+            or screen is not stdscr
+            or not copy_board_frame(board.window, board_frame)
+        ):
+            draw_floating_tiles(board.window, game, 0, 0, animations_enabled)
+
+        # Game over overlay if needed
+        if game.game_over:
+            draw_game_over(board.window, ui_colors, layout)
+
+    # Static footer controls, drawn once per layout
+    footer = panels["footer"]
+    if footer.begin(layout.controls):
+        draw_simple_controls(footer.window, ui_colors, layout)
+
+    status = panels["status"]
+    if status_text is not None:
+        if status.begin(status_text):
+            draw_status_text(status.window, ui_colors, status_text)
+    elif config and _frame_pacer and is_debug_overlay_enabled(config):
+        if status.begin(_frame_pacer.describe()):
+            draw_debug_overlay(status.window, ui_colors, _frame_pacer)
+
+    flush_start = time.perf_counter()
+    panels.present()
+
+    if _frame_pacer or metrics.enabled:
+        frame_end = time.perf_counter()
+        if _frame_pacer:
+            _frame_pacer.record_frame(
+                flush_start - frame_start, frame_end - flush_start
+            )
+        if metrics.enabled:
+            _FRAME_SECONDS.observe(frame_end - frame_start)
 
-    # Draw footer controls
-    draw_simple_controls(stdscr, ui_colors, height, width)
 
-    # Game over overlay if needed
-    if game.game_over:
-        draw_game_over(stdscr, ui_colors, height, width)
+def get_frame_timeout() -> int:
+    """
+    Get how long the game loop may wait for input, in milliseconds.
+
+    Returns -1 (block until a key arrives) when nothing is animating and no
+    score history fade is due, so an idle game never redraws on its own. One
+    more frame is drawn after the animations end, so the board doesn't stop
+    mid-animation.
+    """
+    timeout = -1
+    deadline = _history_timers.next_deadline() if _history_timers else None
+    if deadline is not None:
+        timeout = max(1, math.ceil((deadline - time.time()) * 1000))
+
+    if not _animation_manager or not (
+        _frame_animated or _animation_manager.has_active_animations()
+    ):
+        return timeout
+    if _frame_pacer is None:
+        frame_timeout = 1000 // 60
+    else:
+        frame_timeout = max(1, int(_frame_pacer.frame_interval * 1000))
+    return frame_timeout if timeout < 0 else min(timeout, frame_timeout)
+
+
+def get_viewport_position_text(
+    viewport: BoardViewport | None, layout: Layout
+) -> str:
+    """Describe which part of the board is visible, or "" if all of it is."""
+    if viewport is None or not layout.viewport:
+        return ""
+    first_row, end_row, first_col, end_col = viewport.visible_range()
+    size = layout.board_size
+    return t(
+        "ui.viewport.position",
+        first_row + 1,
+        end_row,
+        first_col + 1,
+        end_col,
+        size,
+        size,
+    )
 
-    stdscr.refresh()
+
+def draw_viewport_position(
+    stdscr: curses.window, ui_colors: dict[str, int], position: str
+) -> None:
+    """Draw the visible board range and panning help below the title."""
+    try:
+        stdscr.addstr(
+            2,
+            2,
+            f"{position}   {t('ui.viewport.help')}",
+            curses.color_pair(ui_colors["controls"]) | curses.A_DIM,
+        )
+    except curses.error:
+        pass
+
+
+def get_game_title(game: Any) -> str:
+    title = "2048-CLI"
+    if getattr(game, "endless_mode", False):
+        title += " [ENDLESS]"
+    return title
 
 
 def draw_score_header(
-    stdscr: curses.window, game: Any, ui_colors: dict[str, int], width: int
+    stdscr: curses.window, game: Any, ui_colors: dict[str, int], right_x: int
 ) -> None:
-    """Draw score display with total on top-right and history below."""
+    """Draw the title on the top-left and the total score on the top-right."""
     try:
         # Game title on top-left
-        title = "2048-CLI"
-        if getattr(game, "endless_mode", False):
-            title += " [ENDLESS]"
         stdscr.addstr(
-            1, 2, title, curses.color_pair(ui_colors["controls"]) | curses.A_BOLD
+            1,
+            2,
+            get_game_title(game),
+            curses.color_pair(ui_colors["controls"]) | curses.A_BOLD,
         )
 
         # Main score on top-right
         score_text = f"Score: {game.score}"
-        score_x = width - len(score_text) - 2
+        score_x = right_x - len(score_text)
         stdscr.addstr(
             1,
             score_x,
@@ -121,57 +413,92 @@ def draw_score_header(
             curses.color_pair(ui_colors["score"]) | curses.A_BOLD,
         )
 
-        # Score history below main score (descending order)
-        draw_score_history(stdscr, game, ui_colors, width)
-
     except curses.error:
         # Fallback for narrow screens
-        stdscr.addstr(0, 0, f"Score: {game.score}")
+        try:
+            stdscr.addstr(0, 0, f"Score: {game.score}")
+        except curses.error:
+            pass
 
 
-def draw_score_history(
-    stdscr: curses.window, game: Any, ui_colors: dict[str, int], width: int
-) -> None:
-    """Draw recent score additions in descending order."""
-    score_history = getattr(game, "_score_history", [])
+def update_score_fades(game: Any) -> int:
+    """
+    Schedule the fade boundaries of new score history entries and expire the
+    ones that are due.
 
-    if not score_history:
-        return
+    Returns:
+        How many fade boundaries have passed; changes whenever the history
+        panel needs a redraw
+    """
+    global _history_timers, _history_scheduled_until, _history_fades
+    now = time.time()
+    if _history_timers is None:
+        _history_timers = TimerWheel(now)
+
+    # Entries are in time order, so only the newest few can be unscheduled
+    newest_time = _history_scheduled_until
+    for change in reversed(game._score_history):
+        if change.time <= _history_scheduled_until:
+            break
+        for age in (
+            SCORE_FADE_RECENT_THRESHOLD,
+            SCORE_FADE_MEDIUM_THRESHOLD,
+            SCORE_CHANGE_DISPLAY_DURATION,
+        ):
+            _history_timers.schedule(change.time + age, change)
+        newest_time = max(newest_time, change.time)
+    _history_scheduled_until = newest_time
 
-    current_time = time.time()
+    _history_fades += len(_history_timers.advance(now))
+    return _history_fades
 
-    # Filter recent changes and sort by time (newest first)
-    recent_changes = [
-        change
-        for change in score_history
-        if current_time - change["time"] < SCORE_CHANGE_DISPLAY_DURATION
-    ]
-    recent_changes.sort(key=lambda x: x["time"], reverse=True)
-
-    # Display up to 4 recent score changes
-    for i, change in enumerate(recent_changes[:4]):
-        if i >= 4:  # Limit to 4 lines
-            break
 
+def get_visible_score_history(game: Any) -> list[tuple[int, int]]:
+    """
+    Get the recent score additions to show, newest first.
+
+    Returns:
+        (points, fade level) pairs; level 0 is bright, 1 normal and 2 dim
+    """
+    current_time = time.time()
+    entries: list[tuple[int, int]] = []
+    # The ring is oldest first, so walk it backwards until entries expire
+    for change in reversed(game._score_history):
+        age = current_time - change.time
+        if age >= SCORE_CHANGE_DISPLAY_DURATION or len(entries) == HISTORY_LINES:
+            break
         # Calculate fade effect based on age
-        age = current_time - change["time"]
         if age < SCORE_FADE_RECENT_THRESHOLD:
+            level = 0
+        elif age < SCORE_FADE_MEDIUM_THRESHOLD:
+            level = 1
+        else:
+            level = 2
+        entries.append((change.points, level))
+    return entries
+
+
+def draw_score_history(
+    stdscr: curses.window,
+    entries: list[tuple[int, int]],
+    ui_colors: dict[str, int],
+) -> None:
+    """Draw recent score additions right-aligned, one per line."""
+    width = stdscr.getmaxyx()[1]
+    for i, (points, level) in enumerate(entries):
+        if level == 0:
             # Recent - bright
             color = curses.color_pair(ui_colors["score_accent"]) | curses.A_BOLD
-        elif age < SCORE_FADE_MEDIUM_THRESHOLD:
+        elif level == 1:
             # Medium - normal
             color = curses.color_pair(ui_colors["score_accent"])
         else:
             # Old - dim
             color = curses.color_pair(ui_colors["controls"])
 
-        # Position and display
-        change_text = f"+{change['points']}"
-        change_x = width - len(change_text) - 2
-        change_y = 3 + i  # Start from line 3, go down (adds spacing below main score)
-
+        change_text = f"+{points}"
         try:
-            stdscr.addstr(change_y, change_x, change_text, color)
+            stdscr.addstr(i, max(0, width - len(change_text)), change_text, color)
         except curses.error:
             break  # Stop if we run out of screen space
 
@@ -181,39 +508,108 @@ def draw_floating_tiles(
 ) -> None:
     """Draw grid of floating tiles with borders and animation support."""
     global _animation_manager
-    
-    for row in range(DEFAULT_BOARD_SIZE):
-        for col in range(DEFAULT_BOARD_SIZE):
-            tile_value = game.board.grid[row][col]
 
-            # Calculate base tile position for bordered tiles
+    size = game.board.size
+
+    # Empty placeholders first, so sliding tiles are drawn on top of them
+    for row in range(size):
+        for col in range(size):
             base_tile_y = start_y + row * (TILE_HEIGHT + 1)  # tile height + spacing
             base_tile_x = start_x + col * (TILE_WIDTH + TILE_SPACING)  # tile width + spacing
+            draw_single_tile(stdscr, 0, base_tile_y, base_tile_x)
 
-            # Check for animation data if animations are enabled
-            actual_y, actual_x = base_tile_y, base_tile_x
+    for row in range(size):
+        for col in range(size):
+            tile_value = game.board.grid[row][col]
+            if tile_value == 0:
+                continue
+
+            # Calculate base tile position for bordered tiles
+            actual_y = start_y + row * (TILE_HEIGHT + 1)
+            actual_x = start_x + col * (TILE_WIDTH + TILE_SPACING)
             scale = 1.0
             alpha = 1.0
-            
+
+            # Check for animation data by the tile's stable ID
             if animations_enabled and _animation_manager:
-                tile_id = f"{row}_{col}"
-                render_data = _animation_manager.get_tile_render_data(tile_id)
-                if render_data:
+                tile_id = game.board.ids[row][col]
+                state = _animation_manager.get_tile_state(tile_id)
+                if state:
                     # Apply animation transformations
-                    anim_pos = render_data['position']
-                    scale = render_data['scale']
-                    alpha = render_data['alpha']
-                    
+                    anim_x, anim_y, scale, alpha = state
+
                     # Convert logical position to screen coordinates
-                    actual_y = start_y + int(anim_pos.y * (TILE_HEIGHT + 1))
-                    actual_x = start_x + int(anim_pos.x * (TILE_WIDTH + TILE_SPACING))
+                    actual_y = start_y + int(anim_y * (TILE_HEIGHT + 1))
+                    actual_x = start_x + int(anim_x * (TILE_WIDTH + TILE_SPACING))
+
+            draw_single_tile(stdscr, tile_value, actual_y, actual_x, scale, alpha)
 
-            # Only draw non-empty tiles or tiles with animation data
-            if tile_value > 0 or (animations_enabled and scale != 1.0):
-                draw_single_tile(stdscr, tile_value, actual_y, actual_x, scale, alpha)
-            elif tile_value == 0:
-                # Draw empty tile placeholder
-                draw_single_tile(stdscr, 0, actual_y, actual_x)
+
+def queue_move_animations(events: list[MoveEvent]) -> None:
+    """Start animations for the tile events of a move."""
+    if not _animation_manager or not _animation_manager.running:
+        return
+
+    for event in events:
+        if event.kind == MoveEventKind.SLIDE:
+            _animation_manager.add_move_animation(
+                event.tile_id, event.src, event.dst, event.value
+            )
+        elif event.kind == MoveEventKind.MERGE:
+            _animation_manager.add_merge_animation(
+                event.tile_id, event.dst, event.value // 2, event.value
+            )
+        elif event.kind == MoveEventKind.SPAWN:
+            _animation_manager.add_spawn_animation(
+                event.tile_id, event.dst, event.value
+            )
+
+
+def prerender_board(game: Any) -> curses.window | None:
+    """
+    Draw a board into an off-screen pad so it can be shown later.
+
+    Returns None while animations are on: the move is then animated from
+    its events and the frame would never be shown. Only with animations
+    off, or snapped to their end on a slow terminal, is it worth drawing.
+    """
+    # The viewport keeps its own pad; full-board frames would be too costly
+    if _compact_board or (_layout is not None and _layout.viewport):
+        return None
+    if (
+        _animation_manager is not None
+        and _animation_manager.running
+        and not (_frame_pacer is not None and _frame_pacer.should_snap)
+    ):
+        return None
+    size = game.board.size
+    frame_height = size * (TILE_HEIGHT + 1)
+    frame_width = size * (TILE_WIDTH + TILE_SPACING)
+    try:
+        pad = curses.newpad(frame_height, frame_width)
+    except curses.error:
+        return None
+    draw_floating_tiles(pad, game, 0, 0)
+    return pad
+
+
+def copy_board_frame(window: curses.window, board_frame: curses.window) -> bool:
+    """Copy a pre-rendered board into the board window. Returns False on failure."""
+    frame_height, frame_width = board_frame.getmaxyx()
+    window_height, window_width = window.getmaxyx()
+    try:
+        board_frame.overwrite(
+            window,
+            0,
+            0,
+            0,
+            0,
+            min(frame_height, window_height) - 1,
+            min(frame_width, window_width) - 1,
+        )
+    except curses.error:
+        return False
+    return True
 
 
 def draw_single_tile(stdscr: curses.window, value: int, y: int, x: int, scale: float = 1.0, alpha: float = 1.0) -> None:
@@ -279,67 +675,25 @@ def draw_single_tile(stdscr: curses.window, value: int, y: int, x: int, scale: f
 
 
 def draw_simple_controls(
-    stdscr: curses.window, ui_colors: dict[str, int], height: int, width: int
+    stdscr: curses.window, ui_colors: dict[str, int], layout: Layout
 ) -> None:
     """Draw minimal control information at bottom."""
-    controls = [
-        t("ui.controls.back_restart"),
-        t("ui.controls.arrows"),
-        t("ui.controls.quit")
-    ]
-
-    # Position controls at bottom, accounting for bordered tile height
-    control_y = height - 4
-
+    color = curses.color_pair(ui_colors["controls"])
     try:
-        # Left control
-        stdscr.addstr(
-            control_y, 2, controls[0], curses.color_pair(ui_colors["controls"])
-        )
-
-        # Center arrows
-        center_x = (width - len(controls[1])) // 2
-        stdscr.addstr(
-            control_y, center_x, controls[1], curses.color_pair(ui_colors["controls"])
-        )
-
-        # Right control
-        right_x = width - len(controls[2]) - 2
-        stdscr.addstr(
-            control_y, right_x, controls[2], curses.color_pair(ui_colors["controls"])
-        )
-
-        # Additional controls on next line - dynamic key display
-        control_y += 1
-        config = load_config()
-        return_key = get_key_display_name(config["keys"]["actions"]["return_to_title"][0])
-        save_key = get_key_display_name(config["keys"]["actions"]["save"][0])
-        load_key = get_key_display_name(config["keys"]["actions"]["load"][0])
-        theme_key = get_key_display_name(config["keys"]["actions"]["change_theme"][0])
-        
-        extras = t("ui.controls.game_controls", 
-                   return_key, save_key, load_key, theme_key)
-        
-        if len(extras) < width - 4:
-            extra_x = (width - len(extras)) // 2
-            stdscr.addstr(
-                control_y, extra_x, extras, curses.color_pair(ui_colors["controls"])
-            )
-
+        for control_y, control_x, text in layout.controls:
+            stdscr.addstr(control_y, control_x, text, color)
     except curses.error:
         pass
 
 
 def draw_game_over(
-    stdscr: curses.window, ui_colors: dict[str, int], height: int, width: int
+    stdscr: curses.window, ui_colors: dict[str, int], layout: Layout
 ) -> None:
     """Draw game over overlay."""
-    message = t("game.game_over")
+    message = layout.game_over_text
+    msg_y, msg_x = layout.game_over_y, layout.game_over_x
 
     try:
-        msg_x = (width - len(message)) // 2
-        msg_y = height // 2
-
         # Clear area around message
         clear_line = " " * len(message)
         stdscr.addstr(msg_y - 1, msg_x, clear_line)
@@ -359,14 +713,41 @@ def draw_game_over(
         pass
 
 
+def draw_debug_overlay(
+    stdscr: curses.window, ui_colors: dict[str, int], pacer: FramePacer
+) -> None:
+    """Draw frame pacing statistics in the bottom-left corner."""
+    try:
+        stdscr.addstr(
+            0,
+            2,
+            pacer.describe(),
+            curses.color_pair(ui_colors["controls"]) | curses.A_DIM,
+        )
+    except curses.error:
+        pass
+
+
+def draw_status_text(
+    stdscr: curses.window, ui_colors: dict[str, int], text: str
+) -> None:
+    """Draw a line of status text in the bottom-left corner."""
+    try:
+        stdscr.addstr(0, 2, text, curses.color_pair(ui_colors["controls"]))
+    except curses.error:
+        pass
+
+
 # Compatibility function for existing code
 def draw_board(
     stdscr: curses.window,
     game: Any,
     config: dict[str, Any] | None = None,
+    board_frame: curses.window | None = None,
+    status_text: str | None = None,
 ) -> None:
     """Compatibility wrapper for existing main.py."""
-    draw_modern_game(stdscr, game, config)
+    draw_modern_game(stdscr, game, config, board_frame, status_text)
 
 
 def init_colors(theme_name: str = "modern") -> None:
@@ -0,0 +1,133 @@
+"""
+Panel-based screen composition for 2048-CLI.
+The game screen is split into independent windows that are redrawn only
+when their content changes, then flushed together with a single update.
+"""
+
+import curses
+from collections.abc import Hashable
+from typing import Any
+
+from ui.ansi_backend import AnsiScreen
+from ui.layout import Layout, Rect
+
+# Stacking order; later panels are drawn on top of earlier ones
+PANEL_NAMES = ("header", "history", "board", "footer", "status")
+
+# Content key after a forced redraw; never equal to a real key
+_FORCED = object()
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return (
+        a[0] < b[0] + b[2]
+        and b[0] < a[0] + a[2]
+        and (a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+    )
+
+
+class Panel:
+    """One screen region with its own window and content key."""
+
+    def __init__(self, name: str, window: Any, rect: Rect) -> None:
+        self.name = name
+        self.window = window  # None when the region doesn't fit on screen
+        self.rect = rect
+        self.dirty = True
+        self._key: Hashable = None
+
+    def begin(self, key: Hashable, force: bool = False) -> bool:
+        """
+        Start redrawing the panel if its content changed.
+
+        Args:
+            key: Anything that changes whenever the panel would look different
+            force: Redraw even if the key is unchanged, e.g. while animating
+
+        Returns:
+            True if the caller should draw into the (now blank) window
+        """
+        if self.window is None:
+            return False
+        if not (force or self.dirty or key != self._key):
+            return False
+        # A forced frame (e.g. mid-animation) must not satisfy the next key check
+        self._key = _FORCED if force else key
+        self.dirty = True
+        self.window.erase()
+        return True
+
+    def invalidate(self) -> None:
+        self.dirty = True
+
+
+class PanelSet:
+    """All panels of the game screen for one layout and render target."""
+
+    def __init__(self, screen: Any, layout: Layout, board_window: Any = None) -> None:
+        """
+        Args:
+            board_window: Window-like object to use for the board panel
+                instead of a new window, e.g. a BoardViewport
+        """
+        self.screen = screen
+        self.layout = layout
+        self.board_window = board_window
+        self._clear_screen = True
+        self.panels: dict[str, Panel] = {}
+        for name in PANEL_NAMES:
+            rect = layout.panel_rects[name]
+            if name == "board" and board_window is not None:
+                window = board_window
+            else:
+                window = self._new_window(rect)
+            self.panels[name] = Panel(name, window, rect)
+
+    def __getitem__(self, name: str) -> Panel:
+        return self.panels[name]
+
+    def _new_window(self, rect: Rect) -> Any:
+        y, x, height, width = rect
+        if height <= 0 or width <= 0:
+            return None
+        try:
+            if isinstance(self.screen, AnsiScreen):
+                return self.screen.derwin(height, width, y, x)
+            return curses.newwin(height, width, y, x)
+        except curses.error:
+            return None
+
+    def invalidate(self) -> None:
+        """Redraw the whole screen on the next frame."""
+        self._clear_screen = True
+        for panel in self.panels.values():
+            panel.invalidate()
+
+    def begin_frame(self) -> None:
+        """Blank the gaps between panels if the screen was drawn over."""
+        if not self._clear_screen:
+            return
+        self._clear_screen = False
+        self.screen.erase()
+        if not isinstance(self.screen, AnsiScreen):
+            self.screen.noutrefresh()
+
+    def present(self) -> None:
+        """Queue the panels that changed and update the terminal once."""
+        redrawn: list[Rect] = []
+        for panel in self.panels.values():
+            if panel.window is None:
+                continue
+            if not panel.dirty:
+                # An overlapping panel below was redrawn and covered this one
+                if not any(_overlaps(panel.rect, rect) for rect in redrawn):
+                    continue
+                panel.window.touchwin()
+            panel.window.noutrefresh()
+            panel.dirty = False
+            redrawn.append(panel.rect)
+
+        if isinstance(self.screen, AnsiScreen):
+            self.screen.refresh()
+        else:
+            curses.doupdate()
@@ -0,0 +1,180 @@
+"""
+Save browser for 2048-CLI.
+Lists save slots a page at a time, however many there are: only the page
+on screen is fetched from the save index (see save_load.get_save_index),
+again whenever the page, the search or the sort order changes. Typing
+filters the slots by name as you go, and Tab cycles the sort order.
+"""
+
+import curses
+import sqlite3
+from collections import deque
+from collections.abc import Collection
+from typing import Any
+
+from core.constants import (
+    ASCII_PRINTABLE_END,
+    ASCII_PRINTABLE_START,
+    BACKSPACE_KEY_CODES,
+    ENTER_KEY_CODES,
+    ESCAPE_KEY_CODE,
+)
+from core.i18n import t
+from core.save_index import SORT_KEYS
+from core.save_load import get_save_index
+from ui.input import drain_pending_keys
+
+# Rows taken by the title, search line, blank line, page line and help line
+_CHROME_ROWS = 5
+_FIRST_ROW = 3
+_TAB_KEY = 9
+
+
+def format_slot(info: dict[str, Any]) -> str:
+    status = t("game.game_over") if info["game_over"] else t("game.in_progress")
+    return (
+        f"{info['name']} ({t('game.slot')} {info['slot']}): "
+        f"{t('game.score')} {info['score']} ({status}) - {info['date']}"
+    )
+
+
+def _next_slot(index: Any, saving: Collection[int]) -> int:
+    """The slot after the highest one in use, counting saves not yet written."""
+    return max(index.next_slot(), max(saving, default=0) + 1)
+
+
+def _put(stdscr: curses.window, y: int, text: str, attr: int = 0) -> None:
+    height, width = stdscr.getmaxyx()
+    if 0 <= y < height and width > 2:
+        try:
+            stdscr.addnstr(y, 1, text, width - 2, attr)
+        except curses.error:
+            pass  # Too small a terminal; the next resize redraws
+
+
+def browse_saves(
+    stdscr: curses.window,
+    config: dict[str, Any] | None,
+    title: str,
+    new_slot: bool = False,
+    saving: Collection[int] = (),
+) -> dict[str, Any] | None:
+    """
+    Let the player pick a save slot.
+
+    Args:
+        new_slot: Offer a new, empty slot above the list, for saving
+        saving: Slots with a save still being written in the background;
+            they are marked as saving, and the new slot comes after them
+
+    Returns:
+        The chosen slot's info (as get_save_slot_info() gives it), with an
+        empty name for a new slot, or None if cancelled or there is nothing
+        to choose
+    """
+    try:
+        index = get_save_index(config)
+        total, page = index.page()
+    except (OSError, sqlite3.Error):
+        return None
+    if not total and not new_slot:
+        return None
+    saving_mark = f" {t('game.browser.saving')}"
+
+    query = ""
+    sort = SORT_KEYS[0]
+    selected = -1 if new_slot else 0  # -1 is the new slot
+    fetched = None  # (query, sort, offset, page size) of the page held
+    keys: deque[int] = deque()  # Read but not yet handled
+    stdscr.clear()
+
+    while True:
+        height, _ = stdscr.getmaxyx()
+        page_size = max(1, height - _CHROME_ROWS - (1 if new_slot else 0))
+        offset = max(0, selected) // page_size * page_size
+        if fetched != (query, sort, offset, page_size):
+            try:
+                total, page = index.page(query, sort, offset, page_size)
+            except sqlite3.Error:
+                total, page = 0, []
+            fetched = (query, sort, offset, page_size)
+            selected = max(-1 if new_slot else 0, min(selected, total - 1))
+
+        stdscr.erase()
+        _put(stdscr, 0, title, curses.A_BOLD)
+        search = t("game.browser.search", query)
+        sort_name = t(f"game.browser.sort_{sort}")
+        _put(stdscr, 1, f"{search}_   {t('game.browser.sort', sort_name)}")
+        row = _FIRST_ROW
+        if new_slot:
+            chosen = selected < 0
+            text = t("game.browser.new_slot", _next_slot(index, saving))
+            _put(
+                stdscr,
+                row,
+                f"{'>' if chosen else ' '} {text}",
+                curses.A_REVERSE if chosen else 0,
+            )
+            row += 1
+        if not page:
+            _put(stdscr, row, f"  {t('game.browser.no_matches')}")
+        for i, info in enumerate(page):
+            chosen = offset + i == selected
+            _put(
+                stdscr,
+                row + i,
+                f"{'>' if chosen else ' '} {format_slot(info)}"
+                f"{saving_mark if info['slot'] in saving else ''}",
+                curses.A_REVERSE if chosen else 0,
+            )
+        pages = max(1, -(-total // page_size))
+        _put(
+            stdscr,
+            height - 2,
+            t("game.browser.count", total, offset // page_size + 1, pages),
+        )
+        _put(stdscr, height - 1, t("game.browser.help"), curses.A_DIM)
+        stdscr.refresh()
+
+        # Pasted or fast typing is handled before the next page is fetched
+        if not keys:
+            keys.extend([stdscr.getch(), *drain_pending_keys(stdscr)])
+        lowest = -1 if new_slot else 0
+        while keys:
+            key = keys.popleft()
+            if key == ESCAPE_KEY_CODE:
+                return None
+            if key == curses.KEY_ENTER or key in ENTER_KEY_CODES:
+                if new_slot and selected < 0:
+                    return {"slot": _next_slot(index, saving), "name": ""}
+                wanted = (query, sort, max(0, selected) // page_size * page_size)
+                if fetched != (*wanted, page_size):
+                    # Keys before it moved off the page held; fetch that first
+                    keys.appendleft(key)
+                    break
+                if page and offset <= selected < offset + len(page):
+                    return page[selected - offset]
+            elif key == curses.KEY_UP:
+                selected = max(lowest, selected - 1)
+            elif key == curses.KEY_DOWN:
+                selected = min(total - 1, selected + 1)
+            elif key == curses.KEY_PPAGE:
+                selected = max(lowest, selected - page_size)
+            elif key == curses.KEY_NPAGE:
+                selected = min(total - 1, max(0, selected) + page_size)
+            elif key == curses.KEY_HOME:
+                selected = lowest
+            elif key == curses.KEY_END:
+                selected = max(lowest, total - 1)
+            elif key == _TAB_KEY:
+                sort = SORT_KEYS[(SORT_KEYS.index(sort) + 1) % len(SORT_KEYS)]
+                selected = lowest
+            elif key in BACKSPACE_KEY_CODES or key == curses.KEY_BACKSPACE:
+                query = query[:-1]
+                selected = lowest
+            elif ASCII_PRINTABLE_START <= key <= ASCII_PRINTABLE_END:
+                query += chr(key)
+                selected = lowest
+            elif key == curses.KEY_RESIZE:
+                stdscr.clear()
+        selected = max(lowest, selected)
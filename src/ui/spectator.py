@@ -0,0 +1,110 @@
+"""
+Spectator mode for 2048-CLI.
+Watches a game streamed by a SpectatorHub, whether played interactively,
+by autoplay or on the game server, and draws it with the modern display,
+animating each move from its tile events.
+"""
+
+import curses
+import select
+import socket
+import sys
+from typing import Any
+
+from core.i18n import t
+from game.game import Game
+from headless.spectate import apply_frame, decode_frame, split_frames
+from ui.autoplay import STOP_KEYS
+from ui.input import drain_pending_keys
+from ui.modern_display import (
+    draw_board,
+    get_animation_manager,
+    get_frame_timeout,
+    invalidate_display,
+    invalidate_layout,
+    queue_move_animations,
+)
+
+
+def run_spectator(
+    stdscr: curses.window, config: dict[str, Any], path: str, stream: int = 0
+) -> None:
+    """
+    Watch a stream until a stop key is pressed.
+
+    Args:
+        path: Unix socket of the SpectatorHub
+        stream: 0 for an interactive or autoplay game, or a game server
+            session ID
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        sock.sendall(f"{stream}\n".encode())
+        connected = True
+    except OSError:  # Nothing is being broadcast there
+        connected = False
+    sock.setblocking(False)
+    inbox = bytearray()
+    game = Game(sparse=False)  # Replaced by the first keyframe
+    started = False
+    invalidate_display()
+    invalidate_layout()
+
+    try:
+        while True:
+            if not connected:
+                status = t("ui.spectate.ended", stream)
+            elif started:
+                status = t("ui.spectate.watching", stream)
+            else:
+                status = t("ui.spectate.waiting", stream)
+            status = f"{status}   {t('ui.spectate.help')}"
+            draw_board(stdscr, game, config, status_text=status)
+
+            timeout = get_frame_timeout()
+            readers = [sys.stdin, sock] if connected else [sys.stdin]
+            select.select(readers, [], [], timeout / 1000 if timeout >= 0 else None)
+
+            for key in drain_pending_keys(stdscr):
+                if key in STOP_KEYS:
+                    return
+                if key == curses.KEY_RESIZE:
+                    invalidate_layout()
+                    invalidate_display()
+
+            if not connected:
+                continue
+            try:
+                while True:
+                    data = sock.recv(65536)
+                    if not data:
+                        connected = False
+                        break
+                    inbox += data
+            except BlockingIOError:
+                pass
+            except OSError:
+                connected = False
+
+            moves = []
+            try:
+                for payload in split_frames(inbox):
+                    frame = decode_frame(payload)
+                    apply_frame(game, frame)
+                    started = True
+                    moves.append(frame.events)
+            except ValueError:  # Not a stream we can follow; stop reading it
+                connected = False
+            # Like key repeat in the game loop: only a single move is animated
+            animation_manager = get_animation_manager()
+            if len(moves) == 1 and moves[0] is not None:
+                queue_move_animations(moves[0])
+            elif moves and animation_manager:
+                animation_manager.skip_all_animations()
+    finally:
+        sock.close()
+        animation_manager = get_animation_manager()
+        if animation_manager:
+            animation_manager.clear_all_animations()
+        invalidate_display()
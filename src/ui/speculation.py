@@ -0,0 +1,62 @@
+"""
+Speculative move precomputation for 2048-CLI.
+Uses the idle time spent waiting for input to compute every possible next
+state, so the chosen one can be committed and shown without delay.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from game.game import DIRECTIONS, Afterstate, Game
+
+
+class MoveSpeculator:
+    """Precomputes the afterstates (and optional frames) of all four moves."""
+
+    def __init__(self, prerender: Callable[[Afterstate], Any] | None = None) -> None:
+        self._prerender = prerender
+        self._game: Game | None = None
+        self._state_key: tuple[Any, ...] | None = None
+        self._pending: list[str] = []
+        self._results: dict[str, tuple[Afterstate, Any]] = {}
+
+    @staticmethod
+    def _key_for(game: Game) -> tuple[Any, ...]:
+        return (id(game), game.score, game.board.version)
+
+    def prepare(self, game: Game) -> None:
+        """Queue precomputation for the game's current state if it changed."""
+        key = self._key_for(game)
+        if key != self._state_key:
+            self._state_key = key
+            self._pending = list(DIRECTIONS)
+            self._results.clear()
+        self._game = game
+
+    @property
+    def has_pending_work(self) -> bool:
+        """Whether some directions are still to be computed."""
+        return bool(self._pending)
+
+    def step(self) -> bool:
+        """Compute one afterstate. Returns True while more work remains."""
+        if not self._pending or self._game is None:
+            return False
+        direction = self._pending.pop(0)
+        afterstate = self._game.compute_afterstate(direction)
+        frame = None
+        if afterstate.moved and self._prerender is not None:
+            frame = self._prerender(afterstate)
+        self._results[direction] = (afterstate, frame)
+        return bool(self._pending)
+
+    def take(self, game: Game, direction: str) -> tuple[Afterstate, Any] | None:
+        """Get the precomputed result for a move, if it is still valid."""
+        if self._state_key != self._key_for(game):
+            return None
+        result = self._results.get(direction)
+        # The live state is about to change, so every other result goes stale
+        self._state_key = None
+        self._pending = []
+        self._results.clear()
+        return result
@@ -0,0 +1,72 @@
+"""
+Hashed timing wheel for 2048-CLI.
+Keeps coarse deadlines in a fixed ring of slots, so scheduling and expiring
+a timer cost O(1) and the game loop can sleep until the next one is due.
+"""
+
+import math
+from typing import Any
+
+from core.constants import TIMER_WHEEL_SLOTS, TIMER_WHEEL_TICK
+
+
+class TimerWheel:
+    """Timers rounded up to whole ticks, hashed into slots by tick number."""
+
+    def __init__(
+        self,
+        now: float,
+        tick: float = TIMER_WHEEL_TICK,
+        slots: int = TIMER_WHEEL_SLOTS,
+    ) -> None:
+        self._tick = tick
+        self._slots: list[list[tuple[int, Any]]] = [[] for _ in range(slots)]
+        self._current = int(now / tick)  # Last tick that has been expired
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, deadline: float, item: Any) -> None:
+        """Add a timer; it fires on the first tick at or after the deadline."""
+        tick = max(math.ceil(deadline / self._tick), self._current + 1)
+        self._slots[tick % len(self._slots)].append((tick, item))
+        self._count += 1
+
+    def advance(self, now: float) -> list[Any]:
+        """Expire every timer that is due by now and return their items."""
+        target = int(now / self._tick)
+        if target <= self._current:
+            return []
+
+        expired: list[Any] = []
+        if self._count:
+            # Each slot only needs one visit, however far the clock jumped
+            last = min(target, self._current + len(self._slots))
+            for tick in range(self._current + 1, last + 1):
+                slot = self._slots[tick % len(self._slots)]
+                if not slot:
+                    continue
+                due = [entry for entry in slot if entry[0] <= target]
+                if due:
+                    slot[:] = [entry for entry in slot if entry[0] > target]
+                    expired.extend(item for _, item in due)
+            self._count -= len(expired)
+        self._current = target
+        return expired
+
+    def next_deadline(self) -> float | None:
+        """Time of the earliest pending timer, or None if there are none."""
+        if not self._count:
+            return None
+        slot_count = len(self._slots)
+        for tick in range(self._current + 1, self._current + slot_count + 1):
+            if any(entry[0] == tick for entry in self._slots[tick % slot_count]):
+                return tick * self._tick
+        # Every timer is more than one revolution away
+        return min(entry[0] for slot in self._slots for entry in slot) * self._tick
+
+    def clear(self) -> None:
+        for slot in self._slots:
+            slot.clear()
+        self._count = 0
@@ -0,0 +1,167 @@
+"""
+Viewport renderer for boards too large for the terminal.
+The whole board is drawn once into an off-screen pad and kept up to date
+tile by tile; each frame only copies the visible region to the screen.
+"""
+
+import curses
+from collections.abc import Callable
+from typing import Any
+
+from core.constants import VIEWPORT_PAN_STEP
+from core.modern_themes import get_tile_color_pair
+from ui.layout import Layout, Rect, tile_steps
+
+# Exponent digits for compact tiles: 2 -> "1", 2048 -> "b", 4096 -> "c", ...
+_COMPACT_DIGITS = "123456789abcdefghijklmnopqrstuvwxyz"
+
+# Panning keys: shift+arrows, or IJKL (upper case, so they never clash
+# with movement or action bindings)
+PAN_KEYS: dict[int, tuple[int, int]] = {
+    curses.KEY_SR: (-1, 0),
+    curses.KEY_SF: (1, 0),
+    curses.KEY_SLEFT: (0, -1),
+    curses.KEY_SRIGHT: (0, 1),
+    ord("I"): (-1, 0),
+    ord("K"): (1, 0),
+    ord("J"): (0, -1),
+    ord("L"): (0, 1),
+}
+COMPACT_TOGGLE_KEY = ord("c")
+
+
+def draw_compact_tile(window: curses.window, value: int, y: int, x: int) -> None:
+    """Draw a tile as a single cell holding its exponent."""
+    if value:
+        exponent = value.bit_length() - 1
+        char = _COMPACT_DIGITS[min(exponent, len(_COMPACT_DIGITS)) - 1]
+        attr = curses.color_pair(get_tile_color_pair(value)) | curses.A_BOLD
+    else:
+        char = "·"
+        attr = curses.color_pair(get_tile_color_pair(0))
+    try:
+        window.addstr(y, x, char, attr)
+    except curses.error:
+        pass
+
+
+class BoardViewport:
+    """
+    Scrollable view of a large board.
+
+    With curses, the board lives in a pad that is only redrawn where tiles
+    changed, and the visible part is copied with pad.noutrefresh(). The
+    viewport also stands in for the board panel's window, so the panel set
+    refreshes it like any other panel.
+    """
+
+    def __init__(
+        self,
+        board_size: int,
+        compact: bool,
+        draw_tile: Callable[[Any, int, int, int], None],
+    ) -> None:
+        self.board_size = board_size
+        self.compact = compact
+        self.step_y, self.step_x = tile_steps(compact)
+        self.top = 0  # First visible tile row
+        self.left = 0  # First visible tile column
+        self.rect: Rect = (0, 0, 0, 0)
+        self._view_rows = board_size
+        self._view_cols = board_size
+        self._draw_tile = draw_compact_tile if compact else draw_tile
+        self._pad: curses.window | None = None
+        self._drawn: list[list[int]] = []  # Values currently drawn in the pad
+
+    def attach(self, layout: Layout) -> None:
+        """Fit the viewport to the board panel of a layout."""
+        self.rect = layout.panel_rects["board"]
+        self._view_rows, self._view_cols = layout.view_rows, layout.view_cols
+        self.pan(0, 0)
+
+    def pan(self, rows: int, cols: int) -> None:
+        """Scroll by whole steps of VIEWPORT_PAN_STEP tiles, clamped to the board."""
+        max_top = max(0, self.board_size - self._view_rows)
+        max_left = max(0, self.board_size - self._view_cols)
+        self.top = min(max(0, self.top + rows * VIEWPORT_PAN_STEP), max_top)
+        self.left = min(max(0, self.left + cols * VIEWPORT_PAN_STEP), max_left)
+
+    def visible_range(self) -> tuple[int, int, int, int]:
+        """(first row, last row + 1, first column, last column + 1) on screen."""
+        return (
+            self.top,
+            min(self.board_size, self.top + self._view_rows),
+            self.left,
+            min(self.board_size, self.left + self._view_cols),
+        )
+
+    def sync(self, grid: list[list[int]]) -> bool:
+        """
+        Bring the pad up to date with the board, redrawing changed tiles only.
+
+        Returns:
+            False if no pad could be created (e.g. the ANSI backend)
+        """
+        if self._pad is None:
+            try:
+                # One spare column, so the bottom-right tile doesn't hit the corner
+                self._pad = curses.newpad(
+                    self.board_size * self.step_y, self.board_size * self.step_x + 1
+                )
+            except curses.error:
+                return False
+            self._drawn = [[-1] * self.board_size for _ in range(self.board_size)]
+
+        for row, (values, drawn) in enumerate(zip(grid, self._drawn, strict=False)):
+            if values == drawn:  # Whole-row compare runs in C
+                continue
+            for col, value in enumerate(values):
+                if value != drawn[col]:
+                    self._draw_tile(
+                        self._pad, value, row * self.step_y, col * self.step_x
+                    )
+                    drawn[col] = value
+        return True
+
+    def draw_visible(self, window: Any, grid: list[list[int]]) -> None:
+        """Draw just the visible tiles into a window, for targets without pads."""
+        first_row, end_row, first_col, end_col = self.visible_range()
+        for row in range(first_row, end_row):
+            values = grid[row]
+            for col in range(first_col, end_col):
+                self._draw_tile(
+                    window,
+                    values[col],
+                    (row - first_row) * self.step_y,
+                    (col - first_col) * self.step_x,
+                )
+
+    # Window protocol for the board panel
+
+    def erase(self) -> None:
+        # The pad keeps its tiles and sync() redraws the ones that changed;
+        # touching it makes the next noutrefresh() copy the whole view
+        self.touchwin()
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.rect[2], self.rect[3]
+
+    def touchwin(self) -> None:
+        if self._pad is not None:
+            self._pad.touchwin()
+
+    def noutrefresh(self) -> None:
+        if self._pad is None:
+            return
+        y, x, height, width = self.rect
+        try:
+            self._pad.noutrefresh(
+                self.top * self.step_y,
+                self.left * self.step_x,
+                y,
+                x,
+                y + height - 1,
+                x + width - 1,
+            )
+        except curses.error:
+            pass